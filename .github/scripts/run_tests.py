@@ -1,12 +1,22 @@
 import unittest
 import sys
+import glob
 import pickle
 import os
 import time
 import numpy as np
 import shutil
+import tempfile
+import threading
+import zipfile
 
-from pysimlink import Model, GenerationError, BuildError
+from pysimlink import Model, ModelPool, GenerationError, BuildError, compile_many
+from pysimlink.lib.parallel import run_sweep
+from pysimlink.lib.model_paths import EXTRACT_STAMP
+from pysimlink.lib.recorder import read_header
+from pysimlink.lib.struct_parser import parse_data_objects
+from pysimlink.lib import traces, build_cache, manifest
+from pysimlink.lib.cmake_gen import CORE_LIB
 
 
 class ModelTester(unittest.TestCase):
@@ -40,8 +50,9 @@ class ModelTester(unittest.TestCase):
             cur_data = pickle.load(f)
         time.sleep(1)
         tic = time.perf_counter()
-        model = Model(self.model_name, self.model_path, force_rebuild=True)
+        model = Model(self.model_name, self.model_path, force_rebuild=True, jobs=2)
         self.assertGreater(time.time() - tic, cur_data["nominal"] // 2)
+        self.assertTrue({"configure", "build"}.issubset(model.build_timings))
 
     def test_03_no_compile(self):
         with open("data.pkl", "rb") as f:
@@ -101,6 +112,503 @@ class ModelTester(unittest.TestCase):
         model = Model(self.model_name, self.model_path)
         model.step_size
 
+    def _first_signal(self, model):
+        for info in model.get_params():
+            for sig in info.signals:
+                if sig.data_type.cDataType != "struct":
+                    return info.model_name, sig
+        self.skipTest("model has no numeric signals")
+
+    def test_13_signal_handle(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        handle = model.signal_handle(sig.block_name, model_name, sig.signal_name)
+        model.step()
+        np.testing.assert_array_equal(
+            model.read(handle), model.get_signal(sig.block_name, model_name, sig.signal_name)
+        )
+        model.reset()
+        model.step()
+        np.testing.assert_array_equal(
+            model.read(handle), model.get_signal(sig.block_name, model_name, sig.signal_name)
+        )
+
+    def test_14_signal_view(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        view = model.signal_view(sig.block_name, model_name, sig.signal_name)
+        self.assertFalse(view.flags.writeable)
+        model.step()
+        np.testing.assert_array_equal(
+            np.squeeze(view), model.get_signal(sig.block_name, model_name, sig.signal_name)
+        )
+
+    def test_15_get_signals(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        model.step()
+        expected = np.ravel(model.get_signal(sig.block_name, model_name, sig.signal_name))
+        handle = model.signal_handle(sig.block_name, model_name, sig.signal_name)
+        out = np.empty(2 * expected.size)
+        ret = model.get_signals([handle, (sig.block_name, model_name, sig.signal_name)], out=out)
+        self.assertIs(ret, out)
+        np.testing.assert_array_equal(out, np.concatenate([expected, expected]))
+
+    def test_16_run_record(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        trace = model.run(4, record=[spec], decimation=2)
+
+        model.reset()
+        expected = []
+        for _ in range(2):
+            model.step(2)
+            expected.append(model.get_signals([spec]))
+        np.testing.assert_array_equal(trace, np.stack(expected))
+
+    def test_17_name_index(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        self.assertGreaterEqual(model.index_build_time, 0)
+        for info in model.get_params():
+            for param in info.block_params:
+                model.block_param_handle(param.block_name, param.block_param, info.model_name)
+            for param in info.model_params:
+                model.model_param_handle(param.model_param, info.model_name)
+            for sig in info.signals:
+                model.signal_handle(sig.block_name, info.model_name, sig.signal_name)
+        with self.assertRaises(RuntimeError):
+            model.get_signal("does/not/exist")
+
+    def test_18_model_pool(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        pool = ModelPool(model, 3)
+        pool.reset()
+        pool.step_all()
+        pool[1].step(2)
+        pool.reset(0)
+
+        expected = []
+        for steps in (0, 3, 1):
+            model.reset()
+            for _ in range(steps):
+                model.step()
+            expected.append(model.get_signals([spec]))
+        np.testing.assert_array_equal(pool.get_signals([spec]), np.stack(expected))
+
+        # parameter handles are read as parameters in every instance
+        for info in model.get_params():
+            for param in info.model_params:
+                if param.data_type.cDataType == "struct":
+                    continue
+                values = pool.get_signals(
+                    [model.model_param_handle(param.model_param, info.model_name)]
+                )
+                for i, slot in enumerate(pool):
+                    handle = slot.model_param_handle(param.model_param, info.model_name)
+                    np.testing.assert_array_equal(values[i], slot.get_signals([handle]))
+        pool.close()
+
+    def test_19_run_sweep(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        expected = model.run(4, record=[spec])
+
+        traces = run_sweep(
+            {"model_name": self.model_name, "path_to_model": self.model_path},
+            [{}, {}, {}],
+            4,
+            [spec],
+            workers=2,
+        )
+        self.assertEqual(traces.shape, (3,) + expected.shape)
+        for trace in traces:
+            np.testing.assert_array_equal(trace, expected)
+
+    def test_20_snapshot_restore(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        model.step(2)
+        snap = model.snapshot()
+        self.assertEqual(snap.nbytes, model.snapshot_size)
+        first = model.run(5, record=[spec])
+        model.restore(snap)
+        np.testing.assert_array_equal(model.run(5, record=[spec]), first)
+
+    def test_21_build_cache(self):
+        with open("data.pkl", "rb") as f:
+            cur_data = pickle.load(f)
+        model = Model(self.model_name, self.model_path)
+        shutil.rmtree(os.path.join(model._model_paths.tmp_dir, "build"))
+        del model
+        tic = time.time()
+        model = Model(self.model_name, self.model_path)
+        self.assertLess(time.time() - tic, cur_data["nominal"] // 2)
+        model.reset()
+        model.step()
+
+    def _copy_model(self, work):
+        src = os.path.join(work, "model")
+        if zipfile.is_zipfile(self.model_path):
+            with zipfile.ZipFile(self.model_path, "r") as f:
+                f.extractall(src)
+        else:
+            shutil.copytree(self.model_path, src)
+        return src
+
+    def test_22_incremental_rebuild(self):
+        with open("data.pkl", "rb") as f:
+            cur_data = pickle.load(f)
+        # change a copy of the model, never the fixture
+        work = tempfile.mkdtemp()
+        try:
+            src = self._copy_model(work)
+            tmp_dir = os.path.join(work, "build")
+            model = Model(self.model_name, src, tmp_dir=tmp_dir, force_rebuild=True)
+            paths = model._model_paths
+            del model
+            with open(os.path.join(paths.root_model_path, paths.root_model_name + ".c"), "a") as f:
+                # unique, so the changed model is never in the build cache
+                f.write(f"\n/* touched by test_22_incremental_rebuild at {time.time_ns()} */\n")
+            tic = time.time()
+            model = Model(self.model_name, src, tmp_dir=tmp_dir)
+            self.assertIn("build", model.build_timings)
+            self.assertLess(time.time() - tic, cur_data["nominal"])
+            model.reset()
+            model.step()
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    def test_23_build_profile(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        expected = model.run(4, record=[spec])
+
+        tmp_dir = os.path.join(os.path.dirname(model._model_paths.tmp_dir), "fast_compile")
+        fast = Model(
+            self.model_name, self.model_path, tmp_dir=tmp_dir, build_profile="fast-compile"
+        )
+        fast.reset()
+        np.testing.assert_array_equal(fast.run(4, record=[spec]), expected)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        with self.assertRaises(ValueError):
+            Model(self.model_name, self.model_path, build_profile="fastest")
+
+    def test_24_load_async(self):
+        future = Model.load_async(model_name=self.model_name, path_to_model=self.model_path)
+        model = future.result()
+        model.reset()
+        model.step()
+        futures = compile_many([{"model_name": self.model_name, "path_to_model": self.model_path}])
+        self.assertIsInstance(futures[0].result(), Model)
+        self.assertTrue(os.path.isfile(Model.build(self.model_name, self.model_path)))
+
+    def test_25_catalog(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        for info in model.get_params():
+            for catalog in (info.signals, info.block_params, info.model_params):
+                columns = catalog.columns()
+                self.assertEqual(len(columns["size"]), len(catalog))
+                for i, entry in enumerate(catalog):
+                    dims = columns["dims"][
+                        columns["dims_offsets"][i] : columns["dims_offsets"][i + 1]
+                    ]
+                    self.assertEqual(list(dims), list(entry.data_type.dims))
+                    self.assertEqual(columns["size"][i], entry.size)
+                    self.assertEqual(columns["c_type"][i].decode(), entry.data_type.cDataType)
+                with self.assertRaises(IndexError):
+                    catalog[len(catalog)]
+
+    def test_26_find_signals(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        handles = model.find_signals(sig.block_name, mode="prefix", model_name=model_name)
+        handle = [
+            h for h in handles if (h.block_path, h.name) == (sig.block_name, sig.signal_name)
+        ][0]
+        found = model.find_signals(sig.block_name[:-1] + "*")
+        self.assertTrue(
+            {(h.block_path, h.name) for h in handles}.issubset(
+                {(h.block_path, h.name) for h in found}
+            )
+        )
+        model.step()
+        np.testing.assert_array_equal(
+            model.get_signals([handle]),
+            model.get_signals([(sig.block_name, model_name, sig.signal_name)]),
+        )
+        self.assertEqual(model.find_signals("^does/not/exist$", mode="regex"), [])
+        with self.assertRaises(ValueError):
+            model.find_signals("*", mode="fuzzy")
+
+    def test_27_threads(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = (sig.block_name, model_name, sig.signal_name)
+        steps = max(1, min(50, len(model) // 4))
+
+        def worker():
+            for _ in range(steps):
+                model.step()
+                model.get_signals([spec])
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        actual = model.get_signals([spec])
+
+        model.reset()
+        model.step(2 * steps)
+        np.testing.assert_array_equal(actual, model.get_signals([spec]))
+
+    def test_28_warm_start(self):
+        model = Model(self.model_name, self.model_path)
+        self.assertTrue(os.path.exists(os.path.join(model._model_paths.tmp_dir, "manifest.json")))
+        tic = time.perf_counter()
+        model = Model(self.model_name, self.model_path)
+        self.assertLess(time.perf_counter() - tic, 1)
+        self.assertEqual(model.path_dirs, [])
+        self.assertEqual(model.build_timings, {})
+        model.reset()
+        model.step()
+
+    def test_29_zip_extract(self):
+        model = Model(self.model_name, self.model_path)
+        stamp = model._model_paths.root_dir.rstrip(os.sep) + EXTRACT_STAMP
+        before = os.stat(stamp).st_mtime_ns if os.path.exists(stamp) else None
+        os.remove(os.path.join(model._model_paths.tmp_dir, "manifest.json"))
+        # the zip did not change, so it is not extracted again
+        model = Model(self.model_name, self.model_path)
+        after = os.stat(stamp).st_mtime_ns if os.path.exists(stamp) else None
+        self.assertEqual(before, after)
+        model.reset()
+        model.step()
+
+    def test_30_recorder(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = [(sig.block_name, model_name, sig.signal_name)]
+        steps = max(2, min(50, len(model) // 4))
+        expected = model.run(steps, record=spec, decimation=2)
+
+        path = os.path.join(model._model_paths.tmp_dir, "test.trace")
+        model.reset()
+        with model.recorder(path, spec, decimation=2, chunk_rows=3) as rec:
+            rec.run(1)
+            rec.run(steps - 1)
+        header, offset = read_header(path)
+        data = np.memmap(path, dtype=header["dtype"], mode="r", offset=offset).reshape(
+            -1, header["width"]
+        )
+        np.testing.assert_array_equal(data[:, 1:], expected)
+        self.assertEqual(header["signals"][0]["dims"], list(sig.data_type.dims))
+        del data
+
+        # rows recorded before the model stops are kept
+        model.reset()
+        with self.assertRaises(RuntimeError) as err:
+            model.run(len(model) + 10)
+        self.assertGreater(err.exception.steps, 0)
+        model.reset()
+        with model.recorder(path, spec, chunk_rows=3) as rec:
+            with self.assertRaises(RuntimeError):
+                rec.run(len(model) + 10)
+        self.assertEqual(rec.rows, err.exception.steps)
+        os.remove(path)
+
+    def test_31_traces(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        model_name, sig = self._first_signal(model)
+        spec = [(sig.block_name, model_name, sig.signal_name)]
+        steps = max(2, min(50, len(model) // 4))
+
+        paths = [os.path.join(model._model_paths.tmp_dir, f"test_{i}.trace") for i in range(2)]
+        for path in paths:
+            with model.recorder(path, spec, chunk_rows=4) as rec:
+                rec.run(steps // 2)
+        trace = traces.concat(paths)
+        model.reset()
+        expected = model.run(2 * (steps // 2), record=spec)
+
+        values = trace[spec[0]][:]
+        self.assertEqual(values.shape, trace[spec[0]].shape)
+        np.testing.assert_array_equal(values.reshape(len(trace), -1), expected)
+        time = trace.time[:]
+        self.assertTrue(np.all(np.diff(time) > 0))
+        selected = trace.time[float(time[1]) : float(time[-1]) : 2]
+        np.testing.assert_array_equal(selected, time[1:-1:2])
+        with self.assertRaises(TypeError):
+            trace.time[float(time[1]) : len(trace)]
+        del trace, values
+        for path in paths:
+            os.remove(path)
+
+    def test_32_write_log(self):
+        # only a build in this process knows whether the model logs
+        model = Model(self.model_name, self.model_path, force_rebuild=True)
+        if not model._compiler.matlogging:
+            self.skipTest("model was generated without MAT-file logging")
+        model.reset()
+        model.step(min(10, len(model)))
+        with tempfile.TemporaryDirectory() as work:
+            path = os.path.join(work, "log.mat")
+            model.write_log(path)
+            with self.assertRaises(RuntimeError):
+                model.step()
+            with self.assertRaises(RuntimeError):
+                model.write_log(path)
+        model.reset()
+        model.step()
+
+    def test_33_run_inputs(self):
+        model = Model(self.model_name, self.model_path)
+        model.reset()
+        root = model._model_paths.root_model_name
+        if model._model.catalog_size(root, model._kinds.root_input) == 0:
+            self.skipTest("model has no root inports")
+        inport = model._model.catalog_entry(root, model._kinds.root_input, 0)
+        handle = model.root_input_handle(inport.block_name)
+        model_name, sig = self._first_signal(model)
+        spec = [handle, (sig.block_name, model_name, sig.signal_name)]
+        steps = max(2, min(20, len(model) // 4))
+        values = np.arange(1, steps + 1)[:, None] * np.ones((steps, handle.size))
+
+        trace = model.run(steps, record=spec, inputs={handle: values})
+        np.testing.assert_array_equal(trace[:, : handle.size], values)
+        self.assertTrue(np.all(np.diff(trace[:, 0]) != 0))
+
+        model.reset()
+        expected = [
+            model.run(1, record=spec, inputs={handle: values[i : i + 1]})[0] for i in range(steps)
+        ]
+        np.testing.assert_array_equal(trace, np.stack(expected))
+
+        with self.assertRaises(ValueError):
+            model.run(steps, inputs={handle: values[:-1]})
+        with self.assertRaises(ValueError):
+            model.run(steps, inputs={handle: np.ones((steps, handle.size + 1))})
+
+    def test_34_core_library(self):
+        if build_cache.cache_dir() is None:
+            self.skipTest("the build cache is disabled")
+        work = tempfile.mkdtemp()
+        try:
+            first = Model(
+                self.model_name,
+                self._copy_model(work),
+                tmp_dir=os.path.join(work, "first"),
+                force_rebuild=True,
+            )
+            # the same model generated again: only the banners of the generated headers differ
+            src = self._copy_model(os.path.join(work, "second"))
+            for header in glob.glob(os.path.join(src, "**", "rtwtypes.h"), recursive=True):
+                with open(header, "r") as f:
+                    text = f.read()
+                with open(header, "w") as f:
+                    f.write(f"/* generated at {time.time_ns()} */\n" + text)
+            second = Model(self.model_name, src, tmp_dir=os.path.join(work, "second", "build"))
+            self.assertIn("build", second.build_timings)
+            self.assertNotIn("shared_libs", second.build_timings)
+            self.assertEqual(
+                second._compiler.prebuilt[CORE_LIB], first._compiler.prebuilt[CORE_LIB]
+            )
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    def test_35_manifest_sources(self):
+        work = tempfile.mkdtemp()
+        try:
+            src = self._copy_model(work)
+            tmp_dir = os.path.join(work, "build")
+            model = Model(self.model_name, src, tmp_dir=tmp_dir)
+            self.assertIsNotNone(
+                manifest.read(src, self.model_name, "grt", "rtw", tmp_dir, None, "release")
+            )
+            # the model name may be given with its folder suffix
+            suffixed = self.model_name + "_grt_rtw"
+            self.assertIsNotNone(
+                manifest.read(src, suffixed, "grt", "rtw", tmp_dir, None, "release")
+            )
+            # a file outside of the root model's folder (like a referenced model) goes into the build too
+            with open(os.path.join(model._model_paths.models_dir, "added.h"), "w") as f:
+                f.write("/* added by test_35_manifest_sources */\n")
+            self.assertIsNone(
+                manifest.read(src, self.model_name, "grt", "rtw", tmp_dir, None, "release")
+            )
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    def test_36_skip_compile_zip(self):
+        model = Model(self.model_name, self.model_path)
+        paths = model._model_paths
+        if not paths.was_zip:
+            self.skipTest("model is not a zip file")
+        # a build served from the cache: nothing was extracted and there is no warm start manifest
+        os.remove(os.path.join(paths.tmp_dir, "manifest.json"))
+        shutil.rmtree(paths.root_dir, ignore_errors=True)
+        if os.path.exists(paths.root_dir.rstrip(os.sep) + EXTRACT_STAMP):
+            os.remove(paths.root_dir.rstrip(os.sep) + EXTRACT_STAMP)
+        model = Model(self.model_name, self.model_path, skip_compile=True)
+        model.reset()
+        model.step()
+
+    def test_37_data_objects(self):
+        header = """
+#ifndef RTW_HEADER_demo_h_
+#define RTW_HEADER_demo_h_
+typedef struct {
+  real_T Gain;                         /* '<Root>/Gain' */
+} B_demo_T;
+
+/* Block signals (default storage) */
+extern B_demo_T demo_B;
+extern DW_demo_T demo_DW;              // Block states (default storage)
+extern real_T demo_table[3][2];
+extern volatile real_T demo_flag;
+extern struct tag_RTM_demo_T
+  demo_rtm;
+extern real_T *demo_ptr;
+extern const ConstP_demo_T demo_ConstP;
+extern RT_MODEL_demo_T *const demo_M;
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+  extern void demo_initialize(void);
+  extern void demo_step(RT_MODEL_demo_T *const demo_M);
+  extern int32_T demo_a, demo_b;
+#ifdef __cplusplus
+}
+#endif
+#endif
+"""
+        names, unknown = parse_data_objects(header)
+        self.assertEqual(
+            names, ["demo_B", "demo_DW", "demo_table", "demo_flag", "demo_rtm", "demo_ptr"]
+        )
+        self.assertEqual(unknown, ["extern int32_T demo_a, demo_b"])
+
     def test_99_cleanup(self):
         model = Model(self.model_name, self.model_path)
         if model is not None:
@@ -1,7 +1,24 @@
 from .lib.model import Model
+from .lib.model_pool import ModelPool
 from .lib.exceptions import BuildError, GenerationError
 from .utils.model_utils import print_all_params
 from .lib import model_types as types
+from .lib import parallel
+from .lib import recorder
+from .lib import traces
+from .lib.loader import compile_many
 from .utils import annotation_utils as anno
 
-__all__ = ["Model", "BuildError", "GenerationError", "print_all_params", "types", "anno"]
+__all__ = [
+    "Model",
+    "ModelPool",
+    "BuildError",
+    "GenerationError",
+    "print_all_params",
+    "compile_many",
+    "types",
+    "parallel",
+    "recorder",
+    "traces",
+    "anno",
+]
@@ -0,0 +1,638 @@
+//
+// Created by landon on 10/24/21.
+//
+#include "model_utils.hpp"
+#include <cstring>
+#include <memory>
+#include <sstream>
+#include <unordered_map>
+#include <string>
+#include <utility>
+#include <tuple>
+#include <cassert>
+#include <cstdint>
+#include <algorithm>
+
+py::buffer_info PYSIMLINK::get_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param,
+                                  const PYSIMLINK::NameIndex &index) {
+    if (param == nullptr)
+        throw std::runtime_error("passed nullptr to get_model_param as search param");
+
+    const rtwCAPI_ModelParameters *capiModelParams = rtwCAPI_GetModelParameters(mmi);
+    size_t param_index = PYSIMLINK::find_model_param(mmi, param, index);
+
+    rtwCAPI_DataTypeMap dt = mmi->staticMap->Maps.dataTypeMap[rtwCAPI_GetModelParameterDataTypeIdx(capiModelParams,
+                                                                                                   param_index)];
+    void *addr = mmi->InstanceMap.dataAddrMap[rtwCAPI_GetModelParameterAddrIdx(capiModelParams, param_index)];
+    rtwCAPI_DimensionMap paramDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetBlockParameterDimensionIdx(
+            capiModelParams, param_index)];
+    return PYSIMLINK::from_buffer_struct(PYSIMLINK::format_pybuffer(mmi, dt, paramDim, addr));
+}
+
+py::buffer_info PYSIMLINK::get_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param,
+                                           const PYSIMLINK::NameIndex &index) {
+    const rtwCAPI_BlockParameters *capiBlockParameters = rtwCAPI_GetBlockParameters(mmi);
+    size_t param_iter = PYSIMLINK::find_block_param(mmi, block, param, index);
+
+    rtwCAPI_DataTypeMap dt = mmi->staticMap->Maps.dataTypeMap[rtwCAPI_GetBlockParameterDataTypeIdx(capiBlockParameters,
+                                                                                                   param_iter)];
+    rtwCAPI_DimensionMap sigDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetBlockParameterDimensionIdx(
+            capiBlockParameters, param_iter)];
+    void *addr = mmi->InstanceMap.dataAddrMap[rtwCAPI_GetBlockParameterAddrIdx(capiBlockParameters, param_iter)];
+    return PYSIMLINK::from_buffer_struct(PYSIMLINK::format_pybuffer(mmi, dt, sigDim, addr));
+}
+
+size_t PYSIMLINK::find_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param,
+                                   const PYSIMLINK::NameIndex &index) {
+    size_t i;
+    if (index.find(EntryKind::model_param, mmi, param, nullptr, &i))
+        return i;
+
+    // never found the parameter
+    std::stringstream err("");
+    err << "get_model_param: Parameter (" << param << ") does not exist in model";
+    throw std::runtime_error(err.str().c_str());
+}
+
+size_t PYSIMLINK::find_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param,
+                                   const PYSIMLINK::NameIndex &index) {
+    size_t i;
+    if (index.find(EntryKind::block_param, mmi, block, param, &i))
+        return i;
+
+    std::stringstream err("");
+    err << "get_block_param: Parameter (" << block << ',' << param << ") does not exist in model";
+    throw std::runtime_error(err.str().c_str());
+}
+
+size_t PYSIMLINK::find_signal(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *sigName,
+                              const PYSIMLINK::NameIndex &index) {
+    assert(mmi != nullptr);
+
+    if (block == nullptr && sigName == nullptr)
+        throw std::runtime_error("get_signal_val: Must specify signal name or origin block to search for signal");
+
+    size_t i;
+    bool found;
+    if (sigName == nullptr)
+        found = index.find(EntryKind::signal_block, mmi, block, nullptr, &i);
+    else if (block == nullptr)
+        found = index.find(EntryKind::signal_name, mmi, sigName, nullptr, &i);
+    else
+        found = index.find(EntryKind::signal, mmi, block, sigName, &i);
+    if (found)
+        return i;
+
+    std::stringstream err("");
+    err << "get_signal_val: Parameter (" << (block == nullptr ? "" : block) << ','
+        << (sigName == nullptr ? "" : sigName) << ") does not exist in provided model";
+    throw std::runtime_error(err.str().c_str());
+}
+
+size_t PYSIMLINK::find_root_input(const rtwCAPI_ModelMappingInfo *mmi, const char *block) {
+    const rtwCAPI_Signals *rootInputs = rtwCAPI_GetRootInputs(mmi);
+    uint_T numInputs = rtwCAPI_GetNumRootInputs(mmi);
+    for (size_t i = 0; i < numInputs; i++) {
+        if (strcmp(block, rtwCAPI_GetSignalBlockPath(rootInputs, i)) == 0)
+            return i;
+    }
+
+    std::stringstream err("");
+    err << "find_root_input: Root inport (" << block << ") does not exist in model";
+    throw std::runtime_error(err.str().c_str());
+}
+
+struct std::unique_ptr<PYSIMLINK::signal_info> PYSIMLINK::get_signal_val(const rtwCAPI_ModelMappingInfo *mmi,
+                                          const PYSIMLINK::NameIndex &index,
+                                          const char *block, const char *sigName) {
+    const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+    size_t param_index = PYSIMLINK::find_signal(mmi, block, sigName, index);
+
+    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[rtwCAPI_GetSignalDataTypeIdx(capiSignals, param_index)];
+    rtwCAPI_DimensionMap sigDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetSignalDimensionIdx(capiSignals, param_index)];
+    void *addr = rtwCAPI_GetDataAddressMap(mmi)[rtwCAPI_GetSignalAddrIdx(capiSignals, param_index)];
+
+    // use malloc instead of new so we don't call every constructor. This looks nasty because we also have to use free
+    std::unique_ptr<PYSIMLINK::signal_info> ret(new PYSIMLINK::signal_info);
+    if(strcmp(dt.cDataName, "void") == 0 || strcmp(dt.cDataName, "struct") == 0){
+        ret->is_array = false;
+        ret->type_size = dt.dataSize;
+        strcpy(ret->struct_name, dt.mwDataName);
+        ret->data.addr = addr;
+    }else{
+        ret->is_array = true;
+        PYSIMLINK::format_pybuffer(mmi, dt, sigDim, addr, &ret->data.arr);
+    }
+    return ret;
+}
+
+
+void PYSIMLINK::format_pybuffer(const rtwCAPI_ModelMappingInfo *mmi, rtwCAPI_DataTypeMap dt, rtwCAPI_DimensionMap sigDim,
+                           void *addr, PYSIMLINK::BufferLike *ret) {
+
+    // doesn't matter where the buffer is (stack or heap), fill them the same
+    // this way we don't have to copy vectors from stack->heap when it's assigned to the heap
+    ret->ptr = addr;
+    ret->itemsize = dt.dataSize;
+
+    if (strcmp(dt.cDataName, "int") == 0) {
+        strcpy(ret->format, py::format_descriptor<int>::format().c_str());
+    } else if (strcmp(dt.cDataName, "float") == 0) {
+        strcpy(ret->format, py::format_descriptor<float>::format().c_str());
+    } else if (strcmp(dt.cDataName, "double") == 0) {
+        strcpy(ret->format, py::format_descriptor<double>::format().c_str());
+    } else if (strcmp(dt.cDataName, "char") == 0) {
+        strcpy(ret->format, py::format_descriptor<char>::format().c_str());
+    } else if (strcmp(dt.cDataName, "unsigned char") == 0) {
+        strcpy(ret->format, py::format_descriptor<unsigned char>::format().c_str());
+    } else if (strcmp(dt.cDataName, "short") == 0) {
+        strcpy(ret->format, py::format_descriptor<short>::format().c_str());
+    } else if (strcmp(dt.cDataName, "unsigned short") == 0) {
+        strcpy(ret->format, py::format_descriptor<unsigned short>::format().c_str());
+    } else if (strcmp(dt.cDataName, "long") == 0) {
+        strcpy(ret->format, py::format_descriptor<long>::format().c_str());
+    } else if (strcmp(dt.cDataName, "unsigned int") == 0) {
+        strcpy(ret->format, py::format_descriptor<unsigned int>::format().c_str());
+    } else if (strcmp(dt.cDataName, "unsigned long") == 0) {
+        strcpy(ret->format, py::format_descriptor<unsigned long>::format().c_str());
+    } else {
+        std::stringstream err("");
+        err << "Parameter has invalid cDataName(" << dt.cDataName << ") (internal error)";
+        throw std::runtime_error(err.str().c_str());
+    }
+    ret->ndim = sigDim.numDims;
+    if (ret->ndim > 3) {
+        throw std::runtime_error(
+                "Cannot return values with more than 3 dimensions...yet. Fix the issue and open a pull request!");
+    }
+    for (size_t i = 0; i < ret->ndim; i++) {
+        ssize_t dim_size = rtwCAPI_GetDimensionArray(mmi)[sigDim.dimArrayIndex + i];
+        ssize_t cur_stride;
+        ret->shape[i] = dim_size;
+        switch (sigDim.orientation) {
+            case rtwCAPI_Orientation::rtwCAPI_SCALAR:
+            case rtwCAPI_Orientation::rtwCAPI_VECTOR:
+                ret->strides[i] = dt.dataSize;
+                break;
+            case rtwCAPI_Orientation::rtwCAPI_MATRIX_COL_MAJOR:
+            case rtwCAPI_Orientation::rtwCAPI_MATRIX_COL_MAJOR_ND:
+                cur_stride = dt.dataSize;
+                for(size_t j = 0; j < i; j++){
+                    cur_stride *= rtwCAPI_GetDimensionArray(mmi)[sigDim.dimArrayIndex + j];
+                }
+                ret->strides[i] = cur_stride;
+                break;
+            case rtwCAPI_Orientation::rtwCAPI_MATRIX_ROW_MAJOR:
+                if (i == 0)
+                    ret->strides[i] = dt.dataSize * dim_size;
+                else
+                    ret->strides[i] = dt.dataSize;
+                break;
+            case rtwCAPI_Orientation::rtwCAPI_MATRIX_ROW_MAJOR_ND:
+                throw std::runtime_error(
+                        "ND matrices not supported in row major orientation. Use column major for 3-dim matrices");
+                break;
+            default:
+                throw std::runtime_error("Invalid/Unknown orientation for parameter (internal error)");
+        }
+    }
+
+    ret->readonly = true;
+}
+
+PYSIMLINK::BufferLike
+PYSIMLINK::format_pybuffer(const rtwCAPI_ModelMappingInfo *mmi, rtwCAPI_DataTypeMap dt, rtwCAPI_DimensionMap sigDim,
+                           void *addr) {
+    // allocate the buffer on the stack, proceed like normal
+    PYSIMLINK::BufferLike ret;
+    format_pybuffer(mmi, dt, sigDim, addr, &ret);
+    return ret;
+}
+
+void PYSIMLINK::set_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param, py::array value,
+                                const PYSIMLINK::NameIndex &index) {
+    const rtwCAPI_BlockParameters *capiBlockParameters = rtwCAPI_GetBlockParameters(mmi);
+    size_t i = PYSIMLINK::find_block_param(mmi, block, param, index);
+
+    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[rtwCAPI_GetBlockParameterDataTypeIdx(
+            capiBlockParameters, i)];
+    rtwCAPI_DimensionMap blockDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetBlockParameterDimensionIdx(
+            capiBlockParameters, i)];
+    void *addr = rtwCAPI_GetDataAddressMap(mmi)[rtwCAPI_GetBlockParameterAddrIdx(capiBlockParameters, i)];
+
+    PYSIMLINK::fill_from_buffer(mmi, dt, blockDim, addr, value);
+}
+
+std::vector<struct PYSIMLINK::ModelParam> PYSIMLINK::debug_model_params(const rtwCAPI_ModelMappingInfo *mmi) {
+    uint_T numParams = rtwCAPI_GetNumModelParameters(mmi);
+    const rtwCAPI_ModelParameters *capiModelParams = rtwCAPI_GetModelParameters(mmi);
+    std::vector<struct PYSIMLINK::ModelParam> ret;
+    ret.reserve(numParams);
+    for (size_t i = 0; i < numParams; i++) {
+        struct PYSIMLINK::ModelParam to_add;
+        to_add.model_param = capiModelParams[i].varName;
+        to_add.data_type = PYSIMLINK::populate_dtype(mmi, capiModelParams[i]);
+        ret.push_back(to_add);
+    }
+    return ret;
+}
+
+std::vector<struct PYSIMLINK::BlockParam> PYSIMLINK::debug_block_param(const rtwCAPI_ModelMappingInfo *mmi) {
+    const rtwCAPI_BlockParameters *capiBlockParams = rtwCAPI_GetBlockParameters(mmi);
+    uint_T nParams = rtwCAPI_GetNumBlockParameters(mmi);
+    std::vector<struct PYSIMLINK::BlockParam> ret;
+    ret.reserve(nParams);
+
+    for (size_t i = 0; i < nParams; i++) {
+        struct PYSIMLINK::BlockParam to_add;
+        to_add.block_name = capiBlockParams[i].blockPath;
+        to_add.block_param = capiBlockParams[i].paramName;
+        to_add.data_type = PYSIMLINK::populate_dtype(mmi, capiBlockParams[i]);
+        ret.push_back(to_add);
+    }
+    return ret;
+}
+
+std::vector<struct PYSIMLINK::Signal> PYSIMLINK::debug_signals(const rtwCAPI_ModelMappingInfo *mmi) {
+    uint_T numSigs = rtwCAPI_GetNumSignals(mmi);
+    const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+
+    std::vector<struct PYSIMLINK::Signal> ret;
+    ret.reserve(numSigs);
+    for (size_t i = 0; i < numSigs; i++) {
+        struct PYSIMLINK::Signal to_add;
+        to_add.block_name = PYSIMLINK::safe_string(capiSignals[i].blockPath);
+        to_add.signal_name = PYSIMLINK::safe_string(capiSignals[i].signalName);
+        to_add.data_type = PYSIMLINK::populate_dtype(mmi, capiSignals[i]);
+        ret.push_back(to_add);
+    }
+    return ret;
+}
+
+PYSIMLINK::ModelInfo PYSIMLINK::debug_model_info(const rtwCAPI_ModelMappingInfo *mmi) {
+    struct PYSIMLINK::ModelInfo ret;
+    ret.model_name = mmi->InstanceMap.path == nullptr ? "root" : std::string(mmi->InstanceMap.path);
+    ret.block_params = debug_block_param(mmi);
+    ret.model_params = debug_model_params(mmi);
+    ret.signals = debug_signals(mmi);
+
+    return ret;
+}
+
+void
+PYSIMLINK::fill_from_buffer(const rtwCAPI_ModelMappingInfo *mmi, rtwCAPI_DataTypeMap dt, rtwCAPI_DimensionMap blockDim,
+                            void *addr, py::array value) {
+    // data type check
+    std::string dtype_raw = repr(PYBIND11_STR_TYPE(value.dtype()));
+    auto cit = PYSIMLINK::c_python_dtypes.find(dt.cDataName);
+    if (cit == PYSIMLINK::c_python_dtypes.end()) {
+        std::stringstream ss;
+        ss << "Unknown C datatype. Not present in datatype map. ";
+        ss << "Got " << dt.cDataName;
+        throw std::runtime_error(ss.str());
+    }
+
+    if (strncmp(cit->second.c_str(), dtype_raw.c_str(), strlen(cit->second.c_str())) == 0 ||
+        dt.dataSize != value.itemsize()) {
+        std::stringstream ss;
+        ss << "Datatype of array does not match datatype of Parameter. ";
+        ss << "Expected " << cit->second.c_str() << " got dtype " << dtype_raw.c_str();
+        throw std::runtime_error(ss.str());
+    }
+
+    // dimension check
+    if (blockDim.numDims != value.ndim()) {
+        std::stringstream ss;
+        ss << "Dimension mismatch. ";
+        ss << "Expected " << (int)blockDim.numDims << " got " << value.ndim();
+        throw std::runtime_error(ss.str());
+    }
+
+    switch (blockDim.orientation) {
+        case rtwCAPI_MATRIX_COL_MAJOR_ND:
+            if (blockDim.numDims > 3)
+                throw std::runtime_error(
+                        "Cannot change parameters with more than 3 dimensions...yet. Open a pull request!");
+            break;
+        case rtwCAPI_MATRIX_ROW_MAJOR_ND:
+            throw std::runtime_error("Row major orientation for nd matrices not supported...yet.");
+            break;
+        default:
+            break;
+    }
+
+    // perform the actual copy
+    memcpy(addr, value.data(), value.nbytes());
+}
+
+std::string PYSIMLINK::translate_c_type_name(const std::string& c_name, bool should_throw) {
+    auto finder = PYSIMLINK::c_python_dtypes.find(c_name);
+    if(finder == PYSIMLINK::c_python_dtypes.end()){
+        if(should_throw){
+            std::stringstream ss;
+            ss << "could not find matching python dtype for " << c_name;
+            throw std::runtime_error(ss.str());
+        }else{
+            return "void";
+        }
+    }else{
+        return finder->second;
+    }
+}
+
+struct PYSIMLINK::DataType PYSIMLINK::describe_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block_path,
+                                                           const char *param,
+                                                           const PYSIMLINK::NameIndex &index) {
+    size_t i = PYSIMLINK::find_block_param(mmi, block_path, param, index);
+    return PYSIMLINK::populate_dtype(mmi, rtwCAPI_GetBlockParameters(mmi)[i]);
+}
+
+void PYSIMLINK::set_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param, py::array value,
+                                const PYSIMLINK::NameIndex &index) {
+    const rtwCAPI_ModelParameters *capiModelParameters = rtwCAPI_GetModelParameters(mmi);
+    size_t i = PYSIMLINK::find_model_param(mmi, param, index);
+
+    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[rtwCAPI_GetModelParameterDataTypeIdx(
+            capiModelParameters, i)];
+    rtwCAPI_DimensionMap blockDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetModelParameterDimensionIdx(
+            capiModelParameters, i)];
+    void *addr = rtwCAPI_GetDataAddressMap(mmi)[rtwCAPI_GetModelParameterAddrIdx(capiModelParameters, i)];
+
+    PYSIMLINK::fill_from_buffer(mmi, dt, blockDim, addr, value);
+}
+
+struct PYSIMLINK::DataType PYSIMLINK::describe_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param,
+                                                           const PYSIMLINK::NameIndex &index) {
+    size_t i = PYSIMLINK::find_model_param(mmi, param, index);
+    return PYSIMLINK::populate_dtype(mmi, rtwCAPI_GetModelParameters(mmi)[i]);
+}
+
+struct PYSIMLINK::DataType PYSIMLINK::describe_signal(const rtwCAPI_ModelMappingInfo *mmi, const char* block, const char* sigName, const PYSIMLINK::NameIndex &index){
+    const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+    size_t param_index = PYSIMLINK::find_signal(mmi, block, sigName, index);
+
+    return PYSIMLINK::populate_dtype(mmi, capiSignals[param_index]);
+//
+//    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[rtwCAPI_GetSignalDataTypeIdx(capiSignals, param_index)];
+//    rtwCAPI_DimensionMap sigDim = rtwCAPI_GetDimensionMap(mmi)[rtwCAPI_GetSignalDimensionIdx(capiSignals, param_index)];
+//    PYSIMLINK::DataType ret = {
+//            .cDataType = dt.cDataName,
+//            .orientation = sigDim.orientation,
+//            .dims = sigDim.numDims,
+//            .pythonType = dt.
+//    };
+}
+
+py::buffer_info PYSIMLINK::from_buffer_struct(const PYSIMLINK::BufferLike &buffer){
+    py::buffer_info ret;
+
+    ret.ptr = buffer.ptr;
+    ret.itemsize = buffer.itemsize;
+    ret.format = buffer.format;
+    ret.ndim = buffer.ndim;
+    for(size_t i=0; i < ret.ndim; i++){
+        ret.shape.push_back(buffer.shape[i]);
+        ret.strides.push_back(buffer.strides[i]);
+    }
+    ret.readonly = buffer.readonly;
+
+    return ret;
+}
+
+ssize_t PYSIMLINK::buffer_size(const PYSIMLINK::BufferLike &buffer){
+    ssize_t ret = 1;
+    for(ssize_t i = 0; i < buffer.ndim; i++){
+        ret *= buffer.shape[i];
+    }
+    return ret;
+}
+
+template <typename T>
+static void copy_strided(const PYSIMLINK::BufferLike &buffer, double *out){
+    // pad to 3 dimensions so every orientation is copied in c order with the same loop
+    ssize_t shape[3] = {1, 1, 1};
+    ssize_t strides[3] = {0, 0, 0};
+    for(ssize_t i = 0; i < buffer.ndim; i++){
+        shape[i] = buffer.shape[i];
+        strides[i] = buffer.strides[i];
+    }
+
+    const char *base = static_cast<const char*>(buffer.ptr);
+    for(ssize_t i = 0; i < shape[0]; i++){
+        for(ssize_t j = 0; j < shape[1]; j++){
+            for(ssize_t k = 0; k < shape[2]; k++){
+                *out++ = static_cast<double>(*reinterpret_cast<const T*>(base + i*strides[0] + j*strides[1] + k*strides[2]));
+            }
+        }
+    }
+}
+
+void PYSIMLINK::copy_as_double(const PYSIMLINK::BufferLike &buffer, double *out){
+    // format strings are created by format_pybuffer using pybind's format descriptors
+    switch(buffer.format[0]){
+        case 'd': copy_strided<double>(buffer, out); break;
+        case 'f': copy_strided<float>(buffer, out); break;
+        case 'b': copy_strided<int8_t>(buffer, out); break;
+        case 'B': copy_strided<uint8_t>(buffer, out); break;
+        case 'h': copy_strided<int16_t>(buffer, out); break;
+        case 'H': copy_strided<uint16_t>(buffer, out); break;
+        case 'i': copy_strided<int32_t>(buffer, out); break;
+        case 'I': copy_strided<uint32_t>(buffer, out); break;
+        case 'q': case 'l': copy_strided<int64_t>(buffer, out); break;
+        case 'Q': case 'L': copy_strided<uint64_t>(buffer, out); break;
+        default:
+            std::stringstream err("");
+            err << "Cannot convert format (" << buffer.format << ") to double (internal error)";
+            throw std::runtime_error(err.str());
+    }
+}
+
+static void add_capi_region(const rtwCAPI_ModelMappingInfo *mmi, uint_T addr_idx, uint_T dtype_idx, uint_T dim_idx,
+                            std::vector<PYSIMLINK::MemRegion> &regions) {
+    void *addr = rtwCAPI_GetDataAddressMap(mmi)[addr_idx];
+    if (addr == nullptr)
+        return;
+
+    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[dtype_idx];
+    rtwCAPI_DimensionMap dim = rtwCAPI_GetDimensionMap(mmi)[dim_idx];
+    const uint_T *dimArray = rtwCAPI_GetDimensionArray(mmi);
+    size_t numel = 1;
+    for (size_t i = 0; i < dim.numDims; i++) {
+        numel *= dimArray[dim.dimArrayIndex + i];
+    }
+    regions.push_back(PYSIMLINK::MemRegion{static_cast<char *>(addr), numel * dt.dataSize});
+}
+
+void PYSIMLINK::add_capi_regions(const rtwCAPI_ModelMappingInfo *mmi, std::vector<PYSIMLINK::MemRegion> &regions) {
+    const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumSignals(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetSignalAddrIdx(capiSignals, i), rtwCAPI_GetSignalDataTypeIdx(capiSignals, i),
+                        rtwCAPI_GetSignalDimensionIdx(capiSignals, i), regions);
+    }
+
+    const rtwCAPI_Signals *rootInputs = rtwCAPI_GetRootInputs(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumRootInputs(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetSignalAddrIdx(rootInputs, i), rtwCAPI_GetSignalDataTypeIdx(rootInputs, i),
+                        rtwCAPI_GetSignalDimensionIdx(rootInputs, i), regions);
+    }
+
+    const rtwCAPI_Signals *rootOutputs = rtwCAPI_GetRootOutputs(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumRootOutputs(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetSignalAddrIdx(rootOutputs, i), rtwCAPI_GetSignalDataTypeIdx(rootOutputs, i),
+                        rtwCAPI_GetSignalDimensionIdx(rootOutputs, i), regions);
+    }
+
+    const rtwCAPI_States *capiStates = rtwCAPI_GetStates(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumStates(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetStateAddrIdx(capiStates, i), rtwCAPI_GetStateDataTypeIdx(capiStates, i),
+                        rtwCAPI_GetStateDimensionIdx(capiStates, i), regions);
+    }
+
+    const rtwCAPI_BlockParameters *capiBlockParameters = rtwCAPI_GetBlockParameters(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumBlockParameters(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetBlockParameterAddrIdx(capiBlockParameters, i),
+                        rtwCAPI_GetBlockParameterDataTypeIdx(capiBlockParameters, i),
+                        rtwCAPI_GetBlockParameterDimensionIdx(capiBlockParameters, i), regions);
+    }
+
+    const rtwCAPI_ModelParameters *capiModelParams = rtwCAPI_GetModelParameters(mmi);
+    for (size_t i = 0; i < rtwCAPI_GetNumModelParameters(mmi); i++) {
+        add_capi_region(mmi, rtwCAPI_GetModelParameterAddrIdx(capiModelParams, i),
+                        rtwCAPI_GetModelParameterDataTypeIdx(capiModelParams, i),
+                        rtwCAPI_GetModelParameterDimensionIdx(capiModelParams, i), regions);
+    }
+}
+
+void PYSIMLINK::merge_regions(std::vector<PYSIMLINK::MemRegion> &regions) {
+    // sort by address and join overlapping or touching regions so every byte is copied once
+    std::sort(regions.begin(), regions.end(), [](const MemRegion &lhs, const MemRegion &rhs) {
+        return lhs.addr < rhs.addr;
+    });
+
+    std::vector<PYSIMLINK::MemRegion> merged;
+    for (auto &region : regions) {
+        if (region.size == 0)
+            continue;
+        if (!merged.empty() && region.addr <= merged.back().addr + merged.back().size) {
+            char *end = std::max(merged.back().addr + merged.back().size, region.addr + region.size);
+            merged.back().size = end - merged.back().addr;
+        } else {
+            merged.push_back(region);
+        }
+    }
+    regions.swap(merged);
+}
+
+size_t PYSIMLINK::catalog_size(const rtwCAPI_ModelMappingInfo *mmi, PYSIMLINK::HandleKind kind) {
+    switch(kind){
+        case PYSIMLINK::HandleKind::signal:
+            return rtwCAPI_GetNumSignals(mmi);
+        case PYSIMLINK::HandleKind::block_param:
+            return rtwCAPI_GetNumBlockParameters(mmi);
+        case PYSIMLINK::HandleKind::model_param:
+            return rtwCAPI_GetNumModelParameters(mmi);
+        case PYSIMLINK::HandleKind::root_input:
+            return rtwCAPI_GetNumRootInputs(mmi);
+    }
+    throw std::runtime_error("Invalid/Unknown catalog kind (internal error)");
+}
+
+namespace {
+    // the parts of a c api entry that describe it, whatever table it comes from
+    struct CatalogEntry {
+        const char *block_path;
+        const char *name;
+        uint_T data_type_idx;
+        uint_T dim_idx;
+    };
+
+    CatalogEntry catalog_entry(const rtwCAPI_ModelMappingInfo *mmi, PYSIMLINK::HandleKind kind, size_t idx) {
+        switch(kind){
+            case PYSIMLINK::HandleKind::signal: {
+                const rtwCAPI_Signals &sig = rtwCAPI_GetSignals(mmi)[idx];
+                return {sig.blockPath, sig.signalName, sig.dataTypeIndex, sig.dimIndex};
+            }
+            case PYSIMLINK::HandleKind::block_param: {
+                const rtwCAPI_BlockParameters &param = rtwCAPI_GetBlockParameters(mmi)[idx];
+                return {param.blockPath, param.paramName, param.dataTypeIndex, param.dimIndex};
+            }
+            case PYSIMLINK::HandleKind::model_param: {
+                const rtwCAPI_ModelParameters &param = rtwCAPI_GetModelParameters(mmi)[idx];
+                return {nullptr, param.varName, param.dataTypeIndex, param.dimIndex};
+            }
+            case PYSIMLINK::HandleKind::root_input: {
+                const rtwCAPI_Signals &sig = rtwCAPI_GetRootInputs(mmi)[idx];
+                return {sig.blockPath, sig.signalName, sig.dataTypeIndex, sig.dimIndex};
+            }
+        }
+        throw std::runtime_error("Invalid/Unknown catalog kind (internal error)");
+    }
+
+    // fixed width byte string column (numpy dtype S<n>), null strings are empty
+    py::array string_column(const std::vector<const char*> &values) {
+        size_t width = 1;
+        for(const char *value : values){
+            if(value != nullptr) width = std::max(width, strlen(value));
+        }
+        std::vector<ssize_t> shape = {(ssize_t)values.size()};
+        py::array ret(py::dtype("S" + std::to_string(width)), shape);
+        char *data = static_cast<char*>(ret.mutable_data());
+        memset(data, 0, width * values.size());
+        for(size_t i = 0; i < values.size(); i++){
+            if(values[i] != nullptr) memcpy(data + i * width, values[i], strlen(values[i]));
+        }
+        return ret;
+    }
+}
+
+py::dict PYSIMLINK::catalog_columns(const rtwCAPI_ModelMappingInfo *mmi, PYSIMLINK::HandleKind kind) {
+    size_t num = PYSIMLINK::catalog_size(mmi, kind);
+    const rtwCAPI_DataTypeMap *dtypes = rtwCAPI_GetDataTypeMap(mmi);
+    const rtwCAPI_DimensionMap *dim_map = rtwCAPI_GetDimensionMap(mmi);
+    const uint_T *dim_array = rtwCAPI_GetDimensionArray(mmi);
+
+    std::vector<const char*> block_paths(num), names(num), c_types(num), mw_types(num), python_types(num);
+    py::array_t<int32_t> orientation((ssize_t)num);
+    py::array_t<int64_t> sizes((ssize_t)num);
+    py::array_t<int64_t> dims_offsets((ssize_t)num + 1);
+    std::vector<int64_t> dims;
+    dims.reserve(2 * num);
+
+    auto orientation_data = orientation.mutable_unchecked<1>();
+    auto size_data = sizes.mutable_unchecked<1>();
+    auto offset_data = dims_offsets.mutable_unchecked<1>();
+    offset_data(0) = 0;
+    for(size_t i = 0; i < num; i++){
+        CatalogEntry entry = catalog_entry(mmi, kind, i);
+        const rtwCAPI_DataTypeMap &dt = dtypes[entry.data_type_idx];
+        const rtwCAPI_DimensionMap &dim = dim_map[entry.dim_idx];
+
+        block_paths[i] = entry.block_path;
+        names[i] = entry.name;
+        c_types[i] = dt.cDataName;
+        mw_types[i] = dt.mwDataName;
+        auto python_type = PYSIMLINK::c_python_dtypes.find(dt.cDataName);
+        python_types[i] = python_type == PYSIMLINK::c_python_dtypes.end() ? "void" : python_type->second.c_str();
+        orientation_data(i) = (int32_t)dim.orientation;
+
+        int64_t size = 1;
+        for(size_t j = 0; j < dim.numDims; j++){
+            dims.push_back(dim_array[dim.dimArrayIndex + j]);
+            size *= dim_array[dim.dimArrayIndex + j];
+        }
+        size_data(i) = size;
+        offset_data(i + 1) = (int64_t)dims.size();
+    }
+
+    py::dict ret;
+    ret["block_path"] = string_column(block_paths);
+    ret["name"] = string_column(names);
+    ret["c_type"] = string_column(c_types);
+    ret["mw_type"] = string_column(mw_types);
+    ret["python_type"] = string_column(python_types);
+    ret["orientation"] = orientation;
+    ret["size"] = sizes;
+    ret["dims_offsets"] = dims_offsets;
+    ret["dims"] = py::array_t<int64_t>((ssize_t)dims.size(), dims.data());
+    return ret;
+}
@@ -0,0 +1,210 @@
+#include "name_index.hpp"
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <numeric>
+#include <stdexcept>
+
+namespace PYSIMLINK{
+
+    static const uint64_t FNV_OFFSET = 0xcbf29ce484222325ULL;
+    static const uint64_t FNV_PRIME = 0x100000001b3ULL;
+    static const uint32_t MAX_DISPLACEMENT = 1u << 20;
+
+    // splitmix64 finalizer. Spreads every input bit over the whole output.
+    static inline uint64_t mix64(uint64_t x){
+        x ^= x >> 30;
+        x *= 0xbf58476d1ce4e5b9ULL;
+        x ^= x >> 27;
+        x *= 0x94d049bb133111ebULL;
+        x ^= x >> 31;
+        return x;
+    }
+
+    static inline uint64_t hash_chars(uint64_t h, const char *chars){
+        if(chars == nullptr)
+            return h;
+        for(const unsigned char *c = reinterpret_cast<const unsigned char*>(chars); *c; c++){
+            h = (h ^ *c) * FNV_PRIME;
+        }
+        return h;
+    }
+
+    static inline bool chars_equal(const char *lhs, const char *rhs){
+        // a null name in the c api is the same as an empty name
+        return strcmp(lhs == nullptr ? "" : lhs, rhs == nullptr ? "" : rhs) == 0;
+    }
+
+    uint64_t hash_key(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, uint64_t seed){
+        uint64_t h = FNV_OFFSET ^ mix64(seed);
+        h = (h ^ static_cast<uint64_t>(kind)) * FNV_PRIME;
+        h = (h ^ mix64(reinterpret_cast<uintptr_t>(mmi))) * FNV_PRIME;
+        h = hash_chars(h, a);
+        // 0xff never appears in utf-8, so (ab, c) and (a, bc) hash differently
+        h = (h ^ 0xff) * FNV_PRIME;
+        h = hash_chars(h, b);
+        return mix64(h);
+    }
+
+    NameIndex::NameIndex(){
+        seed = 0;
+        num_entries = 0;
+        build_seconds = 0;
+    }
+
+    void NameIndex::clear(){
+        pending.clear();
+        table.clear();
+        displacements.clear();
+        num_entries = 0;
+        build_seconds = 0;
+    }
+
+    size_t NameIndex::size() const{
+        return num_entries;
+    }
+
+    double NameIndex::build_time() const{
+        return build_seconds;
+    }
+
+    void NameIndex::add(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, size_t index){
+        pending.push_back(IndexEntry{true, kind, mmi, a, b, index});
+    }
+
+    void NameIndex::build(const std::map<std::string, const rtwCAPI_ModelMappingInfo *> &mmi_map){
+        auto start = std::chrono::steady_clock::now();
+        clear();
+
+        for(auto &it : mmi_map){
+            const rtwCAPI_ModelMappingInfo *mmi = it.second;
+
+            const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+            uint_T numSigs = rtwCAPI_GetNumSignals(mmi);
+            for(size_t i = 0; i < numSigs; i++){
+                add(EntryKind::signal, mmi, capiSignals[i].blockPath, capiSignals[i].signalName, i);
+                add(EntryKind::signal_block, mmi, capiSignals[i].blockPath, nullptr, i);
+                if(capiSignals[i].signalName != nullptr && capiSignals[i].signalName[0] != '\0')
+                    add(EntryKind::signal_name, mmi, capiSignals[i].signalName, nullptr, i);
+            }
+
+            const rtwCAPI_BlockParameters *capiBlockParameters = rtwCAPI_GetBlockParameters(mmi);
+            uint_T nBlockParams = rtwCAPI_GetNumBlockParameters(mmi);
+            for(size_t i = 0; i < nBlockParams; i++){
+                add(EntryKind::block_param, mmi, capiBlockParameters[i].blockPath, capiBlockParameters[i].paramName, i);
+            }
+
+            const rtwCAPI_ModelParameters *capiModelParameters = rtwCAPI_GetModelParameters(mmi);
+            uint_T nModelParams = rtwCAPI_GetNumModelParameters(mmi);
+            for(size_t i = 0; i < nModelParams; i++){
+                add(EntryKind::model_param, mmi, capiModelParameters[i].varName, nullptr, i);
+            }
+        }
+
+        // a failure means two different keys share a 64 bit hash (or no displacement fit). Try another seed.
+        uint64_t cur_seed = 0;
+        while(!place(cur_seed)){
+            cur_seed++;
+            if(cur_seed > 64)
+                throw std::runtime_error("Unable to build the name index (internal error)");
+        }
+        seed = cur_seed;
+        pending.clear();
+        pending.shrink_to_fit();
+
+        std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+        build_seconds = elapsed.count();
+    }
+
+    size_t NameIndex::slot(uint64_t hash, uint32_t displacement) const{
+        return mix64(hash ^ (displacement * 0x9e3779b97f4a7c15ULL)) % table.size();
+    }
+
+    bool NameIndex::place(uint64_t cur_seed){
+        size_t n = pending.size();
+        std::vector<uint64_t> hashes(n);
+        for(size_t i = 0; i < n; i++){
+            hashes[i] = hash_key(pending[i].kind, pending[i].mmi, pending[i].a, pending[i].b, cur_seed);
+        }
+
+        // drop duplicate keys. The stable sort keeps the first one, which is what a linear search would find
+        std::vector<size_t> order(n);
+        std::iota(order.begin(), order.end(), 0);
+        std::stable_sort(order.begin(), order.end(), [&hashes](size_t lhs, size_t rhs){ return hashes[lhs] < hashes[rhs]; });
+
+        std::vector<size_t> unique;
+        unique.reserve(n);
+        for(size_t k : order){
+            if(!unique.empty() && hashes[unique.back()] == hashes[k]){
+                const IndexEntry &prev = pending[unique.back()];
+                const IndexEntry &cur = pending[k];
+                if(prev.kind == cur.kind && prev.mmi == cur.mmi && chars_equal(prev.a, cur.a) && chars_equal(prev.b, cur.b))
+                    continue;
+                return false;
+            }
+            unique.push_back(k);
+        }
+
+        size_t m = unique.size();
+        size_t num_buckets = m / 4 + 1;
+        table.assign(m + m / 4 + 1, IndexEntry{false, EntryKind::signal, nullptr, nullptr, nullptr, 0});
+        displacements.assign(num_buckets, 0);
+
+        std::vector<std::vector<size_t>> buckets(num_buckets);
+        for(size_t k : unique){
+            buckets[hashes[k] % num_buckets].push_back(k);
+        }
+
+        // place the largest buckets first while the table is mostly empty
+        std::vector<size_t> bucket_order(num_buckets);
+        std::iota(bucket_order.begin(), bucket_order.end(), 0);
+        std::sort(bucket_order.begin(), bucket_order.end(), [&buckets](size_t lhs, size_t rhs){
+            return buckets[lhs].size() > buckets[rhs].size();
+        });
+
+        std::vector<size_t> slots;
+        for(size_t b : bucket_order){
+            const std::vector<size_t> &bucket = buckets[b];
+            if(bucket.empty())
+                break;
+
+            uint32_t d = 0;
+            for(; d < MAX_DISPLACEMENT; d++){
+                slots.clear();
+                bool fits = true;
+                for(size_t k : bucket){
+                    size_t s = slot(hashes[k], d);
+                    if(table[s].used || std::find(slots.begin(), slots.end(), s) != slots.end()){
+                        fits = false;
+                        break;
+                    }
+                    slots.push_back(s);
+                }
+                if(fits)
+                    break;
+            }
+            if(d == MAX_DISPLACEMENT)
+                return false;
+
+            displacements[b] = d;
+            for(size_t i = 0; i < bucket.size(); i++){
+                table[slots[i]] = pending[bucket[i]];
+            }
+        }
+        num_entries = m;
+        return true;
+    }
+
+    bool NameIndex::find(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, size_t *index) const{
+        if(table.empty())
+            return false;
+
+        uint64_t h = hash_key(kind, mmi, a, b, seed);
+        const IndexEntry &entry = table[slot(h, displacements[h % displacements.size()])];
+        if(!entry.used || entry.kind != kind || entry.mmi != mmi || !chars_equal(entry.a, a) || !chars_equal(entry.b, b))
+            return false;
+
+        *index = entry.index;
+        return true;
+    }
+};
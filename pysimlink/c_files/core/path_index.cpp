@@ -0,0 +1,178 @@
+#include "path_index.hpp"
+#include <algorithm>
+#include <cstring>
+#include <regex>
+#include <stdexcept>
+
+namespace PYSIMLINK{
+
+    static inline const char *safe_chars(const char *chars){
+        return chars == nullptr ? "" : chars;
+    }
+
+    static bool entry_less(const PathEntry &lhs, const PathEntry &rhs){
+        int cmp = strcmp(safe_chars(lhs.block_path), safe_chars(rhs.block_path));
+        if(cmp != 0)
+            return cmp < 0;
+        cmp = strcmp(safe_chars(lhs.name), safe_chars(rhs.name));
+        if(cmp != 0)
+            return cmp < 0;
+        return *lhs.model_name < *rhs.model_name;
+    }
+
+    void PathIndex::clear(){
+        signals.clear();
+        block_params.clear();
+    }
+
+    size_t PathIndex::size() const{
+        return signals.size() + block_params.size();
+    }
+
+    void PathIndex::build(const std::map<std::string, const rtwCAPI_ModelMappingInfo *> &mmi_map){
+        clear();
+        for(auto &it : mmi_map){
+            const rtwCAPI_ModelMappingInfo *mmi = it.second;
+
+            const rtwCAPI_Signals *capiSignals = rtwCAPI_GetSignals(mmi);
+            uint_T numSigs = rtwCAPI_GetNumSignals(mmi);
+            for(size_t i = 0; i < numSigs; i++){
+                signals.push_back(PathEntry{&it.first, mmi, capiSignals[i].blockPath, capiSignals[i].signalName, i});
+            }
+
+            const rtwCAPI_BlockParameters *capiBlockParameters = rtwCAPI_GetBlockParameters(mmi);
+            uint_T nBlockParams = rtwCAPI_GetNumBlockParameters(mmi);
+            for(size_t i = 0; i < nBlockParams; i++){
+                block_params.push_back(PathEntry{&it.first, mmi, capiBlockParameters[i].blockPath,
+                                                 capiBlockParameters[i].paramName, i});
+            }
+        }
+        std::sort(signals.begin(), signals.end(), entry_less);
+        std::sort(block_params.begin(), block_params.end(), entry_less);
+    }
+
+    const std::vector<PathEntry> &PathIndex::entries(HandleKind kind) const{
+        switch(kind){
+            case HandleKind::signal:
+                return signals;
+            case HandleKind::block_param:
+                return block_params;
+            default:
+                throw std::runtime_error("Only signals and block parameters can be searched by block path (internal error)");
+        }
+    }
+
+    std::vector<const PathEntry*> PathIndex::find(HandleKind kind, const std::string &pattern, const std::string &mode,
+                                                  const rtwCAPI_ModelMappingInfo *mmi) const{
+        const std::vector<PathEntry> &all = entries(kind);
+        std::vector<const PathEntry*> ret;
+
+        if(mode == "regex"){
+            std::regex expr;
+            try{
+                expr.assign(pattern);
+            }catch(const std::regex_error &e){
+                throw std::invalid_argument("Invalid regular expression '" + pattern + "': " + e.what());
+            }
+            for(const PathEntry &entry : all){
+                if((mmi == nullptr || entry.mmi == mmi) && std::regex_search(safe_chars(entry.block_path), expr))
+                    ret.push_back(&entry);
+            }
+            return ret;
+        }
+
+        std::string prefix;
+        if(mode == "prefix"){
+            prefix = pattern;
+        }else if(mode == "glob"){
+            prefix = pattern.substr(0, pattern.find_first_of("*?["));
+        }else{
+            throw std::invalid_argument("Unknown search mode '" + mode + "'. Options are prefix, glob, regex");
+        }
+
+        // every path starting with the prefix sorts between the prefix itself and the first path that does not
+        auto first = std::lower_bound(all.begin(), all.end(), prefix, [](const PathEntry &entry, const std::string &value){
+            return strcmp(safe_chars(entry.block_path), value.c_str()) < 0;
+        });
+        for(auto it = first; it != all.end(); it++){
+            const char *path = safe_chars(it->block_path);
+            if(strncmp(path, prefix.c_str(), prefix.size()) != 0)
+                break;
+            if(mmi != nullptr && it->mmi != mmi)
+                continue;
+            if(mode == "glob" && !glob_match(pattern.c_str(), path))
+                continue;
+            ret.push_back(&*it);
+        }
+        return ret;
+    }
+
+    static const char *match_class(const char *pattern, char c, bool *matched){
+        // pattern points just past the '['. Returns the character after the closing ']', or nullptr if there is none
+        bool negate = *pattern == '!';
+        if(negate)
+            pattern++;
+        bool found = false;
+        const char *p = pattern;
+        do{
+            if(*p == '\0')
+                return nullptr;
+            if(p[1] == '-' && p[2] != ']' && p[2] != '\0'){
+                if(p[0] <= c && c <= p[2])
+                    found = true;
+                p += 3;
+            }else{
+                if(*p == c)
+                    found = true;
+                p++;
+            }
+        }while(*p != ']');
+        *matched = found != negate;
+        return p + 1;
+    }
+
+    bool glob_match(const char *pattern, const char *text){
+        // iterative matcher with backtracking to the last '*', like fnmatch without special treatment of '/'
+        const char *star = nullptr;
+        const char *star_text = nullptr;
+        while(*text != '\0'){
+            if(*pattern == '*'){
+                star = ++pattern;
+                star_text = text;
+                continue;
+            }
+            if(*pattern == '?'){
+                pattern++;
+                text++;
+                continue;
+            }
+            if(*pattern == '['){
+                bool matched = false;
+                const char *next = match_class(pattern + 1, *text, &matched);
+                if(next != nullptr){
+                    if(matched){
+                        pattern = next;
+                        text++;
+                        continue;
+                    }
+                }else if(*text == '['){
+                    // an unterminated '[' is a literal
+                    pattern++;
+                    text++;
+                    continue;
+                }
+            }else if(*pattern != '\0' && *pattern == *text){
+                pattern++;
+                text++;
+                continue;
+            }
+            if(star == nullptr)
+                return false;
+            pattern = star;
+            text = ++star_text;
+        }
+        while(*pattern == '*')
+            pattern++;
+        return *pattern == '\0';
+    }
+};
@@ -1,9 +1,9 @@
 #pragma once
 
 extern "C"{
+#include "rtwtypes.h"
 #include "rtw_capi.h"
 #include "rtw_modelmap.h"
-#include "<<ROOT_MODEL>>"
 }
 
 #include <string>
@@ -15,37 +15,6 @@ extern "C"{
 #endif
 
 namespace PYSIMLINK{
-    class map_key_2s{
-    public:
-        std::string a;
-        std::string b;
-        const rtwCAPI_ModelMappingInfo *c;
-        bool operator==(const map_key_2s &other) const{
-            if(c != other.c) return false;
-
-            return ((a == other.a) && (b == other.b));
-        }
-    };
-    class map_key_1s{
-    public:
-        std::string a;
-        const rtwCAPI_ModelMappingInfo *c;
-        bool operator==(const map_key_1s &other) const{
-            if(c != other.c) return false;
-            return (a == other.a);
-        }
-    };
-
-    struct pair_hash{
-        std::size_t operator()(const map_key_2s &p) const;
-        std::size_t operator()(const map_key_1s &p) const;
-    };
-    struct Compare{
-        bool operator()(const map_key_2s &lhs, const map_key_2s &rhs) const;
-        bool operator()(const map_key_1s &lhs, const map_key_1s &rhs) const;
-    };
-
-
     struct DataType{
         std::string cDataType;
         std::string pythonType;
@@ -88,6 +57,12 @@ namespace PYSIMLINK{
         bool readonly;
     };
 
+    // contiguous block of model memory saved by a snapshot
+    struct MemRegion {
+        char *addr;
+        size_t size;
+    };
+
     struct signal_info {
         bool is_array;
         char struct_name[128];
@@ -98,8 +73,25 @@ namespace PYSIMLINK{
         } data;
     };
 
-    union all_dtypes {
+    enum class HandleKind {
+        signal,
+        block_param,
+        model_param,
+        root_input
+    };
+
+    struct Handle {
+        HandleKind kind;
+        std::string model_name;
+        std::string block_path;
+        std::string name;
+        size_t index;          // index into the c api table of this kind
+        size_t generation;     // generation of the model this handle was resolved against
         void *addr;
-        <<ALL_DTYPES>>
+        bool is_array;
+        unsigned int type_size;
+        std::string struct_name;
+        BufferLike arr;
+        struct DataType data_type;
     };
 };
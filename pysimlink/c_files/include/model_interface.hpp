@@ -9,14 +9,17 @@ extern "C"{
 #include "rtw_modelmap.h"
 #include "<<ROOT_MODEL>>"
 #include "<<ROOT_MODEL_PRIVATE>>"
+<<MODEL_DATA_HEADERS>>
 }
 
 #include <string>
 #include "model_utils.hpp"
+#include "path_index.hpp"
 #include <math.h>
 #include <stdexcept>
 #include <vector>
 #include <unordered_map>
+#include <mutex>
 
 #include "pybind11/pybind11.h"
 #include "pybind11/numpy.h"
@@ -30,9 +33,17 @@ extern "C"{
 # define MODEL_TERMINATE  CONCAT(MODEL,_terminate)
 # define RT_MDL           CONCAT(MODEL,_M)
 
+/* global data objects declared by the root and referenced models (block i/o, dwork, states, parameters, ...) as an x-macro */
+# define MODEL_DATA_OBJECTS(X) <<MODEL_DATA_OBJECTS>>
+
 namespace py = pybind11;
 
 namespace PYSIMLINK{
+    union all_dtypes {
+        void *addr;
+        <<ALL_DTYPES>>
+    };
+
     class Model{
         public:
             Model(std::string name);
@@ -42,6 +53,9 @@ namespace PYSIMLINK{
             void reset();
 
             std::vector<struct ModelInfo> get_params() const;
+            size_t catalog_size(const std::string &model, PYSIMLINK::HandleKind kind) const;
+            py::object catalog_entry(const std::string &model, PYSIMLINK::HandleKind kind, size_t idx) const;
+            py::dict catalog_columns(const std::string &model, PYSIMLINK::HandleKind kind) const;
             py::array get_sig(const std::string& model, const std::string& path, const std::string &sig_name);
             PYSIMLINK::all_dtypes get_sig_union(const std::string &model, const std::string &path, const std::string &sig_name);
             py::array get_block_param(const std::string& model, const std::string& block_path, const std::string& param);
@@ -57,25 +71,61 @@ namespace PYSIMLINK{
             struct PYSIMLINK::DataType model_param_info(const std::string &model, const std::string& param);
             struct PYSIMLINK::DataType signal_info(const std::string &model, const std::string &block_path, const std::string &signal);
 
+            PYSIMLINK::Handle signal_handle(const std::string &model, const std::string &block_path, const std::string &sig_name);
+            PYSIMLINK::Handle block_param_handle(const std::string &model, const std::string &block_path, const std::string &param);
+            PYSIMLINK::Handle model_param_handle(const std::string &model, const std::string &param);
+            PYSIMLINK::Handle root_input_handle(const std::string &model, const std::string &block_path);
+            std::vector<PYSIMLINK::Handle> find_handles(PYSIMLINK::HandleKind kind, const std::string &pattern,
+                                                        const std::string &mode, const std::string &model);
+            py::object read_handle(PYSIMLINK::Handle &handle);
+            py::array view_handle(PYSIMLINK::Handle &handle);
+            size_t handle_address(PYSIMLINK::Handle &handle);
+            void read_signals(std::vector<PYSIMLINK::Handle*> &handles, py::array out);
+            void run(int num_steps, std::vector<PYSIMLINK::Handle*> &record, int decimation, py::array out,
+                     std::vector<PYSIMLINK::Handle*> &inputs, std::vector<py::array> &input_values);
+            int steps_run() const;
+
             double step_size();
             double tFinal();
+            double time();
+            void stop_logging(const std::string &file);
             void set_tFinal(float);
             std::vector<std::string> get_models() const;
+            double index_build_time() const;
+            size_t snapshot_size() const;
+            void snapshot(py::array out);
+            void restore(py::array blob);
 
         protected:
+            // generated code keeps the model in global variables, so every Model of this library shares one lock
+            static std::recursive_mutex mutex;
+            std::unique_lock<std::recursive_mutex> lock() const;
+
             bool initialized;
             void discover_mmis(const rtwCAPI_ModelMappingInfo *mmi);
+            void step_once();
             static void terminate();
+            static bool logging_stopped;  // the MAT-file log of this run was read (see stop_logging)
+            const rtwCAPI_ModelMappingInfo *find_mmi(const std::string &model) const;
+            void resolve_handle(PYSIMLINK::Handle &handle, const rtwCAPI_ModelMappingInfo *mmi);
+            void refresh_handle(PYSIMLINK::Handle &handle);
+            double *prepare_gather(std::vector<PYSIMLINK::Handle*> &handles, py::array &out, ssize_t rows);
+            void build_regions();
             std::string mdl_name;
+            size_t generation;
+            int run_steps;  // steps completed by the last call to run, also when it threw
 
             rtwCAPI_ModelMappingInfo *root_mmi;
             boolean_T OverrunFlags[1];    /* ISR overrun flags */
             boolean_T eventFlags[1];      /* necessary for overlapping preemption */
             std::map<std::string,const rtwCAPI_ModelMappingInfo *> mmi_map;
 
-            std::unordered_map<PYSIMLINK::map_key_1s,size_t, PYSIMLINK::pair_hash,PYSIMLINK::Compare> model_param;
-            std::unordered_map<PYSIMLINK::map_key_2s,size_t, PYSIMLINK::pair_hash,PYSIMLINK::Compare> sig_map;
-            std::unordered_map<PYSIMLINK::map_key_2s,size_t, PYSIMLINK::pair_hash,PYSIMLINK::Compare> block_map;
+            PYSIMLINK::NameIndex index;
+            PYSIMLINK::PathIndex paths;
+
+            std::vector<PYSIMLINK::MemRegion> regions;
+            uint64_t layout_hash;
+            size_t region_bytes;
     };
     
 #include "model_interface.tpp"
@@ -2,6 +2,7 @@
 template <typename T>
     void Model::set_block_param(const std::string &model, const std::string &block_path, const std::string &param,
                                 py::array_t<T> value) {
+        auto guard = lock();
         if(!initialized){
             throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
         }
@@ -17,11 +18,12 @@ template <typename T>
             sprintf(buf, "Cannot find model with name: %s", model.c_str());
             throw std::runtime_error(buf);
         }
-        PYSIMLINK::set_block_param(mmi_idx->second, block_path.c_str(), param.c_str(), value);
+        PYSIMLINK::set_block_param(mmi_idx->second, block_path.c_str(), param.c_str(), value, index);
     }
 
     template <typename T>
     void Model::set_model_param(const std::string &model, const std::string &param, py::array_t<T> value) {
+        auto guard = lock();
         if(!initialized){
             throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
         }
@@ -35,5 +37,5 @@ template <typename T>
             sprintf(buf, "Cannot find model with name: %s", model.c_str());
             throw std::runtime_error(buf);
         }
-        PYSIMLINK::set_model_param(mmi_idx->second, param.c_str(), value);
+        PYSIMLINK::set_model_param(mmi_idx->second, param.c_str(), value, index);
     }
@@ -3,10 +3,8 @@
 //
 #pragma once
 extern "C"{
-#include "<<ROOT_MODEL>>"
+#include "rtwtypes.h"
 #include "rtw_capi.h"
-#include "rtw_modelmap_logging.h"
-<<RTW_MATLOGGING>>
 #include "rtw_modelmap.h"
 }
 #include <string.h>
@@ -21,6 +19,7 @@ extern "C"{
 #include "pybind11/stl.h"
 
 #include "containers.hpp"
+#include "name_index.hpp"
 #include "safe_utils.hpp"
 
 namespace py = pybind11;
@@ -40,19 +39,26 @@ namespace PYSIMLINK{
 
     std::string translate_c_type_name(const std::string& c_name, bool should_throw=false);
 
-    py::buffer_info get_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param, std::unordered_map<map_key_1s,size_t,pair_hash,Compare> &model_params);
+    py::buffer_info get_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param, const PYSIMLINK::NameIndex &index);
     void set_model_param(const rtwCAPI_ModelMappingInfo *mmi,
                          const char* param,
-                         py::array value);
+                         py::array value,
+                         const PYSIMLINK::NameIndex &index);
 
-    py::buffer_info get_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param, std::unordered_map<map_key_2s,size_t,pair_hash,Compare> &block_map);
+    py::buffer_info get_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param, const PYSIMLINK::NameIndex &index);
     void set_block_param(const rtwCAPI_ModelMappingInfo *mmi,
                          const char *block,
                          const char *param,
-                         py::array value);
+                         py::array value,
+                         const PYSIMLINK::NameIndex &index);
 
-    struct std::unique_ptr<PYSIMLINK::signal_info> get_signal_val(const rtwCAPI_ModelMappingInfo *mmi, std::unordered_map<map_key_2s,size_t,pair_hash,Compare> &sig_map, const char* block=nullptr, const char* signNam=nullptr);
-    struct PYSIMLINK::DataType describe_signal(const rtwCAPI_ModelMappingInfo *mmi, const char* block, const char* sigName, std::unordered_map<map_key_2s, size_t, pair_hash, Compare> &sig_map);
+    size_t find_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param, const PYSIMLINK::NameIndex &index);
+    size_t find_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *param, const PYSIMLINK::NameIndex &index);
+    size_t find_root_input(const rtwCAPI_ModelMappingInfo *mmi, const char *block);
+    size_t find_signal(const rtwCAPI_ModelMappingInfo *mmi, const char *block, const char *sigName, const PYSIMLINK::NameIndex &index);
+
+    struct std::unique_ptr<PYSIMLINK::signal_info> get_signal_val(const rtwCAPI_ModelMappingInfo *mmi, const PYSIMLINK::NameIndex &index, const char* block=nullptr, const char* signNam=nullptr);
+    struct PYSIMLINK::DataType describe_signal(const rtwCAPI_ModelMappingInfo *mmi, const char* block, const char* sigName, const PYSIMLINK::NameIndex &index);
 
     PYSIMLINK::BufferLike
     format_pybuffer(const rtwCAPI_ModelMappingInfo *mmi, rtwCAPI_DataTypeMap dt, rtwCAPI_DimensionMap sigDim, void *addr);
@@ -60,15 +66,22 @@ namespace PYSIMLINK{
 
     void fill_from_buffer(const rtwCAPI_ModelMappingInfo *mmi, rtwCAPI_DataTypeMap dt, rtwCAPI_DimensionMap blockDim, void* addr, py::array value);
     py::buffer_info from_buffer_struct(const PYSIMLINK::BufferLike &buffer);
+    ssize_t buffer_size(const PYSIMLINK::BufferLike &buffer);
+    void copy_as_double(const PYSIMLINK::BufferLike &buffer, double *out);
+    void add_capi_regions(const rtwCAPI_ModelMappingInfo *mmi, std::vector<PYSIMLINK::MemRegion> &regions);
+    void merge_regions(std::vector<PYSIMLINK::MemRegion> &regions);
 
-    struct PYSIMLINK::DataType describe_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block_path, const char *param);
-    struct PYSIMLINK::DataType describe_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param);
+    struct PYSIMLINK::DataType describe_block_param(const rtwCAPI_ModelMappingInfo *mmi, const char *block_path, const char *param, const PYSIMLINK::NameIndex &index);
+    struct PYSIMLINK::DataType describe_model_param(const rtwCAPI_ModelMappingInfo *mmi, const char *param, const PYSIMLINK::NameIndex &index);
 
     std::vector<struct PYSIMLINK::ModelParam> debug_model_params(const rtwCAPI_ModelMappingInfo *mmi);
     std::vector<struct PYSIMLINK::BlockParam> debug_block_param(const rtwCAPI_ModelMappingInfo *mmi);
     std::vector<struct PYSIMLINK::Signal> debug_signals(const rtwCAPI_ModelMappingInfo *mmi);
     PYSIMLINK::ModelInfo debug_model_info(const rtwCAPI_ModelMappingInfo *mmi);
 
+    size_t catalog_size(const rtwCAPI_ModelMappingInfo *mmi, PYSIMLINK::HandleKind kind);
+    py::dict catalog_columns(const rtwCAPI_ModelMappingInfo *mmi, PYSIMLINK::HandleKind kind);
+
 
     #include "model_utils.tpp"
 };
@@ -26,4 +26,20 @@ struct DataType populate_dtype(const rtwCAPI_ModelMappingInfo *mmi, T capi_struc
         ret.dims.push_back(rtwCAPI_GetDimensionArray(mmi)[rtwCAPI_GetDimensionMap(mmi)[capi_struct.dimIndex].dimArrayIndex + j]);
     }
     return ret;
-}
\ No newline at end of file
+}
+template <typename T>
+void populate_handle(const rtwCAPI_ModelMappingInfo *mmi, T capi_struct, PYSIMLINK::Handle *handle){
+    rtwCAPI_DataTypeMap dt = rtwCAPI_GetDataTypeMap(mmi)[capi_struct.dataTypeIndex];
+    rtwCAPI_DimensionMap dim = rtwCAPI_GetDimensionMap(mmi)[capi_struct.dimIndex];
+
+    handle->addr = rtwCAPI_GetDataAddressMap(mmi)[capi_struct.addrMapIndex];
+    handle->type_size = dt.dataSize;
+    handle->data_type = PYSIMLINK::populate_dtype(mmi, capi_struct);
+    if(strcmp(dt.cDataName, "void") == 0 || strcmp(dt.cDataName, "struct") == 0){
+        handle->is_array = false;
+        handle->struct_name = dt.mwDataName;
+    }else{
+        handle->is_array = true;
+        PYSIMLINK::format_pybuffer(mmi, dt, dim, handle->addr, &handle->arr);
+    }
+}
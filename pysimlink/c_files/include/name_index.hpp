@@ -0,0 +1,59 @@
+#pragma once
+
+extern "C"{
+#include "rtwtypes.h"
+#include "rtw_capi.h"
+}
+
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+namespace PYSIMLINK{
+    enum class EntryKind : uint8_t {
+        signal,         // (block path, signal name)
+        signal_block,   // (block path) -> first signal originating from the block
+        signal_name,    // (signal name) -> first signal with this name
+        block_param,    // (block path, parameter name)
+        model_param     // (parameter name)
+    };
+
+    struct IndexEntry{
+        bool used;
+        EntryKind kind;
+        const rtwCAPI_ModelMappingInfo *mmi;
+        const char *a;  // points into the static c api tables, never copied
+        const char *b;
+        size_t index;   // index into the c api table of this kind
+    };
+
+    uint64_t hash_key(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, uint64_t seed);
+
+    /*
+     * Minimal perfect hash (hash and displace) over every signal and parameter name of every mmi.
+     * Built once per reset. A lookup is one hash of the key, one displacement lookup, and one
+     * comparison: O(1) in the worst case with no lazy fill and no probing.
+     */
+    class NameIndex{
+        public:
+            NameIndex();
+            void build(const std::map<std::string, const rtwCAPI_ModelMappingInfo *> &mmi_map);
+            void clear();
+            bool find(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, size_t *index) const;
+            size_t size() const;
+            double build_time() const;
+
+        private:
+            void add(EntryKind kind, const rtwCAPI_ModelMappingInfo *mmi, const char *a, const char *b, size_t index);
+            bool place(uint64_t seed);
+            size_t slot(uint64_t hash, uint32_t displacement) const;
+
+            std::vector<IndexEntry> pending;
+            std::vector<IndexEntry> table;
+            std::vector<uint32_t> displacements;
+            uint64_t seed;
+            size_t num_entries;
+            double build_seconds;
+    };
+};
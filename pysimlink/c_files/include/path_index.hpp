@@ -0,0 +1,45 @@
+#pragma once
+
+extern "C"{
+#include "rtwtypes.h"
+#include "rtw_capi.h"
+#include "rtw_modelmap.h"
+}
+
+#include <map>
+#include <string>
+#include <vector>
+
+#include "containers.hpp"
+
+namespace PYSIMLINK{
+    struct PathEntry{
+        const std::string *model_name;  // key of the model in the mmi map
+        const rtwCAPI_ModelMappingInfo *mmi;
+        const char *block_path;         // points into the static c api tables, never copied
+        const char *name;
+        size_t index;                   // index into the c api table of this kind
+    };
+
+    /*
+     * Signals and block parameters of every mmi sorted by block path. Built once per reset.
+     * Prefix queries (and globs, which start with the literal part of the pattern) are two binary
+     * searches followed by a walk over the matches. Regular expressions scan every entry.
+     */
+    class PathIndex{
+        public:
+            void build(const std::map<std::string, const rtwCAPI_ModelMappingInfo *> &mmi_map);
+            void clear();
+            std::vector<const PathEntry*> find(HandleKind kind, const std::string &pattern, const std::string &mode,
+                                               const rtwCAPI_ModelMappingInfo *mmi=nullptr) const;
+            size_t size() const;
+
+        private:
+            const std::vector<PathEntry> &entries(HandleKind kind) const;
+
+            std::vector<PathEntry> signals;
+            std::vector<PathEntry> block_params;
+    };
+
+    bool glob_match(const char *pattern, const char *text);
+};
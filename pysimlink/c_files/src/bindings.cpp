@@ -24,12 +24,18 @@ namespace py = pybind11;
 PYBIND11_MODULE(<<MODEL_INTERFACE_C>>, m) {
     py::class_<PYSIMLINK::Model>(m, "<<ROOT_MODEL_NAME>>_Model", py::module_local())
             .def(py::init<std::string>())
-            .def("reset", &PYSIMLINK::Model::reset)
+            .def("reset", &PYSIMLINK::Model::reset, py::call_guard<py::gil_scoped_release>())
             .def("step_size", &PYSIMLINK::Model::step_size)
             .def("tFinal", &PYSIMLINK::Model::tFinal)
+            .def("time", &PYSIMLINK::Model::time)
+            .def("stop_logging", &PYSIMLINK::Model::stop_logging)
             .def("set_tFinal", &PYSIMLINK::Model::set_tFinal)
-            .def("step", &PYSIMLINK::Model::step)
+            .def("step", &PYSIMLINK::Model::step, py::call_guard<py::gil_scoped_release>())
             .def("get_models", &PYSIMLINK::Model::get_models)
+            .def("index_build_time", &PYSIMLINK::Model::index_build_time)
+            .def("snapshot_size", &PYSIMLINK::Model::snapshot_size)
+            .def("snapshot", &PYSIMLINK::Model::snapshot)
+            .def("restore", &PYSIMLINK::Model::restore)
             .def("get_signal_arr", &PYSIMLINK::Model::get_sig)
             .def("get_signal_union", &PYSIMLINK::Model::get_sig_union)
             .def("desc_signal", &PYSIMLINK::Model::signal_info)
@@ -38,8 +44,22 @@ PYBIND11_MODULE(<<MODEL_INTERFACE_C>>, m) {
             .def("get_model_param", &PYSIMLINK::Model::get_model_param)
             NEW_TEMPLATE_FUNC("set_model_param", &PYSIMLINK::Model::set_model_param)
             .def("get_params", &PYSIMLINK::Model::get_params)
+            .def("catalog_size", &PYSIMLINK::Model::catalog_size)
+            .def("catalog_entry", &PYSIMLINK::Model::catalog_entry)
+            .def("catalog_columns", &PYSIMLINK::Model::catalog_columns)
             .def("block_param_info", &PYSIMLINK::Model::block_param_info)
-            .def("model_param_info", &PYSIMLINK::Model::model_param_info);
+            .def("model_param_info", &PYSIMLINK::Model::model_param_info)
+            .def("signal_handle", &PYSIMLINK::Model::signal_handle)
+            .def("block_param_handle", &PYSIMLINK::Model::block_param_handle)
+            .def("model_param_handle", &PYSIMLINK::Model::model_param_handle)
+            .def("root_input_handle", &PYSIMLINK::Model::root_input_handle)
+            .def("find_handles", &PYSIMLINK::Model::find_handles)
+            .def("read_handle", &PYSIMLINK::Model::read_handle)
+            .def("view_handle", &PYSIMLINK::Model::view_handle)
+            .def("handle_address", &PYSIMLINK::Model::handle_address)
+            .def("read_signals", &PYSIMLINK::Model::read_signals)
+            .def("run", &PYSIMLINK::Model::run)
+            .def("steps_run", &PYSIMLINK::Model::steps_run);
 
     py::enum_<rtwCAPI_Orientation>(m, "<<ROOT_MODEL_NAME>>_rtwCAPI_Orientation", py::module_local())
             .value("vector", rtwCAPI_VECTOR)
@@ -49,6 +69,20 @@ PYBIND11_MODULE(<<MODEL_INTERFACE_C>>, m) {
             .value("row_major_nd", rtwCAPI_MATRIX_ROW_MAJOR_ND)
             .value("row_major", rtwCAPI_MATRIX_ROW_MAJOR);
 
+    py::enum_<PYSIMLINK::HandleKind>(m, "<<ROOT_MODEL_NAME>>_HandleKind", py::module_local())
+            .value("signal", PYSIMLINK::HandleKind::signal)
+            .value("block_param", PYSIMLINK::HandleKind::block_param)
+            .value("model_param", PYSIMLINK::HandleKind::model_param)
+            .value("root_input", PYSIMLINK::HandleKind::root_input);
+
+    py::class_<PYSIMLINK::Handle>(m, "<<ROOT_MODEL_NAME>>_Handle", py::module_local())
+            .def_readonly("kind", &PYSIMLINK::Handle::kind)
+            .def_readonly("model_name", &PYSIMLINK::Handle::model_name)
+            .def_readonly("block_path", &PYSIMLINK::Handle::block_path)
+            .def_readonly("name", &PYSIMLINK::Handle::name)
+            .def_readonly("struct_name", &PYSIMLINK::Handle::struct_name)
+            .def_readonly("data_type", &PYSIMLINK::Handle::data_type);
+
     py::class_<PYSIMLINK::BlockParam>(m, "<<ROOT_MODEL_NAME>>_BlockParam", py::module_local())
             .def_readonly("block_name", &PYSIMLINK::BlockParam::block_name)
             .def_readonly("block_param", &PYSIMLINK::BlockParam::block_param)
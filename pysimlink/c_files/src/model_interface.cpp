@@ -1,5 +1,7 @@
 #include "model_interface.hpp"
 #include <cstdio>
+#include <tuple>
+#include <cstring>
 
 #ifdef _WIN32
 #define NULL_FILE "NUL"
@@ -12,6 +14,7 @@ using namespace PYSIMLINK;
 namespace py = pybind11;
 
 Model::~Model(){
+    auto guard = lock();
     if(initialized){
         terminate();
     }
@@ -23,37 +26,94 @@ Model::Model(std::string name){
     memset(eventFlags, 0, sizeof(boolean_T));
     root_mmi = nullptr;
     mdl_name = name;
+    generation = 0;
+    run_steps = 0;
 }
 
+std::recursive_mutex Model::mutex;
+
+std::unique_lock<std::recursive_mutex> Model::lock() const{
+    std::unique_lock<std::recursive_mutex> guard(mutex, std::try_to_lock);
+    if(!guard.owns_lock()){
+        // another thread is using the model without the gil. It may need the gil to finish, so wait without it
+        py::gil_scoped_release release;
+        guard.lock();
+    }
+    return guard;
+}
+
+bool Model::logging_stopped = false;
+
 void Model::terminate(){
 #ifdef rtmGetRTWLogInfo
-    rt_StopDataLogging(NULL_FILE,rtmGetRTWLogInfo(RT_MDL));
+    // the logger can only be stopped once
+    if(!logging_stopped)
+        rt_StopDataLogging(NULL_FILE,rtmGetRTWLogInfo(RT_MDL));
 #endif
+    logging_stopped = false;
     MODEL_TERMINATE();
 }
 
 void Model::reset(){
+    // called without the gil (see bindings.cpp), so wait for the lock directly
+    std::lock_guard<std::recursive_mutex> guard(mutex);
     // clear all model mapping information bc it may change
     // between runs (verify this)
-    model_param.clear();
-    sig_map.clear();
-    block_map.clear();
+    index.clear();
+    paths.clear();
+    mmi_map.clear();
+    // invalidate every handle resolved before this reset
+    generation++;
 
     // clear loggind data
     if(initialized){
         terminate();
     }
     MODEL_INITIALIZE();
+    // a step that raised (e.g. at the end of the simulation) leaves the overrun flag set
+    OverrunFlags[0] = 0;
 
     // get the MMI
     root_mmi = &(rtmGetDataMapInfo(RT_MDL).mmi);
 
     mmi_map.insert(std::make_pair(mdl_name, root_mmi));
     discover_mmis(root_mmi);
+
+    // every signal and parameter lookup (get, set, describe, and handles) goes through this index
+    index.build(mmi_map);
+    paths.build(mmi_map);
+    build_regions();
     initialized = true;
 }
 
+void Model::build_regions(){
+    regions.clear();
+    for(auto &it : mmi_map){
+        PYSIMLINK::add_capi_regions(it.second, regions);
+    }
+    // a c style cast, since objects may be declared volatile
+#define ADD_DATA_OBJECT(obj) regions.push_back(PYSIMLINK::MemRegion{(char*)(&(obj)), sizeof(obj)});
+    MODEL_DATA_OBJECTS(ADD_DATA_OBJECT)
+#undef ADD_DATA_OBJECT
+    // timing, solver, and error status
+    regions.push_back(PYSIMLINK::MemRegion{reinterpret_cast<char*>(RT_MDL), sizeof(*RT_MDL)});
+    PYSIMLINK::merge_regions(regions);
+
+    // the layout includes the addresses, so a snapshot only restores into the library it was taken from
+    layout_hash = 0xcbf29ce484222325ULL;
+    region_bytes = 0;
+    for(auto &region : regions){
+        uint64_t vals[2] = {reinterpret_cast<uintptr_t>(region.addr), region.size};
+        const unsigned char *bytes = reinterpret_cast<const unsigned char*>(vals);
+        for(size_t i = 0; i < sizeof(vals); i++){
+            layout_hash = (layout_hash ^ bytes[i]) * 0x100000001b3ULL;
+        }
+        region_bytes += region.size;
+    }
+}
+
 double Model::step_size() {
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling step_size. Call `reset()` first!");
     }
@@ -61,6 +121,7 @@ double Model::step_size() {
 }
 
 std::vector<struct ModelInfo> Model::get_params() const{
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling print_params. Call `reset()` first!");
     }
@@ -78,6 +139,64 @@ std::vector<struct ModelInfo> Model::get_params() const{
     return ret;
 }
 
+size_t Model::catalog_size(const std::string &model, PYSIMLINK::HandleKind kind) const{
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling catalog_size. Call `reset()` first!");
+    }
+    return PYSIMLINK::catalog_size(find_mmi(model), kind);
+}
+
+py::object Model::catalog_entry(const std::string &model, PYSIMLINK::HandleKind kind, size_t idx) const{
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling catalog_entry. Call `reset()` first!");
+    }
+    const rtwCAPI_ModelMappingInfo *mmi = find_mmi(model);
+    if(idx >= PYSIMLINK::catalog_size(mmi, kind)){
+        std::stringstream err("");
+        err << "catalog_entry: index (" << idx << ") out of range for model " << model;
+        throw py::index_error(err.str());
+    }
+
+    switch(kind){
+        case HandleKind::signal:
+        case HandleKind::root_input: {
+            const rtwCAPI_Signals &capi_sig = kind == HandleKind::signal ? rtwCAPI_GetSignals(mmi)[idx]
+                                                                          : rtwCAPI_GetRootInputs(mmi)[idx];
+            struct PYSIMLINK::Signal ret;
+            ret.block_name = PYSIMLINK::safe_string(capi_sig.blockPath);
+            ret.signal_name = PYSIMLINK::safe_string(capi_sig.signalName);
+            ret.data_type = PYSIMLINK::populate_dtype(mmi, capi_sig);
+            return py::cast(ret);
+        }
+        case HandleKind::block_param: {
+            const rtwCAPI_BlockParameters &capi_param = rtwCAPI_GetBlockParameters(mmi)[idx];
+            struct PYSIMLINK::BlockParam ret;
+            ret.block_name = capi_param.blockPath;
+            ret.block_param = capi_param.paramName;
+            ret.data_type = PYSIMLINK::populate_dtype(mmi, capi_param);
+            return py::cast(ret);
+        }
+        case HandleKind::model_param: {
+            const rtwCAPI_ModelParameters &capi_param = rtwCAPI_GetModelParameters(mmi)[idx];
+            struct PYSIMLINK::ModelParam ret;
+            ret.model_param = capi_param.varName;
+            ret.data_type = PYSIMLINK::populate_dtype(mmi, capi_param);
+            return py::cast(ret);
+        }
+    }
+    throw std::runtime_error("Invalid/Unknown catalog kind (internal error)");
+}
+
+py::dict Model::catalog_columns(const std::string &model, PYSIMLINK::HandleKind kind) const{
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling catalog_columns. Call `reset()` first!");
+    }
+    return PYSIMLINK::catalog_columns(find_mmi(model), kind);
+}
+
 void Model::discover_mmis(const rtwCAPI_ModelMappingInfo *mmi){
     // go through all child mmis and insert them into the map.
     for(size_t i = 0; i < mmi->InstanceMap.childMMIArrayLen; i++){
@@ -87,28 +206,38 @@ void Model::discover_mmis(const rtwCAPI_ModelMappingInfo *mmi){
 }
 
 void Model::step(int num_steps){
+    // called without the gil (see bindings.cpp), so wait for the lock directly
+    std::lock_guard<std::recursive_mutex> guard(mutex);
     assert(((void)"num_steps must be a positive number", num_steps>0));
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling step. Call `reset()` first!");
     }
 
     for(int cur_step=0; cur_step < num_steps; cur_step++){
-        if (OverrunFlags[0]++)
-            rtmSetErrorStatus(RT_MDL, "Overrun");
+        step_once();
+    }
+}
 
-        if (rtmGetErrorStatus(RT_MDL) != NULL) {
-            char buf[256];
-            sprintf(buf, "Model is in errored state: %s", rtmGetErrorStatus(RT_MDL));
-            throw std::runtime_error(buf);
-        }
+void Model::step_once(){
+    if (logging_stopped)
+        throw std::runtime_error("The MAT-file log of this run was read, so the model cannot step. Call `reset()` first!");
 
-        MODEL_STEP();
+    if (OverrunFlags[0]++)
+        rtmSetErrorStatus(RT_MDL, "Overrun");
 
-        OverrunFlags[0]--;
+    if (rtmGetErrorStatus(RT_MDL) != NULL) {
+        char buf[256];
+        sprintf(buf, "Model is in errored state: %s", rtmGetErrorStatus(RT_MDL));
+        throw std::runtime_error(buf);
     }
+
+    MODEL_STEP();
+
+    OverrunFlags[0]--;
 }
 
 double Model::tFinal() {
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling tFinal. Call `reset()` first!");
     }
@@ -119,7 +248,36 @@ double Model::tFinal() {
 #endif
 }
 
+void Model::stop_logging(const std::string &file) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling stop_logging. Call `reset()` first!");
+    }
+#ifndef rtmGetRTWLogInfo
+    throw std::runtime_error("MAT-file logging is not enabled for this model.");
+#else
+    if(logging_stopped)
+        throw std::runtime_error("The MAT-file log of this run was already read. Call `reset()` first!");
+    // the logger's buffers are private to rt_logging.c. Writing them out is the only way to read them, and frees them.
+    rt_StopDataLogging(file.c_str(), rtmGetRTWLogInfo(RT_MDL));
+    logging_stopped = true;
+#endif
+}
+
+double Model::time() {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling time. Call `reset()` first!");
+    }
+#ifndef rtmGetT
+    throw std::runtime_error("Getting the simulation time is not supported for this model.");
+#else
+    return rtmGetT(RT_MDL);
+#endif
+}
+
 void Model::set_tFinal(float tFinal){
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling set_tFinal. Call `reset()` first!");
     }
@@ -132,6 +290,7 @@ void Model::set_tFinal(float tFinal){
 }
 
 std::vector<std::string> Model::get_models() const{
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_models. Call `reset()` first!");
     }
@@ -145,8 +304,91 @@ std::vector<std::string> Model::get_models() const{
     return ret;
 }
 
+struct SnapshotHeader{
+    char magic[8];
+    uint64_t layout;
+    uint64_t size;
+};
+static const char SNAPSHOT_MAGIC[8] = {'P', 'S', 'L', 'S', 'N', 'A', 'P', '1'};
+
+size_t Model::snapshot_size() const{
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling snapshot_size. Call `reset()` first!");
+    }
+    return sizeof(SnapshotHeader) + region_bytes;
+}
+
+void Model::snapshot(py::array out){
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling snapshot. Call `reset()` first!");
+    }
+    if(!out.dtype().is(py::dtype::of<uint8_t>()))
+        throw std::runtime_error("Snapshot buffer must have dtype uint8");
+    if(!(out.flags() & py::array::c_style))
+        throw std::runtime_error("Snapshot buffer must be c contiguous");
+    if(!out.writeable())
+        throw std::runtime_error("Snapshot buffer must be writeable");
+    if(static_cast<size_t>(out.size()) != snapshot_size()){
+        std::stringstream err("");
+        err << "Snapshot buffer has " << out.size() << " bytes but " << snapshot_size() << " are required";
+        throw std::runtime_error(err.str());
+    }
+
+    char *dest = static_cast<char*>(out.mutable_data());
+    py::gil_scoped_release release;
+    SnapshotHeader header;
+    memcpy(header.magic, SNAPSHOT_MAGIC, sizeof(SNAPSHOT_MAGIC));
+    header.layout = layout_hash;
+    header.size = region_bytes;
+    memcpy(dest, &header, sizeof(header));
+    dest += sizeof(header);
+    for(auto &region : regions){
+        memcpy(dest, region.addr, region.size);
+        dest += region.size;
+    }
+}
+
+void Model::restore(py::array blob){
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling restore. Call `reset()` first!");
+    }
+    if(!blob.dtype().is(py::dtype::of<uint8_t>()) || !(blob.flags() & py::array::c_style))
+        throw std::runtime_error("Snapshot must be a c contiguous uint8 array returned from snapshot()");
+
+    SnapshotHeader header;
+    if(static_cast<size_t>(blob.size()) < sizeof(header))
+        throw std::runtime_error("restore: Snapshot is too small to be a snapshot");
+    const char *src = static_cast<const char*>(blob.data());
+    memcpy(&header, src, sizeof(header));
+    if(memcmp(header.magic, SNAPSHOT_MAGIC, sizeof(SNAPSHOT_MAGIC)) != 0)
+        throw std::runtime_error("restore: Array is not a snapshot");
+    if(header.layout != layout_hash || header.size != region_bytes || static_cast<size_t>(blob.size()) != snapshot_size())
+        throw std::runtime_error("restore: Snapshot was taken from a different model");
+
+    py::gil_scoped_release release;
+    src += sizeof(header);
+    for(auto &region : regions){
+        memcpy(region.addr, src, region.size);
+        src += region.size;
+    }
+    // a step that raised leaves the overrun flag set. The restored state has not run that step yet.
+    OverrunFlags[0] = 0;
+}
+
+double Model::index_build_time() const{
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling index_build_time. Call `reset()` first!");
+    }
+    return index.build_time();
+}
+
 PYSIMLINK::DataType Model::signal_info(const std::string &model, const std::string &block_path,
                                        const std::string &signal) {
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_sig. Call `reset()` first!");
     }
@@ -164,10 +406,11 @@ PYSIMLINK::DataType Model::signal_info(const std::string &model, const std::stri
     }
 
     const char* sig_name = signal.empty() ? nullptr : signal.c_str();
-    return PYSIMLINK::describe_signal(mmi_idx->second, block_path.c_str(), sig_name, sig_map);
+    return PYSIMLINK::describe_signal(mmi_idx->second, block_path.c_str(), sig_name, index);
 }
 
 py::array Model::get_sig(const std::string& model, const std::string& block_path, const std::string& sig_name_raw){
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_sig. Call `reset()` first!");
     }
@@ -186,12 +429,13 @@ py::array Model::get_sig(const std::string& model, const std::string& block_path
 
 
     const char* sig_name = sig_name_raw.empty() ? nullptr : sig_name_raw.c_str();
-    auto ret = PYSIMLINK::get_signal_val(mmi_idx->second, sig_map, block_path.c_str(), sig_name);
+    auto ret = PYSIMLINK::get_signal_val(mmi_idx->second, index, block_path.c_str(), sig_name);
 //    py::handle<PYSIMLINK::signal_info> tmp(ret);
     return py::array(PYSIMLINK::from_buffer_struct(ret->data.arr));
 }
 
 py::array Model::get_block_param(const std::string& model, const std::string& block_path, const std::string& param){
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
     }
@@ -209,11 +453,12 @@ py::array Model::get_block_param(const std::string& model, const std::string& bl
         sprintf(buf, "Cannot find model with name: %s", model.c_str());
         throw std::runtime_error(buf);
     }
-    py::buffer_info ret = PYSIMLINK::get_block_param(mmi_idx->second, block_path.c_str(), param.c_str(), block_map);
+    py::buffer_info ret = PYSIMLINK::get_block_param(mmi_idx->second, block_path.c_str(), param.c_str(), index);
     return py::array(ret);
 }
 
 struct PYSIMLINK::DataType Model::block_param_info(const std::string &model, const std::string& block_path, const std::string& param){
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
     }
@@ -229,10 +474,11 @@ struct PYSIMLINK::DataType Model::block_param_info(const std::string &model, con
         sprintf(buf, "Cannot find model with name: %s", model.c_str());
         throw std::runtime_error(buf);
     }
-    return PYSIMLINK::describe_block_param(mmi_idx->second, block_path.c_str(), param.c_str());
+    return PYSIMLINK::describe_block_param(mmi_idx->second, block_path.c_str(), param.c_str(), index);
 }
 
 py::array Model::get_model_param(const std::string &model, const std::string &param) {
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
     }
@@ -248,11 +494,12 @@ py::array Model::get_model_param(const std::string &model, const std::string &pa
         sprintf(buf, "Cannot find model with name: %s", model.c_str());
         throw std::runtime_error(buf);
     }
-    py::buffer_info ret = PYSIMLINK::get_model_param(mmi_idx->second, param.c_str(), model_param);
+    py::buffer_info ret = PYSIMLINK::get_model_param(mmi_idx->second, param.c_str(), index);
     return py::array(ret);
 }
 
 struct PYSIMLINK::DataType Model::model_param_info(const std::string &model, const std::string &param) {
+    auto guard = lock();
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_block_param. Call `reset()` first!");
     }
@@ -267,11 +514,12 @@ struct PYSIMLINK::DataType Model::model_param_info(const std::string &model, con
         sprintf(buf, "Cannot find model with name: %s", model.c_str());
         throw std::runtime_error(buf);
     }
-    return PYSIMLINK::describe_model_param(mmi_idx->second, param.c_str());
+    return PYSIMLINK::describe_model_param(mmi_idx->second, param.c_str(), index);
 }
 
 all_dtypes PYSIMLINK::Model::get_sig_union(const std::string &model, const std::string &block_path,
                                      const std::string &sig_name_raw) {
+    auto guard = lock();
     all_dtypes ret;
     if(!initialized){
         throw std::runtime_error("Model must be initialized before calling get_sig. Call `reset()` first!");
@@ -291,7 +539,314 @@ all_dtypes PYSIMLINK::Model::get_sig_union(const std::string &model, const std::
 
 
     const char* sig_name = sig_name_raw.empty() ? nullptr : sig_name_raw.c_str();
-    auto sig_info = PYSIMLINK::get_signal_val(mmi_idx->second, sig_map, block_path.c_str(), sig_name);
+    auto sig_info = PYSIMLINK::get_signal_val(mmi_idx->second, index, block_path.c_str(), sig_name);
     (void)memcpy(&ret, sig_info->data.addr, sig_info->type_size);
     return ret;
 }
+
+const rtwCAPI_ModelMappingInfo *Model::find_mmi(const std::string &model) const{
+    auto mmi_idx = mmi_map.find(model);
+    if(mmi_idx == mmi_map.end()){
+        char buf[256];
+        sprintf(buf, "Cannot find model with name: %s", model.c_str());
+        throw std::runtime_error(buf);
+    }
+    return mmi_idx->second;
+}
+
+void Model::resolve_handle(PYSIMLINK::Handle &handle, const rtwCAPI_ModelMappingInfo *mmi){
+    switch(handle.kind){
+        case HandleKind::signal:
+            PYSIMLINK::populate_handle(mmi, rtwCAPI_GetSignals(mmi)[handle.index], &handle);
+            break;
+        case HandleKind::block_param:
+            PYSIMLINK::populate_handle(mmi, rtwCAPI_GetBlockParameters(mmi)[handle.index], &handle);
+            break;
+        case HandleKind::model_param:
+            PYSIMLINK::populate_handle(mmi, rtwCAPI_GetModelParameters(mmi)[handle.index], &handle);
+            break;
+        case HandleKind::root_input:
+            PYSIMLINK::populate_handle(mmi, rtwCAPI_GetRootInputs(mmi)[handle.index], &handle);
+            break;
+    }
+    handle.generation = generation;
+}
+
+void Model::refresh_handle(PYSIMLINK::Handle &handle){
+    // the c api tables are static, so the index is still valid. Only the addresses may have moved.
+    resolve_handle(handle, find_mmi(handle.model_name));
+}
+
+PYSIMLINK::Handle Model::signal_handle(const std::string &model, const std::string &block_path,
+                                       const std::string &sig_name_raw) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling signal_handle. Call `reset()` first!");
+    }
+
+    if(block_path.empty())
+        throw std::runtime_error("No path provided to signal_handle!");
+    if(model.empty())
+        throw std::runtime_error("No model name provided to signal_handle!");
+
+    const rtwCAPI_ModelMappingInfo *mmi = find_mmi(model);
+    const char* sig_name = sig_name_raw.empty() ? nullptr : sig_name_raw.c_str();
+
+    PYSIMLINK::Handle ret;
+    ret.kind = HandleKind::signal;
+    ret.model_name = model;
+    ret.block_path = block_path;
+    ret.name = sig_name_raw;
+    ret.index = PYSIMLINK::find_signal(mmi, block_path.c_str(), sig_name, index);
+    resolve_handle(ret, mmi);
+    return ret;
+}
+
+PYSIMLINK::Handle Model::block_param_handle(const std::string &model, const std::string &block_path,
+                                            const std::string &param) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling block_param_handle. Call `reset()` first!");
+    }
+
+    if(block_path.empty())
+        throw std::runtime_error("No path provided to block_param_handle!");
+    if(model.empty())
+        throw std::runtime_error("No model name provided to block_param_handle!");
+    if(param.empty())
+        throw std::runtime_error("No parameter provided to block_param_handle!");
+
+    const rtwCAPI_ModelMappingInfo *mmi = find_mmi(model);
+
+    PYSIMLINK::Handle ret;
+    ret.kind = HandleKind::block_param;
+    ret.model_name = model;
+    ret.block_path = block_path;
+    ret.name = param;
+    ret.index = PYSIMLINK::find_block_param(mmi, block_path.c_str(), param.c_str(), index);
+    resolve_handle(ret, mmi);
+    return ret;
+}
+
+PYSIMLINK::Handle Model::model_param_handle(const std::string &model, const std::string &param) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling model_param_handle. Call `reset()` first!");
+    }
+
+    if(model.empty())
+        throw std::runtime_error("No model name provided to model_param_handle!");
+    if(param.empty())
+        throw std::runtime_error("No parameter provided to model_param_handle!");
+
+    const rtwCAPI_ModelMappingInfo *mmi = find_mmi(model);
+
+    PYSIMLINK::Handle ret;
+    ret.kind = HandleKind::model_param;
+    ret.model_name = model;
+    ret.name = param;
+    ret.index = PYSIMLINK::find_model_param(mmi, param.c_str(), index);
+    resolve_handle(ret, mmi);
+    return ret;
+}
+
+PYSIMLINK::Handle Model::root_input_handle(const std::string &model, const std::string &block_path) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling root_input_handle. Call `reset()` first!");
+    }
+
+    if(block_path.empty())
+        throw std::runtime_error("No path provided to root_input_handle!");
+    if(model.empty())
+        throw std::runtime_error("No model name provided to root_input_handle!");
+
+    const rtwCAPI_ModelMappingInfo *mmi = find_mmi(model);
+
+    PYSIMLINK::Handle ret;
+    ret.kind = HandleKind::root_input;
+    ret.model_name = model;
+    ret.block_path = block_path;
+    ret.index = PYSIMLINK::find_root_input(mmi, block_path.c_str());
+    resolve_handle(ret, mmi);
+    return ret;
+}
+
+std::vector<PYSIMLINK::Handle> Model::find_handles(PYSIMLINK::HandleKind kind, const std::string &pattern,
+                                                 const std::string &mode, const std::string &model) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling find_handles. Call `reset()` first!");
+    }
+
+    const rtwCAPI_ModelMappingInfo *mmi = model.empty() ? nullptr : find_mmi(model);
+    std::vector<const PYSIMLINK::PathEntry*> matches = paths.find(kind, pattern, mode, mmi);
+
+    std::vector<PYSIMLINK::Handle> ret(matches.size());
+    for(size_t i = 0; i < matches.size(); i++){
+        PYSIMLINK::Handle &cur = ret[i];
+        cur.kind = kind;
+        cur.model_name = *matches[i]->model_name;
+        cur.block_path = PYSIMLINK::safe_string(matches[i]->block_path);
+        cur.name = matches[i]->name == nullptr ? "" : matches[i]->name;
+        cur.index = matches[i]->index;
+        resolve_handle(cur, matches[i]->mmi);
+    }
+    return ret;
+}
+
+py::object Model::read_handle(PYSIMLINK::Handle &handle) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling read_handle. Call `reset()` first!");
+    }
+    if(handle.generation != generation)
+        refresh_handle(handle);
+
+    if(handle.is_array)
+        return py::array(PYSIMLINK::from_buffer_struct(handle.arr));
+
+    all_dtypes ret;
+    (void)memcpy(&ret, handle.addr, handle.type_size);
+    return py::cast(ret);
+}
+
+py::array Model::view_handle(PYSIMLINK::Handle &handle) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling view_handle. Call `reset()` first!");
+    }
+    if(handle.generation != generation)
+        refresh_handle(handle);
+    if(!handle.is_array){
+        std::stringstream err("");
+        err << "view_handle: Cannot create a view of (" << handle.block_path << ',' << handle.name << "). ";
+        err << "Only numeric values can be viewed, not structs (" << handle.struct_name << ")";
+        throw std::runtime_error(err.str());
+    }
+
+    py::buffer_info info = PYSIMLINK::from_buffer_struct(handle.arr);
+    // passing this model as the base ties the lifetime of the model to the view and prevents the copy
+    py::array ret(py::dtype(info), info.shape, info.strides, info.ptr,
+                  py::cast(this, py::return_value_policy::reference));
+    if(handle.kind == HandleKind::signal){
+        // signals are written by the model. Changing them from python would be overwritten or violate the solver
+        py::detail::array_proxy(ret.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+    }
+    return ret;
+}
+
+size_t Model::handle_address(PYSIMLINK::Handle &handle) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling handle_address. Call `reset()` first!");
+    }
+    if(handle.generation != generation)
+        refresh_handle(handle);
+    return reinterpret_cast<size_t>(handle.addr);
+}
+
+double *Model::prepare_gather(std::vector<PYSIMLINK::Handle*> &handles, py::array &out, ssize_t rows) {
+    // everything that touches python objects must happen here, before the gil is released
+    if(!out.dtype().is(py::dtype::of<double>()))
+        throw std::runtime_error("Output buffer must have dtype float64");
+    if(!(out.flags() & py::array::c_style))
+        throw std::runtime_error("Output buffer must be c contiguous");
+    if(!out.writeable())
+        throw std::runtime_error("Output buffer must be writeable");
+
+    ssize_t width = 0;
+    for(auto handle : handles){
+        if(handle->generation != generation)
+            refresh_handle(*handle);
+        if(!handle->is_array){
+            std::stringstream err("");
+            err << "Cannot gather (" << handle->block_path << ',' << handle->name << "). ";
+            err << "Struct (" << handle->struct_name << ") signals cannot be converted to float64";
+            throw std::runtime_error(err.str());
+        }
+        width += PYSIMLINK::buffer_size(handle->arr);
+    }
+    if(width * rows != out.size()){
+        std::stringstream err("");
+        err << "Output buffer has " << out.size() << " elements but " << width * rows << " are required";
+        throw std::runtime_error(err.str());
+    }
+    return static_cast<double*>(out.mutable_data());
+}
+
+void Model::read_signals(std::vector<PYSIMLINK::Handle*> &handles, py::array out) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling read_signals. Call `reset()` first!");
+    }
+    double *dest = prepare_gather(handles, out, 1);
+
+    py::gil_scoped_release release;
+    for(auto handle : handles){
+        PYSIMLINK::copy_as_double(handle->arr, dest);
+        dest += PYSIMLINK::buffer_size(handle->arr);
+    }
+}
+
+void Model::run(int num_steps, std::vector<PYSIMLINK::Handle*> &record, int decimation, py::array out,
+                std::vector<PYSIMLINK::Handle*> &inputs, std::vector<py::array> &input_values) {
+    auto guard = lock();
+    if(!initialized){
+        throw std::runtime_error("Model must be initialized before calling run. Call `reset()` first!");
+    }
+    run_steps = 0;
+    if(num_steps <= 0)
+        throw std::runtime_error("num_steps must be a positive number");
+    if(decimation <= 0)
+        throw std::runtime_error("decimation must be a positive number");
+    if(inputs.size() != input_values.size())
+        throw std::runtime_error("run: Number of inputs does not match the number of input values");
+
+    double *dest = prepare_gather(record, out, num_steps / decimation);
+
+    // resolve every input to (destination, source, row size) so nothing touches python in the loop
+    std::vector<std::tuple<void*, const char*, size_t>> writes;
+    writes.reserve(inputs.size());
+    for(size_t i = 0; i < inputs.size(); i++){
+        PYSIMLINK::Handle *handle = inputs[i];
+        py::array &value = input_values[i];
+        if(handle->generation != generation)
+            refresh_handle(*handle);
+        if(handle->kind == HandleKind::signal || !handle->is_array){
+            std::stringstream err("");
+            err << "run: (" << handle->block_path << ',' << handle->name << ") is not a numeric parameter or root inport";
+            throw std::runtime_error(err.str());
+        }
+
+        size_t row_bytes = PYSIMLINK::buffer_size(handle->arr) * handle->arr.itemsize;
+        if(!(value.flags() & py::array::c_style) || value.ndim() != 2 || value.shape(0) < num_steps ||
+           (size_t)value.shape(1) * value.itemsize() != row_bytes || value.itemsize() != handle->arr.itemsize){
+            std::stringstream err("");
+            err << "run: Values for (" << handle->block_path << ',' << handle->name << ") must be a c contiguous ";
+            err << "array with " << num_steps << " rows of " << row_bytes << " bytes";
+            throw std::runtime_error(err.str());
+        }
+        writes.emplace_back(handle->addr, static_cast<const char*>(value.data()), row_bytes);
+    }
+
+    py::gil_scoped_release release;
+    for(int cur_step=0; cur_step < num_steps; cur_step++){
+        for(auto &write : writes){
+            memcpy(std::get<0>(write), std::get<1>(write) + cur_step * std::get<2>(write), std::get<2>(write));
+        }
+        step_once();
+        run_steps++;
+        if((cur_step + 1) % decimation != 0)
+            continue;
+        for(auto handle : record){
+            PYSIMLINK::copy_as_double(handle->arr, dest);
+            dest += PYSIMLINK::buffer_size(handle->arr);
+        }
+    }
+}
+
+int Model::steps_run() const{
+    auto guard = lock();
+    return run_steps;
+}
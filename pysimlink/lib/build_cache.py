@@ -0,0 +1,502 @@
+"""
+Content-addressed cache of built model extensions, shared by every project on the machine.
+
+A build is identified by a hash of everything that goes into it: the generated model sources,
+the pysimlink templates and build scripts, the compiler (its path, version, and settings), pybind11, and
+the python ABI.
+Identical inputs always map to the same key, so a model built once (in any project or CI job)
+is reused instead of compiled.
+
+Static libraries of referenced models and shared utilities are cached the same way, keyed on their
+own sources and the headers they include, so root models that reference the same (identically generated)
+models link against one build of them. The model independent core of the bindings only includes the C API
+headers of the generated code (:file:`rtwtypes.h`, :file:`rtw_capi.h`, and :file:`rtw_modelmap.h`), so it is
+shared by every model generated by the same MATLAB release for the same target hardware.
+
+The cache lives in :code:`$PYSIMLINK_CACHE_DIR` when set, otherwise in the user cache directory
+(:file:`~/.cache/pysimlink` on linux and mac). Set :code:`PYSIMLINK_NO_CACHE=1` to disable it.
+"""
+import functools
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+import zipfile
+
+import cmake
+import pybind11
+
+from pysimlink.utils import annotation_utils as anno
+
+## Extensions of generated files that affect the build
+SOURCE_EXTENSIONS = (".c", ".h", ".cpp", ".hpp", ".cc", ".txt")
+## Environment variables that change the compiler or its flags
+COMPILER_ENV = ("CC", "CXX", "CFLAGS", "CXXFLAGS", "CPPFLAGS", "LDFLAGS")
+## Compilers CMake looks for when CC or CXX is not set, in order
+DEFAULT_COMPILERS = {"CC": ("cc", "gcc", "clang", "cl"), "CXX": ("c++", "g++", "clang++", "cl")}
+KEY_FILE = "build_key"
+## Subdirectory of the cache holding static libraries
+LIBS_DIR = "libs"
+## Subdirectory of the cache mapping zip files to the key of their build
+ARCHIVES_DIR = "archives"
+## Included files, quoted or bracketed
+INCLUDE_RE = re.compile(r'^\s*#\s*include\s*["<]([^">]+)[">]', re.MULTILINE)
+## C comments and string or character literals (matched so comment markers inside them are kept)
+CODE_RE = re.compile(rb'//[^\n]*|/\*.*?\*/|("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')', re.DOTALL)
+
+_pkg_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def cache_dir() -> "anno.Optional[str]":
+    """
+    Directory of the shared build cache
+
+    Returns:
+        str: path to the cache directory, or None if caching is disabled
+    """
+    if os.environ.get("PYSIMLINK_NO_CACHE", "0") not in ("", "0"):
+        return None
+    if os.environ.get("PYSIMLINK_CACHE_DIR"):
+        return os.environ["PYSIMLINK_CACHE_DIR"]
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "pysimlink")
+
+
+def source_files(
+    root: str, extensions: "anno.Optional[tuple]" = None, exclude: "anno.Optional[str]" = None
+) -> "list[str]":
+    """
+    Files of a directory tree that go into a build
+
+    Args:
+        root: directory to search
+        extensions: only return files ending with one of these. None returns every file.
+        exclude: directory to skip (the build directory, if it is inside the model directory)
+
+    Returns:
+        list[str]: sorted paths of the files
+    """
+    files = []
+    for cur_path, folders, names in os.walk(root, followlinks=False):
+        if exclude is not None:
+            # don't hash our own build directory if it is inside the model directory
+            folders[:] = [
+                folder
+                for folder in folders
+                if os.path.abspath(os.path.join(cur_path, folder)) != os.path.abspath(exclude)
+            ]
+        for name in names:
+            if extensions is None or name.endswith(extensions):
+                files.append(os.path.join(cur_path, name))
+    return sorted(files)
+
+
+def _hash_tree(
+    digest,
+    root: str,
+    extensions: "anno.Optional[tuple]" = None,
+    exclude: "anno.Optional[str]" = None,
+):
+    for file in source_files(root, extensions, exclude):
+        digest.update(os.path.relpath(file, root).replace(os.sep, "/").encode())
+        digest.update(b"\0")
+        with open(file, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+
+def _code_digest(path: str) -> bytes:
+    # hash of a file without its comments and whitespace. Generated headers start with a banner naming the model
+    # and the time it was generated, which does not change the compiled code.
+    with open(path, "rb") as f:
+        text = f.read()
+    text = CODE_RE.sub(lambda match: match.group(1) or b" ", text)
+    return hashlib.sha256(b" ".join(text.split())).digest()
+
+
+def build_key(
+    model_paths: "anno.ModelPaths", generator: str, build_profile: str = "release"
+) -> str:
+    """
+    Hash every input of a model build.
+
+    Args:
+        model_paths: paths of the model to build
+        generator: cmake generator used for the build
+        build_profile: compiler settings preset of the build
+
+    Returns:
+        str: hex digest identifying the build
+    """
+    digest = hashlib.sha256()
+    digest.update(model_paths.root_model_name.encode() + b"\0")
+
+    # generated model code, shared utilities, and defines.txt
+    _hash_tree(digest, model_paths.root_dir, SOURCE_EXTENSIONS, exclude=model_paths.tmp_dir)
+
+    _hash_pysimlink(digest, generator, build_profile)
+    return digest.hexdigest()
+
+
+def archive_key(
+    archive: str, model_name: str, generator: str, build_profile: str = "release"
+) -> str:
+    """
+    Hash every input of a model build from a zip file, without extracting it.
+
+    Members are identified by their name, size, and CRC recorded in the zip file.
+
+    Args:
+        archive: path to the zip file of the model
+        model_name: name of the root model
+        generator: cmake generator used for the build
+        build_profile: compiler settings preset of the build
+
+    Returns:
+        str: hex digest identifying the zip file's build
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode() + b"\0")
+    with zipfile.ZipFile(archive, "r") as f:
+        members = sorted(
+            (info.filename, info.file_size, info.CRC)
+            for info in f.infolist()
+            if not info.is_dir() and info.filename.endswith(SOURCE_EXTENSIONS)
+        )
+    digest.update(json.dumps(members).encode())
+    _hash_pysimlink(digest, generator, build_profile)
+    return digest.hexdigest()
+
+
+def _hash_pysimlink(digest, generator: str, build_profile: str):
+    # pysimlink templates and everything that writes the cmake project
+    _hash_tree(digest, os.path.join(_pkg_dir, "c_files"))
+    for script in sorted(
+        glob.glob(os.path.join(_pkg_dir, "lib", "*.py"))
+        + glob.glob(os.path.join(_pkg_dir, "lib", "compilers", "*.py"))
+        + glob.glob(os.path.join(_pkg_dir, "utils", "*.py"))
+    ):
+        with open(script, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+    digest.update(json.dumps(_environment(generator, build_profile), sort_keys=True).encode())
+
+
+def _environment(generator: str, build_profile: str) -> dict:
+    return {
+        "generator": generator,
+        "build_profile": build_profile,
+        "compiler": {var: os.environ.get(var, "") for var in COMPILER_ENV},
+        "toolchain": {
+            var: _compiler_identity(var, os.environ.get(var, ""), os.environ.get("PATH", ""))
+            for var in DEFAULT_COMPILERS
+        },
+        "platform": [sys.platform, platform.machine()],
+        "python": [sys.implementation.cache_tag, sysconfig.get_config_var("EXT_SUFFIX")],
+        "pybind11": pybind11.__version__,
+        "cmake": getattr(cmake, "__version__", ""),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _compiler_identity(var: str, command: str, search_path: str) -> "list[str]":
+    """
+    Path and version of the compiler CMake picks for :code:`CC` or :code:`CXX`, so upgrading the compiler or
+    changing the default one changes the build key. Compilers that are not on the path (like those of the Visual
+    Studio generators) are identified by the generator alone.
+
+    Args:
+        var: CC or CXX
+        command: value of the environment variable (empty if not set)
+        search_path: directories searched for the compiler (the PATH)
+
+    Returns:
+        list[str]: resolved path of the compiler and the first line it prints for :code:`--version`. Empty
+        strings if no compiler was found.
+    """
+    args = shlex.split(command, posix=os.name != "nt")
+    if len(args) == 0:
+        found = [shutil.which(name, path=search_path) for name in DEFAULT_COMPILERS[var]]
+        args = [path for path in found if path is not None][:1]
+    if len(args) == 0:
+        return ["", ""]
+    path = shutil.which(args[0], path=search_path) or args[0]
+    try:
+        proc = subprocess.run(
+            args + ["--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            timeout=30,
+            check=False,
+        )
+        lines = proc.stdout.decode(errors="replace").splitlines()
+    except (OSError, subprocess.SubprocessError):
+        lines = []
+    version = next((line.strip() for line in lines if line.strip()), "")
+    return [os.path.realpath(path), version]
+
+
+def included_headers(sources: "list[str]", include_dirs: "list[str]") -> "list[str]":
+    """
+    Follow the includes of a set of sources to every header they (transitively) use.
+
+    Headers are looked up in the include directories in order, like the compiler does. Includes
+    that are not found (system headers) are ignored.
+
+    Args:
+        sources: source files to start from
+        include_dirs: directories searched for included files
+
+    Returns:
+        list[str]: paths of all headers used by the sources
+    """
+    lookup = {}
+    for include_dir in include_dirs:
+        for name in os.listdir(include_dir):
+            path = os.path.join(include_dir, name)
+            if os.path.isfile(path):
+                lookup.setdefault(name, path)
+
+    found = set()
+    pending = list(sources)
+    while pending:
+        with open(pending.pop(), "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        for name in INCLUDE_RE.findall(text):
+            header = lookup.get(os.path.basename(name))
+            if header is not None and header not in found:
+                found.add(header)
+                pending.append(header)
+    return sorted(found)
+
+
+def lib_key(
+        lib_name: str,
+        sources: "list[str]",
+        headers: "list[str]",
+        defines: "list[str]",
+        generator: str,
+        build_profile: str = "release",
+) -> str:
+    """
+    Hash every input of a static library build.
+
+    Args:
+        lib_name: name of the library
+        sources: source files compiled into the library
+        headers: headers used by the sources (see :func:`included_headers`). Their comments are ignored, so
+            headers that only differ in the banner written by the code generator give the same key.
+        defines: compile definitions
+        generator: cmake generator used for the build
+        build_profile: compiler settings preset of the build
+
+    Returns:
+        str: hex digest identifying the library
+    """
+    digest = hashlib.sha256()
+    digest.update(lib_name.encode() + b"\0")
+    # only the name matters to the compiler, not where the model was extracted
+    for file in sorted(sources):
+        digest.update(os.path.basename(file).encode() + b"\0")
+        with open(file, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(b"\1")
+    for file in headers:
+        digest.update(os.path.basename(file).encode() + b"\0")
+        digest.update(_code_digest(file))
+    digest.update(b"\1")
+    with open(os.path.join(_pkg_dir, "lib", "cmake_gen.py"), "rb") as f:
+        digest.update(hashlib.sha256(f.read()).digest())
+    env = dict(_environment(generator, build_profile), defines=sorted(defines))
+    digest.update(json.dumps(env, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def read_key(tmp_dir: str) -> "anno.Optional[str]":
+    """
+    Key of the build currently in a model's build directory
+
+    Args:
+        tmp_dir: build directory of the model
+
+    Returns:
+        str: key written by :func:`write_key`, or None if there is none
+    """
+    try:
+        with open(os.path.join(tmp_dir, KEY_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def write_key(tmp_dir: str, key: str):
+    """
+    Record the key of the build in a model's build directory
+
+    Args:
+        tmp_dir: build directory of the model
+        key: key returned from :func:`build_key`
+    """
+    with open(os.path.join(tmp_dir, KEY_FILE), "w", encoding="utf-8") as f:
+        f.write(key)
+
+
+def _entry(key: str, kind: str = "") -> "anno.Optional[str]":
+    root = cache_dir()
+    if root is None:
+        return None
+    return os.path.join(root, kind, key[:2], key)
+
+
+def _store_entry(entry: str, artifacts: "list[str]", info: dict) -> bool:
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp_", dir=os.path.dirname(entry))
+        for artifact in artifacts:
+            shutil.copy2(artifact, tmp)
+        with open(os.path.join(tmp, "info.json"), "w", encoding="utf-8") as f:
+            json.dump(dict(info, created=time.time()), f)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # another process stored the same build first
+            shutil.rmtree(tmp, ignore_errors=True)
+    except OSError:
+        return False
+    return True
+
+
+def fetch(key: str, library_dir: str, module_name: str) -> bool:
+    """
+    Copy a cached extension into a model's library directory
+
+    Args:
+        key: key returned from :func:`build_key`
+        library_dir: directory the extension is imported from
+        module_name: name of the extension module
+
+    Returns:
+        bool: True if the extension was in the cache
+    """
+    entry = _entry(key)
+    if entry is None:
+        return False
+    artifacts = glob.glob(os.path.join(entry, module_name + ".*"))
+    if len(artifacts) == 0:
+        return False
+
+    os.makedirs(library_dir, exist_ok=True)
+    for artifact in artifacts:
+        # copy next to the destination first so a concurrent import never sees a partial file
+        tmp = os.path.join(library_dir, f".{os.getpid()}_{os.path.basename(artifact)}")
+        shutil.copy2(artifact, tmp)
+        os.replace(tmp, os.path.join(library_dir, os.path.basename(artifact)))
+    return True
+
+
+def store(key: str, library_dir: str, module_name: str, model_name: str):
+    """
+    Add a freshly built extension to the cache. Errors are ignored; the cache is only an optimization.
+
+    Args:
+        key: key returned from :func:`build_key`
+        library_dir: directory the extension was built into
+        module_name: name of the extension module
+        model_name: name of the root model (stored for reference only)
+    """
+    entry = _entry(key)
+    if entry is None:
+        return
+    artifacts = glob.glob(os.path.join(library_dir, module_name + ".*"))
+    if len(artifacts) == 0:
+        return
+
+    _store_entry(entry, artifacts, {"model": model_name})
+
+
+def find_lib(key: str) -> "anno.Optional[str]":
+    """
+    Look up a cached static library
+
+    Args:
+        key: key returned from :func:`lib_key`
+
+    Returns:
+        str: path to the library in the cache, or None if it is not cached
+    """
+    entry = _entry(key, LIBS_DIR)
+    if entry is None:
+        return None
+    artifacts = [
+        name for name in glob.glob(os.path.join(entry, "*")) if not name.endswith("info.json")
+    ]
+    if len(artifacts) != 1:
+        return None
+    return artifacts[0]
+
+
+def store_lib(key: str, artifact: str, lib_name: str) -> "anno.Optional[str]":
+    """
+    Add a freshly built static library to the cache
+
+    Args:
+        key: key returned from :func:`lib_key`
+        artifact: path to the built library
+        lib_name: name of the library (stored for reference only)
+
+    Returns:
+        str: path to the library in the cache, or None if it could not be stored
+    """
+    entry = _entry(key, LIBS_DIR)
+    if entry is None or not _store_entry(entry, [artifact], {"lib": lib_name}):
+        return None
+    return find_lib(key)
+
+
+def find_archive(key: str) -> "anno.Optional[str]":
+    """
+    Look up the build of a zip file
+
+    Args:
+        key: key returned from :func:`archive_key`
+
+    Returns:
+        str: key of the build (see :func:`build_key`), or None if the zip file was never built
+    """
+    entry = _entry(key, ARCHIVES_DIR)
+    if entry is None:
+        return None
+    try:
+        with open(os.path.join(entry, "info.json"), "r", encoding="utf-8") as f:
+            return json.load(f)["build_key"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def store_archive(key: str, build: str, archive: str):
+    """
+    Record the build of a zip file. Errors are ignored; the cache is only an optimization.
+
+    Args:
+        key: key returned from :func:`archive_key`
+        build: key of the build (see :func:`build_key`)
+        archive: path to the zip file (stored for reference only)
+    """
+    entry = _entry(key, ARCHIVES_DIR)
+    if entry is None:
+        return
+    _store_entry(entry, [], {"build_key": build, "archive": archive})
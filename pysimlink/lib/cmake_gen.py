@@ -7,6 +7,40 @@ import pybind11
 
 from pysimlink.utils.model_utils import sanitize_model_name
 
+## Static library with the model independent part of the bindings
+CORE_LIB = "pysimlink_core"
+## Headers parsed by every translation unit of the bindings
+PRECOMPILED_HEADERS = ("<pybind11/pybind11.h>", "<pybind11/numpy.h>", "<pybind11/stl.h>")
+
+## Presets for the compiler settings of a build.
+#  build_type: CMAKE_BUILD_TYPE, flags: extra flags for gcc/clang, msvc_flags: extra flags for msvc,
+#  lto: link time optimization across all targets (None keeps pybind11's default of the extension only),
+#  unity: compile each target as a unity build
+BUILD_PROFILES = {
+    "fast-compile": {
+        "build_type": "Release",
+        "flags": "-O1",
+        "msvc_flags": "/O1",
+        "lto": False,
+        "unity": False,
+    },
+    "release": {
+        "build_type": "Release",
+        "flags": "",
+        "msvc_flags": "",
+        "lto": None,
+        "unity": False,
+    },
+    "max-perf": {
+        "build_type": "Release",
+        "flags": "-O3 -march=native",
+        "msvc_flags": "/O2",
+        "lto": True,
+        "unity": True,
+    },
+    "debug": {"build_type": "Debug", "flags": "", "msvc_flags": "", "lto": False, "unity": False},
+}
+
 
 class CmakeTemplate:
     """
@@ -16,9 +50,11 @@ class CmakeTemplate:
     allow a model to be imported in python.
     """
 
-    def __init__(self, model_name):
+    def __init__(self, model_name, build_profile="release"):
         self.model_name = model_name
+        self.profile = BUILD_PROFILES[build_profile]
         self.libs = []
+        self.imported = []
         self.replacers = [(re.compile(r"(?<!\\) "), r"\ "), (re.compile(r"\\(?! )"), r"/")]
 
         self.sanitized_name = sanitize_model_name(model_name)
@@ -41,7 +77,31 @@ class CmakeTemplate:
 project({self.model_name})
 set(CMAKE_CXX_STANDARD 11)
 set(CMAKE_CXX_STANDARD_REQUIRED ON)
-find_package(pybind11 PATHS {self.replacer(pybind11.get_cmake_dir())})"""
+find_package(pybind11 PATHS {self.replacer(pybind11.get_cmake_dir())})""" + self.profile_settings()
+
+    def profile_settings(self):
+        """
+        Settings of the build profile that have to be in place before any target is created
+
+        Returns:
+            str: cmake directives for compiler flags, lto, and unity builds
+        """
+        ret = ""
+        if self.profile["flags"] or self.profile["msvc_flags"]:
+            ret += f"""
+if(MSVC)
+    add_compile_options({self.profile["msvc_flags"]})
+else()
+    add_compile_options({self.profile["flags"]})
+endif()"""
+        if self.profile["lto"] is not None:
+            ret += f"""
+cmake_policy(SET CMP0069 NEW)
+set(CMAKE_INTERPROCEDURAL_OPTIMIZATION {"ON" if self.profile["lto"] else "OFF"})"""
+        if self.profile["unity"]:
+            ret += """
+set(CMAKE_UNITY_BUILD ON)"""
+        return ret
 
     def set_includes(self, includes: "list[str]"):
         """
@@ -86,6 +146,90 @@ add_library(
 )        
 """
 
+    def add_core_library(self, lib_name: str, sources: "list[str]"):
+        """
+        Add the model independent part of the bindings. It is compiled like the pybind11 module it is linked into.
+
+        Args:
+            lib_name: Name of the library
+            sources: list of all source files to compile into this library
+
+        Returns:
+            str: add_library and pybind11 setup cmake directives
+        """
+        self.libs.append(lib_name)
+        sources = [self.replacer(os.path.abspath(source)) for source in sources]
+        source_paths = "\n        ".join(sources)
+        return f"""
+add_library(
+    {lib_name} STATIC
+        {source_paths}
+)
+target_link_libraries({lib_name} PRIVATE pybind11::module)
+set_target_properties(
+    {lib_name} PROPERTIES
+        CXX_VISIBILITY_PRESET hidden
+        POSITION_INDEPENDENT_CODE ON
+)
+""" + self.precompile_headers(lib_name)
+
+    def precompile_headers(self, target: str):
+        """
+        Precompile the pybind11 headers once per target instead of parsing them in every translation unit
+
+        Args:
+            target: name of the target
+
+        Returns:
+            str: target_precompile_headers directive (cmake >= 3.16)
+        """
+        headers = "\n        ".join(PRECOMPILED_HEADERS)
+        return f"""
+if(NOT CMAKE_VERSION VERSION_LESS 3.16)
+    target_precompile_headers(
+        {target} PRIVATE
+            {headers}
+    )
+endif()
+"""
+
+    def add_imported_library(self, lib_name: str, path: str):
+        """
+        Use a library that was already built (e.g. from the build cache) instead of compiling it
+
+        Args:
+            lib_name: Name of the library
+            path: path to the static library
+
+        Returns:
+            str: add_library directive for an imported library
+        """
+        self.imported.append(lib_name)
+        return f"""
+add_library({lib_name} STATIC IMPORTED)
+set_target_properties(
+    {lib_name} PROPERTIES
+        IMPORTED_LOCATION {self.replacer(os.path.abspath(path))}
+)
+"""
+
+    def set_archive_dirs(self):
+        """
+        Put every static library in its own directory so the build output can be collected per library
+
+        Returns:
+            str: set_target_properties cmake directives
+        """
+        ret = ""
+        for lib in self.libs:
+            ret += f"""
+set_target_properties(
+    {lib} PROPERTIES
+        ARCHIVE_OUTPUT_DIRECTORY ${{PROJECT_BINARY_DIR}}/out/{lib}
+)
+"""
+        return ret
+
     def set_lib_props(self):
         """
         Set all models to be compiled with c 90
@@ -127,7 +271,7 @@ set_target_properties(
     {self.sanitized_name}_interface_c PROPERTIES
         LIBRARY_OUTPUT_DIRECTORY ${{PROJECT_BINARY_DIR}}/out/library
 )
-"""
+""" + self.precompile_headers(f"{self.sanitized_name}_interface_c")
 
     def add_link_libs(self, dep_map: "dict[str, set[str]]"):
         """
@@ -151,17 +295,19 @@ set_target_properties(
                 else:
                     deps[midx] = "m"
             deps_exp = "\n        ".join(deps)
+            # imported libraries only carry their dependencies to whatever links them
+            keyword = "INTERFACE\n        " if dep in self.imported else ""
             ret += f"""
 target_link_libraries(
     {dep}
-        {deps_exp}
+        {keyword}{deps_exp}
 )
 """
         return ret
 
     def add_private_link(self, root_model: "str"):
         """
-        Link the custom mixins to the root model
+        Link the custom mixins to the root model (or another library)
 
         Args:
             root_model: name of the root model
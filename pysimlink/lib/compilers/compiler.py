@@ -5,14 +5,18 @@ from datetime import datetime
 from subprocess import Popen, PIPE
 import shutil
 import re
+import time
 import warnings
 
 import cmake
 
 from pysimlink.utils import annotation_utils as anno
-from pysimlink.utils.model_utils import infer_defines, sanitize_model_name
+from pysimlink.utils.model_utils import infer_defines, sanitize_model_name, find_ninja
 from pysimlink.lib.exceptions import GenerationError, BuildError
-from pysimlink.lib.struct_parser import parse_struct
+from pysimlink.lib.struct_parser import parse_struct, parse_data_objects
+from pysimlink.lib import build_cache
+from pysimlink.lib import cmake_gen
+from pysimlink.lib.cmake_gen import BUILD_PROFILES, CORE_LIB
 
 
 class Compiler:
@@ -27,14 +31,31 @@ class Compiler:
     defines: "list[str]"  ## All defines that should be set during _model compilation
     custom_includes: str  ## Include files directory defined by this python module
     custom_sources: str  ## Source files directory defined by this python module
+    core_sources: str  ## Source files of the model independent core of the bindings
+    prebuilt: "dict[str, str]"  ## Libraries taken from the build cache, mapped to their path
     types: "list[anno.Struct]"  ## Name of types used by signals (usually manifested as busses).
     matlogging: bool  ## Whether matfile logging is enabled
-
-    def __init__(self, model_paths: "anno.ModelPaths", generator: str):
+    jobs: int  ## Number of parallel build jobs
+    build_profile: str  ## Name of the compiler settings preset (see cmake_gen.BUILD_PROFILES)
+    timings: "dict[str, float]"  ## Duration in seconds of each phase of the last build
+
+    def __init__(
+        self,
+        model_paths: "anno.ModelPaths",
+        generator: str,
+        jobs: "anno.Optional[int]" = None,
+        build_profile: str = "release",
+    ):
         self.model_paths = model_paths
         self.types = []
         self.matlogging = False
         self.generator=generator
+        self.jobs = jobs or os.cpu_count() or 1
+        self.build_profile = build_profile
+        self.timings = {}
+        self.prebuilt = {}
+        self._build_key = None
+        self._archive_key = None
 
     def clean(self):
         """
@@ -42,9 +63,13 @@ class Compiler:
         """
         self.model_paths.clean()
 
-    def compile(self):
+    def compile(self, clean: bool = False):
         """
-        Builds the cmake file, calls cmake, and builds the extension.
+        Builds the cmake file, calls cmake, and builds the extension. Without :code:`clean`, the previous build
+        directory is reused and only translation units whose sources changed are recompiled.
+
+        Args:
+            clean: remove all build artifacts before building
         """
         raise NotImplementedError
 
@@ -60,35 +85,110 @@ class Compiler:
         """
         raise NotImplementedError
 
+    @property
+    def library_dir(self) -> str:
+        """
+        Directory the extension is built into (and imported from)
+        """
+        if os.name == "nt":
+            return os.path.join(self.model_paths.tmp_dir, "build", "out", "library", "Debug")
+        return os.path.join(self.model_paths.tmp_dir, "build", "out", "library")
+
+    @property
+    def build_key(self) -> str:
+        """
+        Hash of all inputs of this build. See :mod:`pysimlink.lib.build_cache`.
+        """
+        if self._build_key is None:
+            self._build_key = build_cache.build_key(
+                self.model_paths, self.generator, self.build_profile
+            )
+        return self._build_key
+
+    @property
+    def archive_key(self) -> "anno.Optional[str]":
+        """
+        Hash of all inputs of this build, read from the model's zip file without extracting it. None if the model
+        is not a zip file. See :func:`pysimlink.lib.build_cache.archive_key`.
+        """
+        if self.model_paths.archive is None:
+            return None
+        if self._archive_key is None:
+            self._archive_key = build_cache.archive_key(
+                self.model_paths.archive,
+                self.model_paths.root_model_name,
+                self.generator,
+                self.build_profile,
+            )
+        return self._archive_key
+
+    def fetch_archive(self) -> bool:
+        """
+        Find the build of an unchanged zip file, either in the build directory or in the shared build cache, so the
+        zip file does not need to be extracted.
+
+        Returns:
+            bool: True if the extension is ready to import
+        """
+        if self.archive_key is None:
+            return False
+        key = build_cache.find_archive(self.archive_key)
+        if key is None:
+            return False
+
+        lib = glob.glob(os.path.join(self.library_dir, self.model_paths.module_name + ".*"))
+        if len(lib) == 0 or build_cache.read_key(self.model_paths.tmp_dir) != key:
+            if not build_cache.fetch(key, self.library_dir, self.model_paths.module_name):
+                return False
+            build_cache.write_key(self.model_paths.tmp_dir, key)
+        self._build_key = key
+        return True
+
     def needs_to_compile(self) -> bool:
         """
-        check if the model extension exists.
+        check if the model extension exists and was built from the current sources.
 
         Returns:
             bool: True if the model needs to be compiled, False otherwise
         """
-        if os.name == "nt":
-            lib = glob.glob(
-                os.path.join(
-                    self.model_paths.tmp_dir,
-                    "build",
-                    "out",
-                    "library",
-                    "Debug",
-                    self.model_paths.module_name + ".*",
-                )
-            )
-        else:
-            lib = glob.glob(
-                os.path.join(
-                    self.model_paths.tmp_dir,
-                    "build",
-                    "out",
-                    "library",
-                    self.model_paths.module_name + ".*",
-                )
-            )
-        return len(lib) == 0
+        lib = glob.glob(os.path.join(self.library_dir, self.model_paths.module_name + ".*"))
+        if len(lib) == 0:
+            return True
+        return build_cache.read_key(self.model_paths.tmp_dir) != self.build_key
+
+    def fetch_cached(self) -> bool:
+        """
+        Use an identical build from the shared build cache instead of compiling.
+
+        Returns:
+            bool: True if the extension was found in the cache
+        """
+        if not build_cache.fetch(self.build_key, self.library_dir, self.model_paths.module_name):
+            return False
+        build_cache.write_key(self.model_paths.tmp_dir, self.build_key)
+        self.store_archive()
+        return True
+
+    def store_cached(self):
+        """
+        Record the key of a finished build and add the extension to the shared build cache
+        """
+        build_cache.write_key(self.model_paths.tmp_dir, self.build_key)
+        build_cache.store(
+            self.build_key,
+            self.library_dir,
+            self.model_paths.module_name,
+            self.model_paths.root_model_name,
+        )
+        self.store_archive()
+
+    def store_archive(self):
+        """
+        Record which build the model's zip file turns into, so it is not extracted again to find out. Does nothing
+        if the model is not a zip file.
+        """
+        if self.archive_key is not None:
+            build_cache.store_archive(self.archive_key, self.build_key, self.model_paths.archive)
 
     def _get_simulink_deps(self):
         """
@@ -118,18 +218,14 @@ class Compiler:
     def _gen_custom_srcs(self):
         """
         Moves all custom mixin source files to the temporary directory and makes appropriate replacements
-        in the source files
+        in the source files. Files are only written when their content changes, so unchanged files keep their
+        timestamps and are not recompiled.
         """
-        shutil.rmtree(
-            os.path.join(self.model_paths.tmp_dir, "c_files"),
-            ignore_errors=True,
-        )
-        shutil.copytree(
-            os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "c_files")),
-            os.path.join(self.model_paths.tmp_dir, "c_files"),
-        )
-        self.custom_includes = os.path.join(self.model_paths.tmp_dir, "c_files", "include")
-        self.custom_sources = os.path.join(self.model_paths.tmp_dir, "c_files", "src")
+        src_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "c_files"))
+        dst_root = os.path.join(self.model_paths.tmp_dir, "c_files")
+        self.custom_includes = os.path.join(dst_root, "include")
+        self.custom_sources = os.path.join(dst_root, "src")
+        self.core_sources = os.path.join(dst_root, "core")
 
         replacements = {
             "<<ROOT_MODEL>>": self.model_paths.root_model_name + ".h",
@@ -139,13 +235,24 @@ class Compiler:
             "<<DATA_TYPE>>": self.gather_types(),
             "<<ALL_DTYPES>>": self.get_type_names(),
             "<<RTW_MATLOGGING>>": '#include "rtw_matlogging.h"' if self.matlogging else "",
+            "<<MODEL_DATA_OBJECTS>>": self.get_data_objects(),
+            "<<MODEL_DATA_HEADERS>>": self.get_data_headers(),
         }
-        self._replace_macros(os.path.join(self.custom_includes, "model_utils.hpp"), replacements)
-        self._replace_macros(
-            os.path.join(self.custom_includes, "model_interface.hpp"), replacements
-        )
-        self._replace_macros(os.path.join(self.custom_sources, "bindings.cpp"), replacements)
-        self._replace_macros(os.path.join(self.custom_includes, "containers.hpp"), replacements)
+        expected = set()
+        for cur_path, _, files in os.walk(src_root):
+            for file in files:
+                rel = os.path.relpath(os.path.join(cur_path, file), src_root)
+                expected.add(rel)
+                with open(os.path.join(src_root, rel), "r", encoding="utf-8") as f:
+                    text = self._replace_macros(f.read(), replacements)
+                self._write_if_changed(os.path.join(dst_root, rel), text)
+
+        # every source in the directory is compiled, so remove files that are no longer part of pysimlink
+        for cur_path, _, files in os.walk(dst_root):
+            for file in files:
+                path = os.path.join(cur_path, file)
+                if os.path.relpath(path, dst_root) not in expected:
+                    os.remove(path)
 
         defines = os.path.join(self.model_paths.root_model_path, "defines.txt")
         if os.path.exists(defines):
@@ -154,29 +261,135 @@ class Compiler:
         else:
             self.defines = infer_defines(self.model_paths)
 
-    def _build(self):
+    def _includes(self) -> "list[str]":
+        """
+        Include directories of the build, starting with the custom mixins
+        """
+        raise NotImplementedError
+
+    def _lib_sources(self, lib: str) -> "list[str]":
+        """
+        Source files of a library of the build
+        """
+        if lib == CORE_LIB:
+            return glob.glob(os.path.join(self.core_sources, "*.cpp"))
+        raise NotImplementedError
+
+    def _core_library(self, maker: "anno.CmakeTemplate") -> str:
+        """
+        Use the prebuilt model independent core of the bindings, or compile it with the model if it is not cached.
+        """
+        if CORE_LIB in self.prebuilt:
+            return maker.add_imported_library(CORE_LIB, self.prebuilt[CORE_LIB])
+        return maker.add_core_library(CORE_LIB, self._lib_sources(CORE_LIB))
+
+    def _build_shared_libs(self, libs: "list[str]", rebuild: bool = False):
+        """
+        Build libraries that do not depend on the root model into static libraries stored in the build cache, keyed on
+        their sources and every header they include. Other root models that use identical sources (e.g. reference the
+        same generated models) link against the same libraries instead of compiling them again.
+
+        Args:
+            libs: names of the libraries to build (see :meth:`_lib_sources`)
+            rebuild: build all libraries, even if they are already in the cache
+        """
+        self.prebuilt = {}
+        if build_cache.cache_dir() is None:
+            return
+
+        includes = self._includes()
+        # MODEL names the root model; nothing outside of it depends on it
+        defines = [define for define in self.defines if not define.startswith("MODEL=")]
+        keys = {}
+        missing = []
+        for lib in libs:
+            sources = self._lib_sources(lib)
+            if len(sources) == 0:
+                continue
+            headers = build_cache.included_headers(sources, includes)
+            keys[lib] = build_cache.lib_key(
+                lib, sources, headers, defines, self.generator, self.build_profile
+            )
+            path = None if rebuild else build_cache.find_lib(keys[lib])
+            if path is None:
+                missing.append(lib)
+            else:
+                self.prebuilt[lib] = path
+
+        if len(missing) == 0:
+            return
+
+        tic = time.perf_counter()
+        deps_dir = os.path.join(self.model_paths.tmp_dir, "shared_libs")
+        maker = cmake_gen.CmakeTemplate(
+            self.model_paths.root_model_name.replace(" ", "_").replace("-", "_").lower()
+            + "_shared_libs",
+            self.build_profile,
+        )
+        cmake_text = maker.header()
+        cmake_text += maker.set_includes(includes)
+        for lib in missing:
+            if lib == CORE_LIB:
+                cmake_text += maker.add_core_library(lib, self._lib_sources(lib))
+            else:
+                cmake_text += maker.add_library(lib, self._lib_sources(lib))
+        cmake_text += maker.set_lib_props()
+        cmake_text += maker.set_archive_dirs()
+        cmake_text += maker.add_compile_defs(defines)
+        cmake_text += maker.footer()
+        os.makedirs(deps_dir, exist_ok=True)
+        self._write_if_changed(os.path.join(deps_dir, "CMakeLists.txt"), cmake_text)
+        self._build(deps_dir)
+
+        for lib in missing:
+            artifacts = [
+                file
+                for file in glob.glob(
+                    os.path.join(deps_dir, "build", "out", lib, "**", "*"), recursive=True
+                )
+                if os.path.isfile(file)
+            ]
+            if len(artifacts) != 1:
+                continue
+            path = build_cache.store_lib(keys[lib], artifacts[0], lib)
+            if path is not None:
+                self.prebuilt[lib] = path
+        self.timings["shared_libs"] = time.perf_counter() - tic
+
+    def _build(self, source_dir: "anno.Optional[str]" = None):
         """
         Cals cmake to configure and build the extension. Writes errors to the current working directory
         in a log file.
+
+        Args:
+            source_dir: directory containing the CMakeLists.txt to build. Defaults to the model's temporary directory.
         """
-        build_dir = os.path.join(self.model_paths.tmp_dir, "build")
+        source_dir = source_dir or self.model_paths.tmp_dir
+        build_dir = os.path.join(source_dir, "build")
+        if self._cached_generator(build_dir) not in (None, self.generator):
+            # cmake cannot switch the generator of an existing build directory
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+        configure = [
+            os.path.join(cmake.CMAKE_BIN_DIR, "cmake"),
+            "-S",
+            source_dir,
+            f"-DCMAKE_BUILD_TYPE={BUILD_PROFILES[self.build_profile]['build_type']}",
+            '-G',
+            self.generator,
+            "-B",
+            build_dir,
+        ]
+        ninja = find_ninja() if self.generator.startswith("Ninja") else None
+        if ninja is not None:
+            # the ninja python package does not put ninja on the PATH
+            configure.append(f"-DCMAKE_MAKE_PROGRAM={ninja}")
 
-        with Popen(
-            [
-                os.path.join(cmake.CMAKE_BIN_DIR, "cmake"),
-                "-S",
-                self.model_paths.tmp_dir,
-                "-DCMAKE_BUILD_TYPE=Release",
-                '-G',
-                self.generator,
-                "-B",
-                build_dir,
-            ],
-            stdout=PIPE,
-            stderr=PIPE,
-        ) as p:
+        tic = time.perf_counter()
+        with Popen(configure, stdout=PIPE, stderr=PIPE) as p:
             (output1, err1) = p.communicate()
             build = p.wait()
+        self.timings["configure"] = time.perf_counter() - tic
 
         if build != 0:
             now = datetime.now()
@@ -188,16 +401,24 @@ class Compiler:
                 f.write(output1.decode() if output1 else "")
                 f.write(err1.decode() if err1 else "")
             raise GenerationError(
-                err_file, os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt")
+                err_file, os.path.join(source_dir, "CMakeLists.txt")
             )
 
+        tic = time.perf_counter()
         with Popen(
-            [os.path.join(cmake.CMAKE_BIN_DIR, "cmake"), "--build", build_dir],
+            [
+                os.path.join(cmake.CMAKE_BIN_DIR, "cmake"),
+                "--build",
+                build_dir,
+                "--parallel",
+                str(self.jobs),
+            ],
             stdout=PIPE,
             stderr=PIPE,
         ) as p:
             (output2, err2) = p.communicate()
             make = p.wait()
+        self.timings["build"] = time.perf_counter() - tic
 
         if make != 0:
             now = datetime.now()
@@ -209,27 +430,62 @@ class Compiler:
                 f.write(output2.decode() if output2 else "")
                 f.write(err2.decode() if err2 else "")
 
-            raise BuildError(err_file, os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt"))
+            raise BuildError(err_file, os.path.join(source_dir, "CMakeLists.txt"))
 
     @staticmethod
-    def _replace_macros(path: str, replacements: "dict[str, str]"):
+    def _cached_generator(build_dir: str) -> "anno.Optional[str]":
         """
-        Replaces strings in a file
+        Generator an existing build directory was configured with
 
         Args:
-            path: path to file to replace strings in
+            build_dir: cmake build directory
+
+        Returns:
+            str: name of the generator, or None if the directory was never configured
+        """
+        try:
+            with open(os.path.join(build_dir, "CMakeCache.txt"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("CMAKE_GENERATOR:INTERNAL="):
+                        return line.strip().split("=", 1)[1]
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def _replace_macros(text: str, replacements: "dict[str, str]") -> str:
+        """
+        Replaces strings in the text of a file
+
+        Args:
+            text: content of the file
             replacements: dictionary of replacements
 
+        Returns:
+            str: text with every replacement applied
         """
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        for key, val in replacements.items():
+            text = text.replace(str(key), str(val))
+        return text
 
-        for i, line in enumerate(lines):
-            for key, val in replacements.items():
-                lines[i] = lines[i].replace(str(key), str(val))
+    @staticmethod
+    def _write_if_changed(path: str, text: str):
+        """
+        Write a file only if its content differs from what is on disk. This keeps the timestamp of unchanged
+        files, so the build system does not recompile them.
 
+        Args:
+            path: path to the file
+            text: new content of the file
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == text:
+                    return
+        except OSError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+            f.write(text)
 
     def _read_types_single_file(self, lines):
         define_re = re.compile(r"^#define DEFINED_TYPEDEF")
@@ -286,3 +542,58 @@ class Compiler:
             ret.append(f"{struct.name} {struct.name}_obj;")
 
         return "\n        ".join(ret)
+
+    def _data_object_headers(self) -> "list[str]":
+        """
+        Headers that declare the global data objects of the model. The first one is the root model header, which
+        the bindings always include.
+        """
+        return [
+            os.path.join(self.model_paths.root_model_path, self.model_paths.root_model_name + ".h")
+        ]
+
+    def _scan_data_objects(self) -> "list[tuple[str, list[str]]]":
+        # (header, names declared in it that no earlier header declared) for every header
+        seen = set()
+        ret = []
+        for header in self._data_object_headers():
+            with open(header, "r", encoding="utf-8") as f:
+                found, unknown = parse_data_objects(f.read())
+            for decl in unknown:
+                warnings.warn(
+                    f"{os.path.basename(header)}: could not parse `{decl}`. "
+                    "Model.snapshot will not save this object."
+                )
+            names = []
+            for name in found:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+            ret.append((header, names))
+        return ret
+
+    def get_data_objects(self):
+        """
+        Find the global (non-const) data objects declared by the root model header and the headers of referenced
+        models, such as block i/o, dwork, states, and parameters. These are saved by
+        :func:`pysimlink.Model.snapshot`. Pointers are saved as pointers, not what they point to. Declarations
+        that can't be parsed (e.g. several objects in one declaration) are skipped with a warning.
+
+        Returns:
+            str: one :code:`X(name)` entry per object, for the MODEL_DATA_OBJECTS x-macro
+        """
+        return " ".join(f"X({name})" for _, names in self._scan_data_objects() for name in names)
+
+    def get_data_headers(self):
+        """
+        Include the headers (besides the root model header) that declare a data object from
+        :func:`get_data_objects`, so the bindings can take their address.
+
+        Returns:
+            str: one :code:`#include` line per header
+        """
+        return "\n".join(
+            f'#include "{os.path.basename(header)}"'
+            for header, names in self._scan_data_objects()[1:]
+            if names
+        )
@@ -4,7 +4,7 @@ import glob
 import warnings
 
 from pysimlink.lib.dependency_graph import DepGraph
-from pysimlink.lib.cmake_gen import CmakeTemplate
+from pysimlink.lib.cmake_gen import CmakeTemplate, CORE_LIB
 from pysimlink.lib.compilers.compiler import Compiler
 from pysimlink.utils import annotation_utils as anno
 from pysimlink.utils.model_utils import sanitize_model_name
@@ -15,15 +15,30 @@ class ModelRefCompiler(Compiler):
     Compiler for a model that do use model references
     """
 
-    def __init__(self, model_paths: "anno.ModelPaths", generator: str):
-        super().__init__(model_paths, generator)
+    models: "anno.DepGraph"  ## Dependency graph of the root model and all referenced models
+
+    def __init__(
+        self,
+        model_paths: "anno.ModelPaths",
+        generator: str,
+        jobs: "anno.Optional[int]" = None,
+        build_profile: str = "release",
+    ):
+        super().__init__(model_paths, generator, jobs, build_profile)
         self.models = None
 
-    def compile(self):
-        self.clean()
+    def compile(self, clean: bool = False):
+        if clean:
+            self.clean()
         self._get_simulink_deps()
         self._build_deps_tree()
         self._gen_custom_srcs()
+        # referenced models and the shared utilities do not depend on the root model
+        self._build_shared_libs(
+            [lib for lib in self.models.dep_map if lib != self.model_paths.root_model_name]
+            + ["shared_utils", CORE_LIB],
+            rebuild=clean,
+        )
         self._gen_cmake()
         self.gather_types()
         self._build()
@@ -109,42 +124,68 @@ class ModelRefCompiler(Compiler):
             [os.path.basename(f).split(".")[0] for f in _shared_utils]
         )
 
-    def _gen_cmake(self):
+    def _data_object_headers(self) -> "list[str]":
+        # single instance referenced models keep their data in globals of their own
+        headers = super()._data_object_headers()
+        for lib in self.models.dep_map:
+            if lib == self.model_paths.root_model_name:
+                continue
+            for suffix in (".h", "_private.h"):
+                header = os.path.join(self.model_paths.slprj_dir, lib, lib + suffix)
+                if os.path.exists(header):
+                    headers.append(header)
+        return headers
+
+    def _includes(self) -> "list[str]":
         includes = [self.custom_includes]
         for dir_name in os.walk(self.model_paths.root_dir, followlinks=False):
             for file in dir_name[2]:
                 if ".h" in file:
                     includes.append(dir_name[0])
                     break
+        return includes
+
+    def _lib_sources(self, lib: str) -> "list[str]":
+        if lib == "shared_utils":
+            return self.simulink_deps_src
+        if lib == self.model_paths.root_model_name:
+            return glob.glob(self.model_paths.root_model_path + "/*.c")
+        if lib == CORE_LIB:
+            return super()._lib_sources(lib)
+        return glob.glob(os.path.join(self.model_paths.slprj_dir, lib) + "/*.c")
 
+    def _gen_cmake(self):
         maker = CmakeTemplate(
-            self.model_paths.root_model_name.replace(" ", "_").replace("-", "_").lower()
+            self.model_paths.root_model_name.replace(" ", "_").replace("-", "_").lower(),
+            self.build_profile,
         )
         cmake_text = maker.header()
-        cmake_text += maker.set_includes(includes)
+        cmake_text += maker.set_includes(self._includes())
 
         for lib in self.models.dep_map:
-            if lib == self.model_paths.root_model_name:
-                files = glob.glob(self.model_paths.root_model_path + "/*.c")
+            if lib in self.prebuilt:
+                cmake_text += maker.add_imported_library(lib, self.prebuilt[lib])
             else:
-                files = glob.glob(os.path.join(self.model_paths.slprj_dir, lib) + "/*.c")
-            cmake_text += maker.add_library(lib, files)
+                cmake_text += maker.add_library(lib, self._lib_sources(lib))
 
-        cmake_text += maker.add_library("shared_utils", self.simulink_deps_src)
-        ## the custom code depends on the root _model.
-        self.models.add_dependency(self.model_paths.root_model_name, ["shared_utils"])
+        if "shared_utils" in self.prebuilt:
+            cmake_text += maker.add_imported_library("shared_utils", self.prebuilt["shared_utils"])
+        else:
+            cmake_text += maker.add_library("shared_utils", self.simulink_deps_src)
+        ## every _model can use the shared utilities, so they have to come after all of them on the link line
+        for lib in list(self.models.dep_map):
+            self.models.add_dependency(lib, ["shared_utils"])
 
+        cmake_text += self._core_library(maker)
         cmake_text += maker.add_custom_libs(self.custom_sources)
         cmake_text += maker.add_private_link(self.model_paths.root_model_name)
+        cmake_text += maker.add_private_link(CORE_LIB)
         cmake_text += maker.set_lib_props()
         cmake_text += maker.add_link_libs(self.models.dep_map)
         cmake_text += maker.add_compile_defs(self.defines)
         cmake_text += maker.footer()
 
-        with open(
-            os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt"), "w", encoding="utf-8"
-        ) as f:
-            f.write(cmake_text)
+        self._write_if_changed(os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt"), cmake_text)
 
     @property
     def _module_name(self):
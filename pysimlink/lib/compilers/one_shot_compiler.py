@@ -2,6 +2,7 @@ import glob
 import os
 
 from pysimlink.lib import cmake_gen
+from pysimlink.lib.cmake_gen import CORE_LIB
 from pysimlink.lib.compilers.compiler import Compiler
 from pysimlink.utils import annotation_utils as anno
 
@@ -11,16 +12,24 @@ class NoRefCompiler(Compiler):
     Compiler for a model that does not use model references
     """
 
-    def __init__(self, model_paths: "anno.ModelPaths", generator: str):
-        super().__init__(model_paths, generator)
+    def __init__(
+        self,
+        model_paths: "anno.ModelPaths",
+        generator: str,
+        jobs: "anno.Optional[int]" = None,
+        build_profile: str = "release",
+    ):
+        super().__init__(model_paths, generator, jobs, build_profile)
         self.model_srcs = []
         self.model_incs = []
 
-    def compile(self):
-        self.clean()
+    def compile(self, clean: bool = False):
+        if clean:
+            self.clean()
         self._get_simulink_deps()
         self._gen_custom_srcs()
         self._gen_model_deps()
+        self._build_shared_libs([CORE_LIB], rebuild=clean)
         self._gen_cmake()
         self._build()
 
@@ -33,36 +42,39 @@ class NoRefCompiler(Compiler):
                     self.model_incs.append(dir_name[0])
                     break
 
-    def _gen_cmake(self):
+    def _includes(self) -> "list[str]":
         includes = [self.custom_includes] + self.model_incs
         for dir_name in os.walk(self.model_paths.simulink_native, followlinks=False):
             for file in dir_name[2]:
                 if ".h" in file:
                     includes.append(dir_name[0])
                     break
+        return includes
+
+    def _gen_cmake(self):
         maker = cmake_gen.CmakeTemplate(
-            self.model_paths.root_model_name.replace(" ", "_").replace("-", "_").lower()
+            self.model_paths.root_model_name.replace(" ", "_").replace("-", "_").lower(),
+            self.build_profile,
         )
         cmake_text = maker.header()
-        cmake_text += maker.set_includes(includes)
+        cmake_text += maker.set_includes(self._includes())
 
         cmake_text += maker.add_library(self.model_paths.root_model_name, self.model_srcs)
         cmake_text += maker.add_library("shared_utils", self.simulink_deps_src)
+        cmake_text += self._core_library(maker)
         cmake_text += maker.add_custom_libs(self.custom_sources)
         cmake_text += maker.set_lib_props()
 
         dep_map = {self.model_paths.root_model_name: ["shared_utils"]}
         cmake_text += maker.add_link_libs(dep_map)
         cmake_text += maker.add_private_link(self.model_paths.root_model_name)
+        cmake_text += maker.add_private_link(CORE_LIB)
         cmake_text += maker.set_lib_props()
         cmake_text += maker.add_compile_defs(self.defines)
 
         cmake_text += maker.footer()
 
-        with open(
-            os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt"), "w", encoding="utf-8"
-        ) as f:
-            f.write(cmake_text)
+        self._write_if_changed(os.path.join(self.model_paths.tmp_dir, "CMakeLists.txt"), cmake_text)
 
     def gather_types(self):
         types_files = glob.glob(self.model_paths.root_model_path + "/*_types.h")
@@ -0,0 +1,79 @@
+"""
+Compile models in a pool of build processes while the caller keeps going.
+
+Each model is compiled (if needed) in a separate process with :meth:`pysimlink.Model.build`, then imported in the
+calling process once its build finished. The extension is only ever imported by the caller. Models are returned as
+:class:`concurrent.futures.Future` objects; use :func:`asyncio.wrap_future` to await them from a coroutine.
+
+Build processes are started with the :code:`spawn` method, so scripts using these functions need an
+:code:`if __name__ == "__main__":` guard.
+"""
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from pysimlink.lib.model import Model
+from pysimlink.utils import annotation_utils as anno
+
+
+def _build(model_spec: dict):
+    # the extension is only imported by the caller; importing it here as well would initialize it for nothing
+    Model.build(**model_spec)
+
+
+def _load(build: "Future", model_spec: dict) -> "anno.Model":
+    build.result()
+    # the build is done (and any forced rebuild with it), so this imports the extension from its manifest
+    return Model(**dict(model_spec, force_rebuild=False))
+
+
+def _with_jobs(model_spec: dict, workers: int) -> dict:
+    # don't run every build on all cpus at the same time
+    if model_spec.get("jobs") is None:
+        model_spec = dict(model_spec, jobs=max(1, (os.cpu_count() or 1) // workers))
+    return model_spec
+
+
+def load_async(**model_spec) -> "Future":
+    """
+    Compile and load a model without blocking. See :meth:`pysimlink.Model.load_async`.
+    """
+    # a pool of one build process that exits once the model is built
+    return compile_many([model_spec], workers=1)[0]
+
+
+def compile_many(model_specs: "list[dict]", workers: "anno.Optional[int]" = None) -> "list[Future]":
+    """
+    Compile several models at the same time in a pool of build processes.
+
+    Args:
+        model_specs: one dictionary of keyword arguments for :class:`pysimlink.Model` per model (at least
+            :code:`model_name` and :code:`path_to_model`). Every model needs its own :code:`tmp_dir` (the default
+            already is one per model name).
+        workers: Number of models compiled at the same time. Defaults to the number of cpus. Unless a spec sets
+            :code:`jobs`, the cpus are split between the builds.
+
+    Returns:
+        list[concurrent.futures.Future]: one future per spec, in the same order, that resolves to the loaded
+        :class:`pysimlink.Model` (or raises the :class:`pysimlink.BuildError` of its build)
+
+    Raises:
+        ValueError: If workers is <= 0
+    """
+    if workers is not None and workers <= 0:
+        raise ValueError("workers must be > 0")
+    workers = min(workers or os.cpu_count() or 1, max(1, len(model_specs)))
+
+    builder = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    loader = ThreadPoolExecutor(
+        max_workers=max(1, len(model_specs)), thread_name_prefix="pysimlink_loader"
+    )
+    builds = [builder.submit(_build, _with_jobs(spec, workers)) for spec in model_specs]
+    futures = [loader.submit(_load, build, spec) for build, spec in zip(builds, model_specs)]
+
+    # both pools finish the submitted work, then release their processes and threads
+    builder.shutdown(wait=False)
+    loader.shutdown(wait=False)
+    return futures
@@ -0,0 +1,212 @@
+"""
+Warm start manifest of a built model.
+
+Once a model is built (or fetched from the build cache), the resolved :class:`ModelPaths` and the
+path of the extension are written to :file:`manifest.json` in the model's build directory. A later
+:class:`pysimlink.Model` with the same arguments imports the extension straight from that file, without extracting
+the zip, walking the generated code, or adding to :code:`sys.path`.
+
+The manifest is only used while the files it was written from are unchanged. The zip file (or every file of the
+model directory that goes into the build key, see :mod:`pysimlink.lib.build_cache`) and pysimlink's c++ sources
+are compared by size and modification time. Directories are searched again, so added files are noticed too.
+"""
+import glob
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+
+from pysimlink.lib import build_cache
+from pysimlink.lib.model_paths import ModelPaths
+from pysimlink.utils import annotation_utils as anno
+
+MANIFEST_FILE = "manifest.json"
+## Bumped when the contents of the manifest change
+FORMAT = 2
+
+_pkg_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _stamp(path: str) -> "list[int]":
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _stamps(path_to_model: str, model_paths: "anno.ModelPaths") -> "dict[str, list[int]]":
+    if os.path.splitext(path_to_model)[-1] == ".zip":
+        files = [path_to_model]
+    else:
+        # the same files as the build key: referenced models, shared utilities, and simulink's sources included
+        files = build_cache.source_files(
+            model_paths.root_dir, build_cache.SOURCE_EXTENSIONS, model_paths.tmp_dir
+        )
+    files += glob.glob(os.path.join(_pkg_dir, "c_files", "*", "*"))
+    return {os.path.abspath(file): _stamp(file) for file in files}
+
+
+def _root_names(model_name: str, compile_type: str, suffix: str) -> "list[str]":
+    # names ModelPaths can resolve the model_name argument to, in the order it tries them
+    names = [model_name]
+    stripped = model_name.split("_" + compile_type + "_" + suffix)[0]
+    if stripped != model_name:
+        names.append(stripped)
+    return names
+
+
+def _request(
+    path_to_model: str, root_name: str, compile_type: str, suffix: str, build_profile: str
+) -> dict:
+    # the arguments of Model that select the build, with the model name resolved like ModelPaths does
+    return {
+        "format": FORMAT,
+        "source": os.path.abspath(path_to_model),
+        "model_name": root_name,
+        "compile_type": compile_type,
+        "suffix": suffix,
+        "build_profile": build_profile,
+    }
+
+
+def read(
+        path_to_model: str,
+        model_name: str,
+        compile_type: str,
+        suffix: str,
+        tmp_dir: "anno.Optional[str]",
+        generator: "anno.Optional[str]",
+        build_profile: str,
+) -> "anno.Optional[dict]":
+    """
+    Find the manifest of a model built with the same arguments
+
+    Args:
+        path_to_model: :code:`path_to_model` argument of the model
+        model_name: :code:`model_name` argument of the model
+        compile_type: :code:`compile_type` argument of the model
+        suffix: :code:`suffix` argument of the model
+        tmp_dir: :code:`tmp_dir` argument of the model
+        generator: cmake generator requested for the model. None accepts the build of any generator.
+        build_profile: :code:`build_profile` argument of the model
+
+    Returns:
+        dict: the manifest, or None if there is none or it is out of date
+    """
+    for root_name in _root_names(model_name, compile_type, suffix):
+        try:
+            with open(
+                os.path.join(ModelPaths.build_dir(root_name, tmp_dir), MANIFEST_FILE),
+                "r",
+                encoding="utf-8",
+            ) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        request = _request(path_to_model, root_name, compile_type, suffix, build_profile)
+        if any(manifest.get(key) != value for key, value in request.items()):
+            continue
+        if generator is not None and manifest["generator"] != generator:
+            continue
+        try:
+            if (
+                _stamps(path_to_model, ModelPaths.from_dict(manifest["paths"]))
+                != manifest["stamps"]
+            ):
+                continue
+        except OSError:
+            continue
+        if os.path.isfile(manifest["extension"]):
+            return manifest
+    return None
+
+
+def write(
+        path_to_model: str,
+        model_paths: "anno.ModelPaths",
+        compiler: "anno.Compiler",
+        extension: str,
+):
+    """
+    Record a model that was built. Errors are ignored; the manifest is only an optimization.
+
+    Args:
+        path_to_model: :code:`path_to_model` argument of the model
+        model_paths: resolved paths of the model
+        compiler: compiler of the model
+        extension: path to the built extension
+    """
+    manifest = _request(
+        path_to_model,
+        model_paths.root_model_name,
+        model_paths.compile_type,
+        model_paths.suffix,
+        compiler.build_profile,
+    )
+    try:
+        manifest.update(
+            generator=compiler.generator,
+            extension=os.path.abspath(extension),
+            paths=model_paths.to_dict(),
+            stamps=_stamps(path_to_model, model_paths),
+        )
+        path = os.path.join(model_paths.tmp_dir, MANIFEST_FILE)
+        tmp = f"{path}.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def remove(tmp_dir: str):
+    """
+    Remove the manifest of a model before it is rebuilt
+
+    Args:
+        tmp_dir: build directory of the model
+    """
+    try:
+        os.remove(os.path.join(tmp_dir, MANIFEST_FILE))
+    except OSError:
+        pass
+
+
+def find_extension(library_dir: str, module_name: str) -> "anno.Optional[str]":
+    """
+    Find the extension importable from a directory
+
+    Args:
+        library_dir: directory the extension was built into
+        module_name: name of the extension module
+
+    Returns:
+        str: path to the extension, or None if the directory has no extension for this python
+    """
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        path = os.path.join(library_dir, module_name + suffix)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    return None
+
+
+def import_extension(module_name: str, extension: str) -> "anno.ModuleType":
+    """
+    Import an extension from its file, without searching :code:`sys.path`
+
+    Args:
+        module_name: name of the extension module
+        extension: path to the extension
+
+    Returns:
+        the imported module
+    """
+    module = sys.modules.get(module_name)
+    if module is not None and os.path.abspath(getattr(module, "__file__", "")) == extension:
+        return module
+
+    spec = importlib.util.spec_from_file_location(module_name, extension)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules.setdefault(module_name, module)
+    return module
@@ -8,27 +8,51 @@ if os.name != "nt":
     from fcntl import lockf, LOCK_EX, LOCK_UN
 else:
     import msvcrt
-# import tempfile
 
 from pysimlink.lib.model_paths import ModelPaths
+from pysimlink.lib import manifest
+from pysimlink.lib.cmake_gen import BUILD_PROFILES
 from pysimlink.utils import annotation_utils as anno
-from pysimlink.utils.model_utils import mt_rebuild_check, sanitize_model_name, cast_type
-from pysimlink.lib.model_types import DataType, ModelInfo
+from pysimlink.utils.model_utils import (
+    mt_rebuild_check,
+    sanitize_model_name,
+    cast_type,
+    cast_rows,
+    default_generator,
+)
+from pysimlink.lib.model_types import (
+    DataType,
+    ModelInfo,
+    Handle,
+    Catalog,
+    ModelParam,
+    BlockParam,
+    Signal,
+)
 from pysimlink.lib.spinner import open_spinner
 import pickle
 import time
 import importlib
+import weakref
 
 
 class Model:
     """
     Instance of the simulink mode. This class compiles and imports
-    the model once built. You can have multiple instances of the same
-    model in one python runtime.
+    the model once built.
+
+    Generated code keeps the model state in global variables, so every :class:`Model` of the same
+    model in one python runtime shares a single state. Use :class:`pysimlink.ModelPool` for
+    independent instances.
+
+    Models can be used from several threads. :func:`step`, :func:`reset`, :func:`run`, :func:`get_signals`,
+    :func:`snapshot`, and :func:`restore` release the GIL while they run, and a lock shared by all
+    :class:`Model` objects of one model makes calls from other threads wait for them. Views returned from
+    :func:`signal_view` and :func:`param_view` are not protected by this lock.
     """
 
     _model_paths: "anno.ModelPaths"
-    _compiler: "anno.Compiler"
+    _compiler: "anno.Optional[anno.Compiler]"  ## None if loaded from the warm start manifest
 
     def __init__(  # pylint: disable=R0913
             self,
@@ -40,6 +64,8 @@ class Model:
             force_rebuild: bool = False,
             skip_compile: bool = False,
             generator: str = None,
+            jobs: "anno.Optional[int]" = None,
+            build_profile: str = "release",
     ):
         """
         Args:
@@ -49,8 +75,17 @@ class Model:
             suffix (str): Simulink Coder folders are almost always suffixed with rtw (real time workshop).
             tmp_dir (Optional[str]): Path to the directory that will be used to build the model. Defaults to :file:`__pycache__/{model_name}`
             force_rebuild (bool): force pysimlink to recompile the model from the source located at :code:`path_to_model`. Removes all build artifacts.
+                Otherwise, the model is only compiled when its sources changed and no identical build is in the shared
+                build cache (:code:`$PYSIMLINK_CACHE_DIR`, defaults to :file:`~/.cache/pysimlink`). Such a rebuild reuses
+                the previous build directory and only recompiles the files that changed.
             skip_compile (bool): skip compilation of the model. This is useful if you have already compiled the model and just want to import it.
-            generator (str): Type of generator to use for cmake. defaults to :code:`NMake Makefiles` on windows and :code:`Unix Makefiles` on mac/linux.
+            generator (str): Type of generator to use for cmake. defaults to :code:`Ninja` when ninja is installed (e.g. :code:`pip install ninja`),
+                otherwise :code:`NMake Makefiles` on windows and :code:`Unix Makefiles` on mac/linux.
+            jobs (Optional[int]): Number of parallel compile jobs. Defaults to the number of cpus.
+            build_profile (str): Compiler settings preset. One of :code:`fast-compile` (:code:`-O1`, no link time
+                optimization), :code:`release` (default), :code:`max-perf` (:code:`-O3 -march=native`, link time
+                optimization across the model and the bindings, unity build), or :code:`debug`. Models built with
+                :code:`max-perf` only run on cpus like the one they were built on.
 
 
         Attributes:
@@ -58,48 +93,190 @@ class Model:
                 likely the same among all models, but could change across MATLAB versions.
         """
 
-        self._model_paths = ModelPaths(path_to_model, model_name, compile_type, suffix, tmp_dir, skip_compile)
-
-        if generator is None:
-            if os.name == "nt":
-                generator = "NMake Makefiles"
-            else:
-                generator = "Unix Makefiles"
-
-        self._compiler = self._model_paths.compiler_factory(generator)
-
-        self._lock()
-        # Check need to compile
-        if (
-                (mt_rebuild_check(self._model_paths, force_rebuild)
-                 or self._compiler.needs_to_compile()) and not skip_compile
-        ):
-            # Need to compile
-            with open_spinner("Compiling"):
-                self._compiler.compile()
-            with open(os.path.join(self._model_paths.tmp_dir, "compile_info.pkl"), "wb") as f:
-                obj = {"pid": os.getpid(), "parent": os.getppid(), "time": time.time()}
-                pickle.dump(obj, f)
-        self._unlock()
+        Model._check_build_args(jobs, build_profile)
+        # a model that was already built and imported is loaded straight from its extension
+        if not force_rebuild:
+            warm = manifest.read(
+                path_to_model, model_name, compile_type, suffix, tmp_dir, generator, build_profile
+            )
+            if warm is not None:
+                self._model_paths = ModelPaths.from_dict(warm["paths"])
+                self._compiler = None
+                self.path_dirs = []
+                self._load_extension(
+                    manifest.import_extension(self._model_paths.module_name, warm["extension"])
+                )
+                return
+
+        self._model_paths, self._compiler = Model._compile(
+            model_name,
+            path_to_model,
+            compile_type,
+            suffix,
+            tmp_dir,
+            force_rebuild,
+            skip_compile,
+            generator,
+            jobs,
+            build_profile,
+        )
 
         self.path_dirs = []
+        extension = None
         for dir, _, _ in os.walk(
                 os.path.join(self._model_paths.tmp_dir, "build", "out", "library")
         ):
             sys.path.append(dir)
             self.path_dirs.append(dir)
+            extension = extension or manifest.find_extension(dir, self._model_paths.module_name)
+
+        self._load_extension(importlib.import_module(self._model_paths.module_name))
+        if extension is not None:
+            manifest.write(path_to_model, self._model_paths, self._compiler, extension)
+
+    @staticmethod
+    def build(  # pylint: disable=R0913
+            model_name: str,
+            path_to_model: str,
+            compile_type: str = "grt",
+            suffix: str = "rtw",
+            tmp_dir: "anno.Optional[str]" = None,
+            force_rebuild: bool = False,
+            skip_compile: bool = False,
+            generator: str = None,
+            jobs: "anno.Optional[int]" = None,
+            build_profile: str = "release",
+    ) -> "anno.Optional[str]":
+        """
+        Compile a model (if needed) without importing it, e.g. in a build process. A :class:`Model` created with the
+        same arguments afterwards imports the extension straight from its warm start manifest.
+
+        Takes the same arguments as :meth:`__init__`.
+
+        Returns:
+            str: path to the built extension, or None if there is none (:code:`skip_compile` on a model that was
+            never built)
+        """
+        Model._check_build_args(jobs, build_profile)
+        if not force_rebuild:
+            warm = manifest.read(
+                path_to_model, model_name, compile_type, suffix, tmp_dir, generator, build_profile
+            )
+            if warm is not None:
+                return warm["extension"]
+
+        model_paths, compiler = Model._compile(
+            model_name,
+            path_to_model,
+            compile_type,
+            suffix,
+            tmp_dir,
+            force_rebuild,
+            skip_compile,
+            generator,
+            jobs,
+            build_profile,
+        )
+        extension = manifest.find_extension(compiler.library_dir, model_paths.module_name)
+        if extension is not None:
+            manifest.write(path_to_model, model_paths, compiler, extension)
+        return extension
+
+    @staticmethod
+    def _check_build_args(jobs: "anno.Optional[int]", build_profile: str):
+        if jobs is not None and jobs <= 0:
+            raise ValueError("jobs must be > 0")
+        if build_profile not in BUILD_PROFILES:
+            raise ValueError(
+                f"Unknown build_profile '{build_profile}'. Options are {', '.join(BUILD_PROFILES)}"
+            )
+
+    @staticmethod
+    def _compile(  # pylint: disable=R0913
+            model_name: str,
+            path_to_model: str,
+            compile_type: str,
+            suffix: str,
+            tmp_dir: "anno.Optional[str]",
+            force_rebuild: bool,
+            skip_compile: bool,
+            generator: "anno.Optional[str]",
+            jobs: "anno.Optional[int]",
+            build_profile: str,
+    ) -> "tuple[anno.ModelPaths, anno.Compiler]":
+        # resolve the paths of the model and compile it if it changed and is not in the build cache
+        model_paths = ModelPaths(path_to_model, model_name, compile_type, suffix, tmp_dir)
+
+        if generator is None:
+            generator = default_generator()
+        compiler = model_paths.compiler_factory(generator, jobs, build_profile)
+
+        Model._lock(model_paths)
+        # Check need to compile
+        forced = not skip_compile and mt_rebuild_check(model_paths, force_rebuild)
+        # a zip file that was already built is not extracted again
+        if not skip_compile and (forced or not compiler.fetch_archive()):
+            model_paths.extract(force=forced)
+            if forced or compiler.needs_to_compile():
+                manifest.remove(model_paths.tmp_dir)
+                # An identical build may already be in the shared cache
+                if forced or not compiler.fetch_cached():
+                    with open_spinner("Compiling"):
+                        compiler.compile(clean=forced)
+                    compiler.store_cached()
+                    with open(os.path.join(model_paths.tmp_dir, "compile_info.pkl"), "wb") as f:
+                        obj = {"pid": os.getpid(), "parent": os.getppid(), "time": time.time()}
+                        pickle.dump(obj, f)
+            else:
+                # built before the zip file's build was recorded (or the record was lost)
+                compiler.store_archive()
+        Model._unlock(model_paths)
+        return model_paths, compiler
+
+    @staticmethod
+    def load_async(**model_spec) -> "Future":
+        """
+        Compile and load a model in a background build process without blocking the caller.
+
+        Args:
+            **model_spec: keyword arguments of :meth:`__init__`
+
+        Returns:
+            concurrent.futures.Future: future that resolves to the loaded :class:`Model`. Use
+            :code:`await asyncio.wrap_future(future)` in a coroutine.
+
+        See :func:`pysimlink.compile_many` to limit the number of builds running at the same time.
+        """
+        from pysimlink.lib import loader  # pylint: disable=C0415
 
-        self.module = importlib.import_module(self._model_paths.module_name)
+        return loader.load_async(**model_spec)
+
+    def _load_extension(self, module):
+        self.module = module
         model_class = getattr(
                 self.module, sanitize_model_name(self._model_paths.root_model_name) + "_Model"
         )
 
         self._model = model_class(self._model_paths.root_model_name)
+        self._handles = {}
+        self._views = []
 
         self.orientations = getattr(
                 self.module,
                 sanitize_model_name(self._model_paths.root_model_name) + "_rtwCAPI_Orientation",
         )
+        self._kinds = getattr(
+            self.module, sanitize_model_name(self._model_paths.root_model_name) + "_HandleKind"
+        )
+
+    def _replica(self, module) -> "Model":
+        """Create a model that shares this build but runs from another copy of the extension"""
+        ret = Model.__new__(Model)
+        ret._model_paths = self._model_paths
+        ret._compiler = self._compiler
+        ret.path_dirs = []
+        ret._load_extension(module)
+        return ret
 
     def __del__(self):
         if sys.path is not None and hasattr(self, "path_dirs"):
@@ -115,8 +292,9 @@ class Model:
         """
         return int(self.tFinal / self.step_size)
 
-    def _lock(self):
-        f = open(os.path.join(self._model_paths.tmp_dir, self._model_paths.root_model_name + ".lock"), "w")
+    @staticmethod
+    def _lock(model_paths: "anno.ModelPaths"):
+        f = open(os.path.join(model_paths.tmp_dir, model_paths.root_model_name + ".lock"), "w")
         if os.name == "nt":
             rv = msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
         else:
@@ -124,8 +302,9 @@ class Model:
         f.write(str(os.getpid()))
         f.close()
 
-    def _unlock(self):
-        f = open(os.path.join(self._model_paths.tmp_dir, self._model_paths.root_model_name + ".lock"), "w")
+    @staticmethod
+    def _unlock(model_paths: "anno.ModelPaths"):
+        f = open(os.path.join(model_paths.tmp_dir, model_paths.root_model_name + ".lock"), "w")
         if os.name == "nt":
             rv = msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
         else:
@@ -138,16 +317,97 @@ class Model:
 
         See :func:`pysimlink.print_all_params` for iterating and printing the contents of this object
 
+        The signals and parameters are :class:`pysimlink.types.Catalog` objects that read each entry from the model
+        when it is first accessed, so this is cheap even for very large models. Use
+        :func:`pysimlink.types.Catalog.columns` to get the names, data types, and dimensions of all entries as arrays.
+
         Returns:
             list[:class:`pysimlink.types.ModelInfo`]: List of model info, one for each model (if reference models present). One ModelInfo if no reference models
         """
-        return list(map(ModelInfo, self._model.get_params()))
+        return [
+            ModelInfo(
+                model_name,
+                Catalog(self._model, model_name, self._kinds.model_param, ModelParam),
+                Catalog(self._model, model_name, self._kinds.block_param, BlockParam),
+                Catalog(self._model, model_name, self._kinds.signal, Signal),
+            )
+            for model_name in self._model.get_models()
+        ]
 
     def reset(self):
         """
         Reset the simulink model. This clears all signal values and reinstantiates the model.
+
+        Views returned from :func:`signal_view` and :func:`param_view` stay valid as long as the model keeps its
+        storage at the same address. If it does not, the stale views are made read-only and a
+        :code:`RuntimeWarning` is raised; create new views after the reset.
         """
         self._model.reset()
+        self._check_views()
+
+    def snapshot(self, out: "anno.Optional[np.ndarray]" = None) -> "np.ndarray":
+        """
+        Save the complete state of the model and its referenced models: block i/o, dwork, continuous and
+        discrete states, parameters, and timing. Restore it with :func:`restore` to continue the simulation from this point.
+
+        Args:
+            out: Optional c contiguous uint8 array of :code:`snapshot_size` bytes to write into. Reusing one buffer
+                avoids an allocation per snapshot.
+
+        Returns:
+            np.ndarray: uint8 array holding the snapshot. This is :code:`out` if it was provided.
+
+        Raises:
+            RuntimeError: If the model has not been reset or :code:`out` has the wrong size or type
+        """
+        if out is None:
+            out = np.empty(self._model.snapshot_size(), dtype=np.uint8)
+        self._model.snapshot(out)
+        return out
+
+    @property
+    def snapshot_size(self) -> int:
+        """
+        Size of a snapshot of this model
+
+        Returns:
+            int: Number of bytes returned by :func:`snapshot`
+        """
+        return self._model.snapshot_size()
+
+    def restore(self, blob: "np.ndarray"):
+        """
+        Restore the state saved by :func:`snapshot`. The snapshot must come from this model object (snapshots
+        hold raw memory, so they cannot be moved to another process or :class:`pysimlink.ModelPool` slot).
+
+        Handles and views stay valid. Data logged to MAT-files is not part of the snapshot.
+
+        Args:
+            blob: array returned from :func:`snapshot`
+
+        Raises:
+            RuntimeError: If the snapshot was taken from a different model
+        """
+        self._model.restore(blob)
+
+    def _check_views(self):
+        alive = []
+        for ref, handle in self._views:
+            view = ref()
+            if view is None:
+                continue
+            address = self._model.handle_address(handle._handle)  # pylint: disable=W0212
+            if view.ctypes.data != address:
+                view.flags.writeable = False
+                warnings.warn(
+                    f"View of ({handle.block_path}, {handle.name}) no longer aliases model memory "
+                    "after reset. Create a new view.",
+                    RuntimeWarning,
+                    stacklevel=3,
+                )
+                continue
+            alive.append((ref, handle))
+        self._views = alive
 
     def step(self, iterations: int = 1):
         """
@@ -164,6 +424,98 @@ class Model:
         """
         self._model.step(iterations)
 
+    def run(
+            self,
+            steps: int,
+            record: "anno.Optional[list]" = None,
+            decimation: int = 1,
+            out: "anno.Optional[np.ndarray]" = None,
+            inputs: "anno.Optional[dict]" = None,
+    ) -> "anno.Optional[np.ndarray]":
+        """
+        Step the model :code:`steps` times in compiled code, optionally driving inputs and recording signals.
+
+        Args:
+            steps: Number of timesteps to run
+            record: list of signals to record. Accepts the same entries as :func:`get_signals`.
+            decimation: Record every :code:`decimation`-th step. Steps past the last full multiple of
+                :code:`decimation` are run but not recorded.
+            out: Optional c contiguous float64 array of shape :code:`(steps // decimation, n_values)` to record into
+            inputs: Optional dictionary mapping a parameter or root inport to an array with one row per step.
+                Row :code:`t` is written before step :code:`t`. Keys are a :class:`pysimlink.types.Handle`
+                (see :func:`root_input_handle`), the name of a model parameter, or a tuple of
+                :code:`(block_path, param[, model_name])` for a block parameter.
+
+        Returns:
+            np.ndarray: Array of shape :code:`(steps // decimation, n_values)` where each row holds the flattened
+            values of all recorded signals (see :func:`get_signals`). None if :code:`record` is None.
+
+        Raises:
+            ValueError: If steps or decimation is <= 0, or an input has fewer than :code:`steps` rows
+            RuntimeError: If the model encounters an error (see :func:`step`). The :code:`steps` attribute of the
+                error is the number of steps completed before it; the rows recorded for them are filled.
+        """
+        if steps <= 0:
+            raise ValueError("steps must be > 0")
+        if decimation <= 0:
+            raise ValueError("decimation must be > 0")
+
+        handles = self._signal_handles(record or [])
+        ret = out
+        if ret is None:
+            width = sum(handle.size for handle in handles)
+            ret = np.empty((steps // decimation, width), dtype=np.float64)
+
+        input_handles = []
+        input_values = []
+        for key, values in (inputs or {}).items():
+            handle = self._input_handle(key)
+            input_handles.append(handle._handle)  # pylint: disable=W0212
+            input_values.append(cast_rows(values, handle.data_type, self.orientations, steps))
+
+        try:
+            self._model.run(
+                steps,
+                [handle._handle for handle in handles],  # pylint: disable=W0212
+                decimation,
+                ret,
+                input_handles,
+                input_values,
+            )
+        except RuntimeError as e:
+            e.steps = self._model.steps_run()
+            raise
+        return ret if record is not None else None
+
+    def recorder(
+            self,
+            path: str,
+            signals: list,
+            decimation: int = 1,
+            chunk_rows: int = 4096,
+    ) -> "anno.Recorder":
+        """
+        Record signals to a file while the model runs, for simulations too long to keep their traces in memory.
+        Step the model with :func:`pysimlink.recorder.Recorder.run`.
+
+        Args:
+            path: file to write the recording to. Overwritten if it exists.
+            signals: list of signals to record. Accepts the same entries as :func:`get_signals`.
+            decimation: Record every :code:`decimation`-th step
+            chunk_rows: Number of rows buffered in memory before they are handed to the writer thread
+
+        Returns:
+            :class:`pysimlink.recorder.Recorder` writing to :code:`path`. Close it (or use it as a context manager)
+            to write the last rows.
+
+        Raises:
+            ValueError: If decimation or chunk_rows is <= 0
+            RuntimeError: If a signal is a bus (struct) signal
+        """
+        from pysimlink.lib.recorder import Recorder  # pylint: disable=C0415
+
+        return Recorder(self, path, signals, decimation, chunk_rows)
+
     @property
     def tFinal(self) -> float:
         """
@@ -174,6 +526,16 @@ class Model:
         """
         return self._model.tFinal()
 
+    @property
+    def time(self) -> float:
+        """
+        Get the current simulation time of the model.
+
+        Returns:
+            float: time of the last completed step (seconds from zero).
+        """
+        return self._model.time()
+
     @property
     def step_size(self) -> float:
         """
@@ -184,6 +546,29 @@ class Model:
         """
         return self._model.step_size()
 
+    @property
+    def index_build_time(self) -> float:
+        """
+        Time spent building the signal and parameter name index during the last :meth:`reset`.
+
+        Returns:
+            float: build time in seconds.
+        """
+        return self._model.index_build_time()
+
+    @property
+    def build_timings(self) -> "dict[str, float]":
+        """
+        Time spent in each phase of compiling the model, if it was compiled when this model was created.
+
+        Returns:
+            dict[str, float]: duration in seconds of the cmake :code:`configure` and :code:`build` phases. Empty if
+            the model was not compiled (already built, fetched from the build cache, or :code:`skip_compile`).
+        """
+        if self._compiler is None:
+            return {}
+        return dict(self._compiler.timings)
+
     def set_tFinal(self, tFinal: float):
         """
         Change the final timestep of the model
@@ -203,7 +588,8 @@ class Model:
         Get the value of a signal
 
         Args:
-            block_path: Path to the originating block
+            block_path: Path to the originating block *or* a :class:`pysimlink.types.Handle` returned from
+                :func:`signal_handle`
             model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model
                 references (using :code:`None` will retrieve from the root model).
             sig_name: Name of the signal
@@ -211,18 +597,235 @@ class Model:
         Returns:
             Value of the signal at the current timestep
         """
+        if isinstance(block_path, Handle):
+            return self.read(block_path)
+
+        return self.read(self._cached_signal_handle(block_path, model_name, sig_name))
+
+    def _cached_signal_handle(self, block_path, model_name=None, sig_name="") -> "anno.Handle":
+        if isinstance(block_path, Handle):
+            return block_path
         model_name = self._model_paths.root_model_name if model_name is None else model_name
 
-        sig_type = self._model.desc_signal(model_name, block_path, sig_name)
-        if sig_type.cDataType == "struct":
-            data = self._model.get_signal_union(model_name, block_path, sig_name)
-            return getattr(data, sig_type.mwType)
-        else:
-            data: "np.ndarray" = self._model.get_signal_arr(model_name, block_path, sig_name)
-            if data.size == 1:
-                return data.item()
+        key = ("signal", model_name, block_path, sig_name)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self.signal_handle(block_path, model_name, sig_name)
+            self._handles[key] = handle
+        return handle
+
+    def _signal_handles(self, signals) -> "list[anno.Handle]":
+        handles = []
+        for sig in signals:
+            if isinstance(sig, (tuple, list)):
+                handles.append(self._cached_signal_handle(*sig))
             else:
-                return data
+                handles.append(self._cached_signal_handle(sig))
+        return handles
+
+    def get_signals(self, signals, out: "anno.Optional[np.ndarray]" = None) -> "np.ndarray":
+        """
+        Read many signals with one call into the model and gather them into a single float64 array.
+
+        Args:
+            signals: list of signals to read. Each entry is a :class:`pysimlink.types.Handle`, a block path, or a
+                tuple of :code:`(block_path, model_name, sig_name)` (the same arguments as :func:`get_signal`).
+            out: Optional c contiguous float64 array to write the result into. Must have exactly as many elements
+                as all signals combined.
+
+        Returns:
+            np.ndarray: 1d array with the flattened (c order) value of every signal, in the order they were given.
+            This is :code:`out` if it was provided.
+
+        Raises:
+            RuntimeError: If a signal is a bus (struct) signal or :code:`out` has the wrong size or type
+        """
+        handles = self._signal_handles(signals)
+        if out is None:
+            out = np.empty(sum(handle.size for handle in handles), dtype=np.float64)
+        c_handles = [handle._handle for handle in handles]  # pylint: disable=W0212
+        self._model.read_signals(c_handles, out)
+        return out
+
+    def signal_handle(self, block_path, model_name=None, sig_name="") -> "anno.Handle":
+        """
+        Resolve a signal once and return a handle that can be read without any name lookups.
+
+        Args:
+            block_path: Path to the originating block
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model
+                references (using :code:`None` will retrieve from the root model).
+            sig_name: Name of the signal
+
+        Returns:
+            :class:`pysimlink.types.Handle` referencing the signal. Read it with :func:`read`.
+        """
+        model_name = self._model_paths.root_model_name if model_name is None else model_name
+        return Handle(self._model.signal_handle(model_name, block_path, sig_name))
+
+    def block_param_handle(self, block_path, param, model_name=None) -> "anno.Handle":
+        """
+        Resolve a block parameter once and return a handle that can be read without any name lookups.
+
+        Args:
+            block_path: Path the block within the model
+            param: Name of the parameter
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model references.
+
+        Returns:
+            :class:`pysimlink.types.Handle` referencing the parameter. Read it with :func:`read`.
+        """
+        model_name = self._model_paths.root_model_name if model_name is None else model_name
+        return Handle(self._model.block_param_handle(model_name, block_path, param))
+
+    def model_param_handle(self, param, model_name=None) -> "anno.Handle":
+        """
+        Resolve a model parameter once and return a handle that can be read without any name lookups.
+
+        Args:
+            param: Name of the parameter
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model references.
+
+        Returns:
+            :class:`pysimlink.types.Handle` referencing the parameter. Read it with :func:`read`.
+        """
+        model_name = self._model_paths.root_model_name if model_name is None else model_name
+        return Handle(self._model.model_param_handle(model_name, param))
+
+    def find_signals(
+        self, pattern: str, mode: str = "glob", model_name=None
+    ) -> "list[anno.Handle]":
+        """
+        Search the block paths of all signals and return a handle for each match.
+
+        The search runs on an index of every model (including model references) that is built at
+        :func:`reset`. Prefix queries and globs only look at the block paths starting with the literal part of
+        the pattern, so they stay fast on very large models.
+
+        Args:
+            pattern: Block path pattern. For example :code:`"my_model/Plant/Engine/*"`
+            mode: How the pattern is matched against the block path. :code:`glob` (default, :code:`*`, :code:`?`,
+                and :code:`[seq]` like :mod:`fnmatch`; :code:`*` also matches :code:`/`), :code:`prefix`, or
+                :code:`regex` (matches anywhere in the path unless anchored with :code:`^` and :code:`$`).
+            model_name: Only search this model. None searches all models.
+
+        Returns:
+            list[:class:`pysimlink.types.Handle`]: Handles of the matching signals sorted by block path, ready to use
+            with :func:`read` and :func:`get_signals`
+
+        Raises:
+            ValueError: If mode is unknown or the regular expression is invalid
+        """
+        return self._find_handles(self._kinds.signal, pattern, mode, model_name)
+
+    def find_block_params(
+        self, pattern: str, mode: str = "glob", model_name=None
+    ) -> "list[anno.Handle]":
+        """
+        Search the block paths of all block parameters and return a handle for each match. See
+        :func:`find_signals` for the arguments.
+
+        Returns:
+            list[:class:`pysimlink.types.Handle`]: Handles of the matching parameters sorted by block path
+        """
+        return self._find_handles(self._kinds.block_param, pattern, mode, model_name)
+
+    def _find_handles(self, kind, pattern: str, mode: str, model_name) -> "list[anno.Handle]":
+        if mode not in ("glob", "prefix", "regex"):
+            raise ValueError(f"Unknown mode '{mode}'. Options are glob, prefix, regex")
+        return list(map(Handle, self._model.find_handles(kind, pattern, mode, model_name or "")))
+
+    def signal_view(self, block_path, model_name=None, sig_name="") -> "np.ndarray":
+        """
+        Get a read-only array that aliases the memory of a signal. The view always reflects the current value
+        of the signal, so it only needs to be created once.
+
+        Args:
+            block_path: Path to the originating block *or* a :class:`pysimlink.types.Handle` returned from
+                :func:`signal_handle`
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model
+                references (using :code:`None` will retrieve from the root model).
+            sig_name: Name of the signal
+
+        Returns:
+            np.ndarray that shares memory with the model. Copy it if you need the value from a previous timestep.
+
+        Raises:
+            RuntimeError: If the signal is a bus (struct) signal
+        """
+        if isinstance(block_path, Handle):
+            handle = block_path
+        else:
+            handle = self.signal_handle(block_path, model_name, sig_name)
+        return self._make_view(handle)
+
+    def param_view(self, param, block_path=None, model_name=None) -> "np.ndarray":
+        """
+        Get a writable array that aliases the memory of a block or model parameter. Writing to the array changes
+        the parameter in the model without any type or shape checks.
+
+        Args:
+            param: Name of the parameter *or* a :class:`pysimlink.types.Handle` returned from
+                :func:`block_param_handle` or :func:`model_param_handle`
+            block_path: Path to the block within the model. None for a model parameter.
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model references.
+
+        Returns:
+            np.ndarray that shares memory with the model.
+        """
+        if isinstance(param, Handle):
+            handle = param
+        elif block_path is None:
+            handle = self.model_param_handle(param, model_name)
+        else:
+            handle = self.block_param_handle(block_path, param, model_name)
+        return self._make_view(handle)
+
+    def _make_view(self, handle: "anno.Handle") -> "np.ndarray":
+        view = self._model.view_handle(handle._handle)  # pylint: disable=W0212
+        self._views.append((weakref.ref(view), handle))
+        return view
+
+    def root_input_handle(self, block_path, model_name=None) -> "anno.Handle":
+        """
+        Resolve a root-level inport. Root inports can be driven with the :code:`inputs` argument of :func:`run`.
+
+        Args:
+            block_path: Path to the inport block (e.g. :code:`my_model/In1`)
+            model_name: Name of the model provided by :func:`pysimlink.print_all_params`. None if there are no model references.
+
+        Returns:
+            :class:`pysimlink.types.Handle` referencing the inport.
+        """
+        model_name = self._model_paths.root_model_name if model_name is None else model_name
+        return Handle(self._model.root_input_handle(model_name, block_path))
+
+    def _input_handle(self, key) -> "anno.Handle":
+        if isinstance(key, Handle):
+            return key
+        if isinstance(key, (tuple, list)):
+            return self.block_param_handle(*key)
+        return self.model_param_handle(key)
+
+    def read(self, handle: "anno.Handle"):
+        """
+        Read the current value referenced by a handle.
+
+        Args:
+            handle: Handle returned from :func:`signal_handle`, :func:`block_param_handle`, or :func:`model_param_handle`
+
+        Returns:
+            Value of the signal or parameter at the current timestep. Scalars are returned as python scalars and
+            bus signals as their struct type, the same as :func:`get_signal`.
+        """
+        c_handle = handle._handle  # pylint: disable=W0212
+        data = self._model.read_handle(c_handle)
+        if c_handle.struct_name:
+            return getattr(data, c_handle.struct_name)
+        if data.size == 1:
+            return data.item()
+        else:
+            return data
 
     def get_block_param(self, block_path, param, model_name=None) -> "np.ndarray":
         """
@@ -253,6 +856,23 @@ class Model:
         model_name = self._model_paths.root_model_name if model_name is None else model_name
         return self._model.get_model_param(model_name, param)
 
+    def write_log(self, path: str):
+        """
+        Write the variables collected by the model's MAT-file logging (the time, states, and outputs selected under
+        Data Import/Export, and To Workspace blocks) to a MAT-file, like the generated executable does when the
+        simulation ends. Nothing is written if the model did not log anything.
+
+        The logger's buffers are private to the generated code and are freed once they are written, so this ends
+        logging for the current run: call it once the run is done. The model cannot step again until :func:`reset`.
+
+        Args:
+            path: path of the MAT-file to write
+
+        Raises:
+            RuntimeError: If the model was not generated with MAT-file logging, or the log of this run was already read
+        """
+        self._model.stop_logging(os.path.abspath(path))
+
     def get_models(self) -> "list[str]":
         """
         Gets a list of all reference models (and the root model) in this model.
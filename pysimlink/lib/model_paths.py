@@ -1,7 +1,10 @@
+import contextlib
 import glob
+import json
 import os
 import re
 import sys
+import time
 from typing import Union
 import zipfile
 import shutil
@@ -10,6 +13,10 @@ from pysimlink.utils import annotation_utils as anno
 from pysimlink.utils.model_utils import get_other_in_dir, sanitize_model_name
 
 
+## Appended to the extract directory to name the file recording which zip file it was extracted from
+EXTRACT_STAMP = ".extracted.json"
+
+
 class ModelPaths:
     """
     Holds information about the paths to the model being built.
@@ -27,6 +34,8 @@ class ModelPaths:
     slprj_dir: Union[str, None]  ## Directory will all child models (contains compile_type)
     tmp_dir: str  ## Directory where all compiled models will be built
     was_zip: bool  ## Whether the source was a zip file or not
+    archive: Union[str, None]  ## Path to the zip file the model is extracted from
+    extracted: bool  ## Whether the files needed for the build were extracted from the zip file
 
     def __init__(
         self,
@@ -35,7 +44,6 @@ class ModelPaths:
         compile_type: str = "grt",
         suffix: str = "rtw",
         tmp_dir: "Union[str, None]" = None,
-        skip_compile: bool = False,
     ):
         """
         Args:
@@ -44,7 +52,6 @@ class ModelPaths:
             compile_type: grt, ert, etc...
             suffix: the suffix added to the model name directory. usually 'rtw'
             tmp_dir: Where to store the build files. Defaults to __pycache__
-            skip_compile: Don't extract the model, assume this has already been done
         """
         self.compile_type = compile_type
         if self.compile_type != "grt":
@@ -55,57 +62,53 @@ class ModelPaths:
                 f"be `grt` not {self.compile_type})"
             )
         self.suffix = suffix
+        self.archive = None
+        self.extracted = False
+        self._zip_dirs = None
+        self._zip_files = None
         zip_test = os.path.splitext(root_dir)
         if zip_test[-1] == ".zip":
-            if skip_compile:
-                if tmp_dir is None:
-                    ext_dir = os.path.join(
-                        os.path.dirname(sys.argv[0]),
-                        "__pycache__",
-                        "extract"
-                    )
-                else:
-                    ext_dir = os.path.join(tmp_dir, "extract")
-                zip_name = os.listdir(ext_dir)[0]
-                self.root_dir = os.path.join(ext_dir, zip_name)
-                ext_dir = self.root_dir
-                self.was_zip = True
+            self.was_zip = True
+            if tmp_dir is None:
+                ext_dir = os.path.join(
+                    os.path.dirname(sys.argv[0]),
+                    "__pycache__",
+                    "extract",
+                    os.path.basename(zip_test[0]),
+                )
             else:
-                with zipfile.ZipFile(root_dir, "r") as f:
-                    if tmp_dir is None:
-                        ext_dir = os.path.join(
-                            os.path.dirname(sys.argv[0]),
-                            "__pycache__",
-                            "extract",
-                            os.path.basename(zip_test[0]),
-                        )
-                    else:
-                        ext_dir = os.path.join(tmp_dir, "extract", os.path.basename(zip_test[0]))
-                    shutil.rmtree(ext_dir, ignore_errors=True)
-                    f.extractall(ext_dir)
-
+                ext_dir = os.path.join(tmp_dir, "extract", os.path.basename(zip_test[0]))
+            # the layout is read from the zip file. Files are only extracted when the model is compiled
+            self.archive = os.path.abspath(root_dir)
             self.root_dir = ext_dir
+            self._read_archive()
         else:
             self.root_dir = root_dir
             self.was_zip = False
 
-        walk = os.walk(self.root_dir, followlinks=False)
-        for (cur_path, folders, _) in walk:
-            if "simulink" in folders:
+        for cur_path in self._walk_dirs():
+            if (
+                os.path.isdir(os.path.join(cur_path, "simulink"))
+                if self._zip_dirs is None
+                else self._rel(os.path.join(cur_path, "simulink")) in self._zip_dirs
+            ):
                 self.simulink_native = cur_path
                 break
         else:
             raise RuntimeError(f"{self.root_dir} is not a valid simulink model.")
 
-        models_dir = get_other_in_dir(self.root_dir, os.path.basename(self.simulink_native))
+        if self._zip_dirs is None:
+            models_dir = get_other_in_dir(self.root_dir, os.path.basename(self.simulink_native))
+        else:
+            models_dir = self._other_in_archive(os.path.basename(self.simulink_native))
         self.models_dir = os.path.join(self.root_dir, models_dir)
 
-        self.has_references = os.path.exists(os.path.join(self.models_dir, "slprj"))
+        self.has_references = self._exists(os.path.join(self.models_dir, "slprj"))
 
         self.root_model_path = os.path.join(
             self.models_dir, model_name + "_" + compile_type + "_" + suffix
         )
-        if not os.path.exists(self.root_model_path):
+        if not self._exists(self.root_model_path):
             try:
                 model_name = model_name.split("_" + compile_type + "_" + suffix)[0]
             except:  # pylint: disable=W0702
@@ -113,7 +116,7 @@ class ModelPaths:
             self.root_model_path = os.path.join(
                 self.models_dir, model_name + "_" + compile_type + "_" + suffix
             )
-            if not os.path.exists(self.root_model_path):
+            if not self._exists(self.root_model_path):
                 raise RuntimeError(
                     f"Cannot find folder with name '{model_name}' in '{self.models_dir}'"
                 )
@@ -121,25 +124,146 @@ class ModelPaths:
         if self.has_references:
             self.slprj_dir = os.path.join(self.models_dir, "slprj", compile_type)
 
+        self.tmp_dir = self.build_dir(model_name, tmp_dir)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.verify_capi()
+
+    @staticmethod
+    def build_dir(model_name: str, tmp_dir: "Union[str, None]" = None) -> str:
+        """
+        Directory a model is built in
+
+        Args:
+            model_name: Name of the root model
+            tmp_dir: :code:`tmp_dir` argument of the model. Defaults to __pycache__
+
+        Returns:
+            str: path to the build directory of the model
+        """
         if tmp_dir is None:
-            self.tmp_dir = os.path.join(
-                os.path.dirname(sys.argv[0]),
-                "__pycache__",
-                "pysimlink",
-                self.root_model_name,
+            return os.path.join(
+                os.path.dirname(sys.argv[0]), "__pycache__", "pysimlink", model_name
             )
+        return os.path.join(tmp_dir, model_name)
+
+    def to_dict(self) -> dict:
+        """
+        Resolved paths of this model, restored with :meth:`from_dict`
+        """
+        return {key: value for key, value in vars(self).items() if not key.startswith("_")}
+
+    @classmethod
+    def from_dict(cls, paths: dict) -> "ModelPaths":
+        """
+        Restore the paths returned from :meth:`to_dict` without looking at the model directory again
+
+        Args:
+            paths: dictionary returned from :meth:`to_dict`
+        """
+        ret = cls.__new__(cls)
+        ret._zip_dirs = None
+        ret._zip_files = None
+        ret.__dict__.update(paths)
+        return ret
+
+    def _read_archive(self):
+        with zipfile.ZipFile(self.archive, "r") as f:
+            names = f.namelist()
+        self._zip_files = {name for name in names if not name.endswith("/")}
+        self._zip_dirs = set()
+        for name in names:
+            parts = name.rstrip("/").split("/")
+            end = len(parts) if name.endswith("/") else len(parts) - 1
+            for i in range(1, end + 1):
+                self._zip_dirs.add("/".join(parts[:i]))
+
+    def _rel(self, path: str) -> str:
+        # name of a path below root_dir inside the zip file
+        return os.path.relpath(path, self.root_dir).replace(os.sep, "/")
+
+    def _exists(self, path: str) -> bool:
+        if self._zip_dirs is None:
+            return os.path.exists(path)
+        return self._rel(path) in self._zip_dirs or self._rel(path) in self._zip_files
+
+    def _walk_dirs(self):
+        # every directory of the model, top down
+        if self._zip_dirs is None:
+            for cur_path, _, _ in os.walk(self.root_dir, followlinks=False):
+                yield cur_path
         else:
-            self.tmp_dir = os.path.join(tmp_dir, model_name)
-        os.makedirs(self.tmp_dir, exist_ok=True)
-        self.verify_capi()
+            yield self.root_dir
+            for name in sorted(self._zip_dirs, key=lambda name: (name.count("/"), name)):
+                yield os.path.join(self.root_dir, *name.split("/"))
+
+    def _other_in_archive(self, known: str) -> str:
+        # same as get_other_in_dir, for the top level of the zip file
+        top = {name.split("/")[0] for name in self._zip_dirs | self._zip_files}
+        top.discard(".DS_Store")
+        assert (
+            len(top) == 2
+        ), f"Archive '{self.archive}' contains more than 2 folders (not counting .DS_Store on Mac)"
+        assert known in top, f"File does not exist in {self.archive}. Should be one of {top}"
+        top.remove(known)
+        return top.pop()
+
+    def extract(self, force: bool = False):
+        """
+        Extract the files needed to compile the model (sources, headers, and defines) from the zip file.
+
+        Extraction is skipped if the zip file has not changed since it was last extracted. Extracted files keep the
+        modification time they have in the zip file, so a zip file that is extracted again only recompiles the files
+        that changed.
+
+        Args:
+            force: extract even if the zip file has not changed
+        """
+        if self.archive is None or (self.extracted and not force):
+            return
+
+        stamp_file = self.root_dir.rstrip(os.sep) + EXTRACT_STAMP
+        stat = os.stat(self.archive)
+        stamp = {"archive": self.archive, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if not force and os.path.isdir(self.root_dir):
+            try:
+                with open(stamp_file, "r", encoding="utf-8") as f:
+                    if json.load(f) == stamp:
+                        self.extracted = True
+                        return
+            except (OSError, ValueError):
+                pass
+
+        from pysimlink.lib.build_cache import SOURCE_EXTENSIONS  # pylint: disable=C0415
+
+        with contextlib.suppress(OSError):
+            os.remove(stamp_file)
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+        with zipfile.ZipFile(self.archive, "r") as f:
+            for info in f.infolist():
+                if info.is_dir() or not info.filename.endswith(SOURCE_EXTENSIONS):
+                    continue
+                path = f.extract(info, self.root_dir)
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                os.utime(path, (mtime, mtime))
+        with open(stamp_file, "w", encoding="utf-8") as f:
+            json.dump(stamp, f)
+        self.extracted = True
 
     def verify_capi(self):
         """
         Make sure that this model was generated with the c api. This doesn't use
         the function in the capi, but we need the model mapping interface (mmi).
         """
-        files = glob.glob(self.root_model_path + "/*.c", recursive=False)
-        files = list(map(os.path.basename, files))
+        if self._zip_files is None:
+            files = glob.glob(self.root_model_path + "/*.c", recursive=False)
+        else:
+            prefix = self._rel(self.root_model_path) + "/"
+            files = [
+                name
+                for name in self._zip_files
+                if name.startswith(prefix) and "/" not in name[len(prefix) :]
+            ]
+        files = [os.path.basename(file) for file in files if file.endswith(".c")]
         assert (
             self.root_model_name + ".c" in files
         ), f"Cannot find {self.root_model_name}.c in {self.root_model_path}. Is the model name correct?"
@@ -150,10 +274,13 @@ class ModelPaths:
         )
 
         ## also check that this is not a multitasked model
-        with open(
-            os.path.join(self.root_model_path, self.root_model_name + ".h"), encoding="utf-8"
-        ) as f:
-            lines = f.readlines()
+        header = os.path.join(self.root_model_path, self.root_model_name + ".h")
+        if self._zip_files is None:
+            with open(header, encoding="utf-8") as f:
+                lines = f.readlines()
+        else:
+            with zipfile.ZipFile(self.archive, "r") as f:
+                lines = f.read(self._rel(header)).decode("utf-8").splitlines()
 
         regex = re.compile(
             f"extern void {self.root_model_name}_step\(void\);"  # pylint: disable=W1401
@@ -166,7 +293,7 @@ class ModelPaths:
                 "Model is setup with multitasking OR single output/update function is not enabled. See the docs for proper generation format (https://lharri73.github.io/PySimlink/src/howto.html#generate-code-from-your-simulink-model)"
             )
 
-    def compiler_factory(self, generator) -> "anno.Compiler":
+    def compiler_factory(self, generator, jobs=None, build_profile="release") -> "anno.Compiler":
         """
         Return the correct compiler. This could be simplified later -or- more
         compilers could be added if we want to use something other than cmake.
@@ -176,13 +303,13 @@ class ModelPaths:
                 ModelRefCompiler,
             )
 
-            return ModelRefCompiler(self, generator)
+            return ModelRefCompiler(self, generator, jobs, build_profile)
         else:
             from pysimlink.lib.compilers.one_shot_compiler import (  # pylint: disable=C0415
                 NoRefCompiler,
             )
 
-            return NoRefCompiler(self, generator)
+            return NoRefCompiler(self, generator, jobs, build_profile)
 
     @property
     def module_name(self):
@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+import importlib.util
+
+import numpy as np
+
+from pysimlink.utils import annotation_utils as anno
+from pysimlink.lib.model_types import Handle
+
+
+def _load_module_copy(module, dest: str, prefix: str):
+    """
+    Copy a compiled extension module to :code:`dest` and import it from there.
+
+    The copy is loaded by the dynamic linker as a separate library, so all global variables of the
+    generated code (the model state) exist once per copy. The copy is never added to :code:`sys.modules`.
+    The module is named :code:`{prefix}.{module name}`; the init function is still found from the last
+    component, but pybind11 does not hand back the module it already created under the plain name.
+    """
+    shutil.copyfile(module.__file__, dest)
+    spec = importlib.util.spec_from_file_location(f"{prefix}.{module.__name__}", dest)
+    ret = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(ret)
+    return ret
+
+
+def _resolve(model: "anno.Model", sig):
+    # handles point into the library they were resolved in, so each instance resolves them again by kind
+    if not isinstance(sig, Handle):
+        return sig
+    if sig.kind == "signal":
+        return (sig.block_path, sig.model_name, sig.name)
+    if sig.kind == "block_param":
+        return model.block_param_handle(sig.block_path, sig.name, sig.model_name)
+    if sig.kind == "model_param":
+        return model.model_param_handle(sig.name, sig.model_name)
+    return model.root_input_handle(sig.block_path, sig.model_name)
+
+
+class ModelPool:
+    """
+    A fixed number of independent instances of one compiled model, stepped and read together.
+
+    Each instance (slot) runs from its own copy of the compiled library, so slots never share state.
+    Slots are :class:`pysimlink.Model` objects, and can be used individually through indexing
+    (:code:`pool[i].set_model_param(...)`).
+    """
+
+    def __init__(self, model: "anno.Model", n: int):
+        """
+        Args:
+            model: A compiled model. The pool loads copies of its library; the model itself is not used as a slot
+                and keeps its own state.
+            n: Number of instances
+
+        Raises:
+            ValueError: If n is <= 0
+        """
+        if n <= 0:
+            raise ValueError("n must be > 0")
+
+        pool_dir = os.path.join(model._model_paths.tmp_dir, "pool")  # pylint: disable=W0212
+        os.makedirs(pool_dir, exist_ok=True)
+        # loaded libraries are cached by file path, so every pool needs files of its own
+        self._dir = tempfile.mkdtemp(prefix=f"{os.getpid()}_", dir=pool_dir)
+
+        _, ext = os.path.splitext(model.module.__file__)
+        self._models = []
+        for i in range(n):
+            dest = os.path.join(self._dir, f"{model.module.__name__}_{i}{ext}")
+            prefix = f"_pysimlink_pool_{os.path.basename(self._dir)}_{i}"
+            module = _load_module_copy(model.module, dest, prefix)
+            self._models.append(model._replica(module))  # pylint: disable=W0212
+
+    def __len__(self):
+        """
+        Get the number of instances in the pool
+        """
+        return len(self._models)
+
+    def __getitem__(self, i: int) -> "anno.Model":
+        return self._models[i]
+
+    def __iter__(self):
+        return iter(self._models)
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Remove the copies of the library from disk. The loaded instances stay usable.
+        """
+        if getattr(self, "_dir", None) is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def _slots(self, i) -> "list[anno.Model]":
+        if i is None:
+            return self._models
+        if isinstance(i, int):
+            return [self._models[i]]
+        return [self._models[idx] for idx in i]
+
+    def reset(self, i: "anno.Union[int, list[int], None]" = None):
+        """
+        Reset instances of the pool.
+
+        Args:
+            i: Index (or list of indices) of the instances to reset. None resets every instance.
+        """
+        for model in self._slots(i):
+            model.reset()
+
+    def step_all(self, iterations: int = 1):
+        """
+        Step every instance of the pool, one after the other. This is a convenience loop: each instance is stepped
+        with its own call into its library, which releases the GIL for that call.
+
+        Args:
+            iterations: Number of timesteps to step each instance (see :func:`pysimlink.Model.step`)
+
+        Raises:
+            RuntimeError: If any instance encounters an error. Instances after the failing one are not stepped.
+        """
+        for model in self._models:
+            model._model.step(iterations)  # pylint: disable=W0212
+
+    def get_signals(self, signals, out: "anno.Optional[np.ndarray]" = None) -> "np.ndarray":
+        """
+        Read the same signals from every instance.
+
+        Args:
+            signals: list of signals to read (see :func:`pysimlink.Model.get_signals`). Handles of any kind may come
+                from any instance (or the model the pool was created from); they are resolved again for each instance.
+            out: Optional c contiguous float64 array of shape :code:`(len(pool), n_values)` to write into
+
+        Returns:
+            np.ndarray: Array of shape :code:`(len(pool), n_values)`. Row :code:`i` holds the signals of instance
+            :code:`i`. This is :code:`out` if it was provided.
+
+        Raises:
+            RuntimeError: If a signal is a bus (struct) signal or :code:`out` has the wrong size or type
+        """
+        specs = [[_resolve(model, sig) for sig in signals] for model in self._models]
+
+        if out is None:
+            handles = self._models[0]._signal_handles(specs[0])  # pylint: disable=W0212
+            width = sum(handle.size for handle in handles)
+            out = np.empty((len(self._models), width), dtype=np.float64)
+        if out.ndim != 2 or out.shape[0] != len(self._models):
+            raise RuntimeError(f"out must have shape ({len(self._models)}, n_values)")
+
+        for i, model in enumerate(self._models):
+            model.get_signals(specs[i], out[i])
+        return out
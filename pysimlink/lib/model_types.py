@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pysimlink.utils import annotation_utils as anno
 
@@ -15,12 +16,14 @@ class DataType:
         orientation (int): Enumeration indicating if this is a scalar, vector, column major or row major array.
             Since this enum is evaluated at compile time, it is imported from the compiled model. To check this value
             dynamically, use :attr:`pysimlink.Model.orientations`.
+        size (int): Number of elements (the product of :attr:`dims`)
     """
 
     cDataType: str
     pythonType: str
     dims: "list[int]"
     orientation: int
+    size: int
 
     def __init__(self, obj: "anno.c_model_datatype"):
         self.cDataType = obj.cDataType
@@ -28,6 +31,9 @@ class DataType:
         self.mwDataType = getattr(obj, "mwType", None) or getattr(obj, "mwDataType", None)
         self.dims = obj.dims
         self.orientation = obj.orientation
+        self.size = 1
+        for dim in self.dims:
+            self.size *= dim
 
     def __repr__(self):
         if self.cDataType == "struct":
@@ -54,6 +60,7 @@ class ModelParam:
     def __init__(self, obj: "anno.c_model_param"):
         self.model_param = obj.model_param
         self.data_type = DataType(obj.data_type)
+        self.size = self.data_type.size
 
 
 @dataclass
@@ -77,6 +84,7 @@ class BlockParam:
         self.block_name = obj.block_name
         self.block_param = obj.block_param
         self.data_type = DataType(obj.data_type)
+        self.size = self.data_type.size
 
 
 @dataclass
@@ -98,6 +106,69 @@ class Signal:
         self.block_name = obj.block_name
         self.signal_name = obj.signal_name
         self.data_type = DataType(obj.data_type)
+        self.size = self.data_type.size
+
+
+class Catalog(Sequence):
+    """
+    Lazy list of the signals, block parameters, or model parameters of one model. Used for the attributes of
+    :class:`ModelInfo`.
+
+    Nothing is copied out of the model when the catalog is created. Each entry is read from the c api
+    the first time it is accessed, so looking at a few entries of a large model is cheap. Use :func:`columns` to
+    get the names, data types, and dimensions of all entries at once.
+    """
+
+    def __init__(
+        self, model: "anno.c_model", model_name: str, kind: "anno.c_handle_kind", wrapper: type
+    ):
+        self._model = model
+        self._model_name = model_name
+        self._kind = kind
+        self._wrapper = wrapper
+        self._len = model.catalog_size(model_name, kind)
+        self._entries = {}
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._len))]
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("catalog index out of range")
+        entry = self._entries.get(idx)
+        if entry is None:
+            entry = self._wrapper(self._model.catalog_entry(self._model_name, self._kind, idx))
+            self._entries[idx] = entry
+        return entry
+
+    def __iter__(self):
+        for idx in range(self._len):
+            yield self[idx]
+
+    def __repr__(self):
+        return f"Catalog({self._kind.name}s of '{self._model_name}', {self._len} entries)"
+
+    def columns(self) -> "dict[str, anno.ndarray]":
+        """
+        Describe every entry of the catalog at once, one numpy array per field (without creating an object per
+        entry).
+
+        Strings are fixed width byte strings (:code:`S<n>`); use :code:`np.char.decode` to turn them into
+        :code:`str`. The dimensions of entry :code:`i` are :code:`dims[dims_offsets[i]:dims_offsets[i + 1]]`.
+
+        Returns:
+            dict[str, np.ndarray]: arrays with one element per entry, in the same order as the catalog:
+            :code:`block_path` (empty for model parameters), :code:`name` (signal or parameter name, empty if the
+            signal is not named), :code:`c_type`, :code:`mw_type`, :code:`python_type`, :code:`orientation`
+            (int32, see :attr:`pysimlink.Model.orientations`), :code:`size` (number of elements, int64), and
+            :code:`dims_offsets` (int64, one more element than the catalog). :code:`dims` (int64) holds the
+            dimensions of all entries back to back.
+        """
+        return self._model.catalog_columns(self._model_name, self._kind)
 
 
 @dataclass
@@ -110,18 +181,61 @@ class ModelInfo:
 
     Attributes:
         model_name (str): Name of the model this object describes
-        model_params (list[:class:`ModelParam`]): List of all model parameters
-        block_params (list[:class:`BlockParam`]): List of all block parameters
-        signals (list[:class:`Signal`]): List of all signals
+        model_params (:class:`Catalog` [:class:`ModelParam`]): All model parameters
+        block_params (:class:`Catalog` [:class:`BlockParam`]): All block parameters
+        signals (:class:`Catalog` [:class:`Signal`]): All signals
+    """
+
+    model_name: str
+    model_params: "anno.Sequence[ModelParam]"
+    block_params: "anno.Sequence[BlockParam]"
+    signals: "anno.Sequence[Signal]"
+
+    def __init__(
+            self,
+            model_name: str,
+            model_params: "anno.Sequence[ModelParam]",
+            block_params: "anno.Sequence[BlockParam]",
+            signals: "anno.Sequence[Signal]",
+    ):
+        self.model_name = model_name
+        self.model_params = model_params
+        self.block_params = block_params
+        self.signals = signals
+
+
+@dataclass(eq=False)
+class Handle:
+    """
+    Pre-resolved reference to a signal, parameter, or root inport. Returned from
+    :func:`pysimlink.Model.signal_handle`, :func:`pysimlink.Model.block_param_handle`,
+    :func:`pysimlink.Model.model_param_handle`, and :func:`pysimlink.Model.root_input_handle`.
+
+    The c api index, datatype, shape, and address are looked up once when the handle is created, so reading
+    it with :func:`pysimlink.Model.read` skips every name lookup. Handles remain valid after
+    :func:`pysimlink.Model.reset`.
+
+    Attributes:
+        kind (str): One of :code:`signal`, :code:`block_param`, :code:`model_param`, or :code:`root_input`
+        model_name (str): Name of the model this handle belongs to
+        block_path (str): Path to the block (empty for model parameters)
+        name (str): Name of the signal or parameter
+        data_type (:class:`DataType`): data type object describing the referenced value
+        size (int): Number of elements in the referenced value
     """
 
+    kind: str
     model_name: str
-    model_params: "list[ModelParam]"
-    block_params: "list[BlockParam]"
-    signals: "list[Signal]"
+    block_path: str
+    name: str
+    data_type: DataType
+    size: int
 
-    def __init__(self, obj: "anno.c_model_info"):
+    def __init__(self, obj: "anno.c_model_handle"):
+        self._handle = obj
+        self.kind = obj.kind.name
         self.model_name = obj.model_name
-        self.model_params = list(map(ModelParam, obj.model_params))
-        self.block_params = list(map(BlockParam, obj.block_params))
-        self.signals = list(map(Signal, obj.signals))
+        self.block_path = obj.block_path
+        self.name = obj.name
+        self.data_type = DataType(obj.data_type)
+        self.size = self.data_type.size
@@ -0,0 +1,151 @@
+"""
+Run many simulations of one model in parallel worker processes.
+
+The model is compiled once from the calling process, without importing it there. Workers import
+the already built extension (with :code:`skip_compile`), so they never take the build lock or
+compile the model themselves, and write their traces directly into one shared memory block.
+
+Workers are started with the :code:`spawn` method, so they don't inherit models loaded by the
+caller, and scripts using :func:`run_sweep` need an :code:`if __name__ == "__main__":` guard.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8
+    shared_memory = None
+
+from pysimlink.lib.model import Model
+from pysimlink.utils import annotation_utils as anno
+
+_worker = {}
+
+
+def _param_key(key):
+    return tuple(key) if isinstance(key, list) else key
+
+
+def _set_param(model: "anno.Model", key, value):
+    if isinstance(key, (tuple, list)):
+        model.set_block_param(key[0], key[1], value, *key[2:])
+    else:
+        model.set_model_param(key, value)
+
+
+def _get_param(model: "anno.Model", key):
+    if isinstance(key, (tuple, list)):
+        return model.get_block_param(key[0], key[1], *key[2:])
+    return model.get_model_param(key)
+
+
+def _init_worker(model_spec: dict, keys: list):
+    model = Model(**dict(model_spec, force_rebuild=False, skip_compile=True))
+    model.reset()
+
+    # parameters are not reset by the model, so runs without a value for a key get the original value
+    _worker["model"] = model
+    _worker["defaults"] = {key: _get_param(model, key) for key in keys}
+
+
+def _trace_width(record: list) -> int:
+    handles = _worker["model"]._signal_handles(record)  # pylint: disable=W0212
+    return sum(handle.size for handle in handles)
+
+
+def _run_one(
+        shm_name: str,
+        shape: tuple,
+        idx: int,
+        params: dict,
+        steps: int,
+        record: list,
+        decimation: int,
+):
+    # the output of a sweep is attached once per worker
+    if _worker.get("shm_name") != shm_name:
+        _worker["shm"] = shared_memory.SharedMemory(name=shm_name)
+        _worker["shm_name"] = shm_name
+        _worker["out"] = np.ndarray(shape, dtype=np.float64, buffer=_worker["shm"].buf)
+
+    model = _worker["model"]
+    model.reset()
+    for key, value in _worker["defaults"].items():
+        _set_param(model, key, params.get(key, value))
+    model.run(steps, record=record, decimation=decimation, out=_worker["out"][idx])
+
+
+def run_sweep(
+        model_spec: dict,
+        param_sets: "list[dict]",
+        steps: int,
+        record: list,
+        workers: "anno.Optional[int]" = None,
+        decimation: int = 1,
+) -> "np.ndarray":
+    """
+    Run the same model once per parameter set, spread over a pool of worker processes.
+
+    Args:
+        model_spec: keyword arguments for :class:`pysimlink.Model` (at least :code:`model_name` and
+            :code:`path_to_model`). The model is compiled (if needed) before any worker starts.
+        param_sets: one dictionary per run mapping a parameter to its value for that run. Keys are the name of a
+            model parameter or a tuple of :code:`(block_path, param[, model_name])` for a block parameter.
+            Parameters set by any run but missing from a parameter set keep their original value.
+        steps: Number of timesteps for every run
+        record: list of signals to record, given as block paths or tuples of
+            :code:`(block_path, model_name, sig_name)` (see :func:`pysimlink.Model.get_signals`)
+        workers: Number of worker processes. Defaults to the number of cpus.
+        decimation: Record every :code:`decimation`-th step (see :func:`pysimlink.Model.run`)
+
+    Returns:
+        np.ndarray: Array of shape :code:`(len(param_sets), steps // decimation, n_values)`. Entry :code:`i` holds
+        the trace of run :code:`i`, laid out the same as the return value of :func:`pysimlink.Model.run`.
+
+    Raises:
+        RuntimeError: If shared memory is not available (python < 3.8) or a run fails
+        ValueError: If steps, decimation, or workers is <= 0
+    """
+    if shared_memory is None:
+        raise RuntimeError("run_sweep requires multiprocessing.shared_memory (python >= 3.8)")
+    if steps <= 0:
+        raise ValueError("steps must be > 0")
+    if decimation <= 0:
+        raise ValueError("decimation must be > 0")
+    if workers is not None and workers <= 0:
+        raise ValueError("workers must be > 0")
+
+    Model.build(**model_spec)
+
+    param_sets = [
+        {_param_key(key): value for key, value in params.items()} for params in param_sets
+    ]
+    keys = []
+    for params in param_sets:
+        keys.extend(key for key in params if key not in keys)
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(param_sets)))
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_spec, keys),
+    ) as pool:
+        # the signals are only resolved in the workers, which have the model loaded
+        width = pool.submit(_trace_width, record).result()
+        shape = (len(param_sets), steps // decimation, width)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+        try:
+            futures = [
+                pool.submit(_run_one, shm.name, shape, idx, params, steps, record, decimation)
+                for idx, params in enumerate(param_sets)
+            ]
+            for future in futures:
+                future.result()
+            return np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,344 @@
+"""
+Stream signals to disk while a model runs.
+
+A recording is one append-only file: an 8 byte magic, the length of the header (little endian uint64), a json
+header, and then one row per recorded step. Each row holds the simulation time followed by the flattened (c order)
+value of every signal (see :func:`pysimlink.Model.get_signals`), all as float64. The header is padded so rows start
+on a 64 byte boundary, and the number of rows follows from the size of the file, so a recording that was cut short
+(or is still being written) can always be read up to its last complete row. Use :func:`pysimlink.traces.open` to
+read a recording, or map it directly:
+
+.. code-block:: python
+
+    header, offset = read_header(path)
+    rows = (os.path.getsize(path) - offset) // (header["width"] * 8)
+    data = np.memmap(path, dtype=header["dtype"], mode="r", offset=offset, shape=(rows, header["width"]))
+"""
+import json
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from pysimlink.utils import annotation_utils as anno
+
+MAGIC = b"PSLTRACE"
+## Bumped when the layout of the file changes
+FORMAT = 1
+## Rows start on a multiple of this many bytes
+ALIGNMENT = 64
+
+
+def _header(model: "anno.Model", handles: "list[anno.Handle]", decimation: int) -> dict:
+    signals = []
+    offset = 1  # column 0 is the time
+    for handle in handles:
+        signals.append(
+            {
+                "model_name": handle.model_name,
+                "block_path": handle.block_path,
+                "name": handle.name,
+                "c_type": handle.data_type.cDataType,
+                "python_type": handle.data_type.pythonType,
+                "dims": list(handle.data_type.dims),
+                "orientation": int(handle.data_type.orientation),
+                "offset": offset,
+                "size": handle.size,
+            }
+        )
+        offset += handle.size
+    return {
+        "format": FORMAT,
+        "model": model._model_paths.root_model_name,  # pylint: disable=W0212
+        "step_size": model.step_size,
+        "decimation": decimation,
+        "dtype": np.dtype(np.float64).str,
+        "width": offset,
+        "signals": signals,
+    }
+
+
+def write_header(f, header: dict) -> int:
+    """
+    Write the header of a recording to the start of a file
+
+    Args:
+        f: file opened for binary writing
+        header: header of the recording
+
+    Returns:
+        int: offset of the first row
+    """
+    text = json.dumps(header).encode()
+    text += b" " * (-(len(MAGIC) + 8 + len(text)) % ALIGNMENT)
+    f.write(MAGIC + struct.pack("<Q", len(text)) + text)
+    return len(MAGIC) + 8 + len(text)
+
+
+def read_header(path: str) -> "tuple[dict, int]":
+    """
+    Read the header of a recording
+
+    Args:
+        path: path to the recording
+
+    Returns:
+        tuple[dict, int]: the header, and the offset of the first row
+
+    Raises:
+        ValueError: If the file is not a recording or was written by a newer version of pysimlink
+    """
+    with open(path, "rb") as f:
+        start = f.read(len(MAGIC) + 8)
+        if len(start) != len(MAGIC) + 8 or start[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not a pysimlink recording")
+        (length,) = struct.unpack("<Q", start[len(MAGIC) :])
+        header = json.loads(f.read(length))
+    if header.get("format") != FORMAT:
+        raise ValueError(
+            f"'{path}' has format {header.get('format')}. Only format {FORMAT} is supported."
+        )
+    return header, len(MAGIC) + 8 + length
+
+
+class Recorder:
+    """
+    Records signals of a model to a file while it runs. Create it with :func:`pysimlink.Model.recorder`.
+
+    The model is stepped in compiled code (see :func:`pysimlink.Model.run`), one chunk of rows at a time. Two
+    chunk buffers are used in turn: while one is being filled by the model, a background thread writes the other to
+    disk, so memory use is bounded by the two buffers no matter how long the simulation runs. The model only waits
+    for the writer if the disk falls more than a whole chunk behind.
+
+    Use it as a context manager, or call :func:`close` when done, to write the last rows:
+
+    .. code-block:: python
+
+        with model.recorder("run.trace", ["my_model/Gain", ("my_model/Sum", None, "error")]) as rec:
+            rec.run(100_000_000)
+    """
+
+    def __init__(
+            self,
+            model: "anno.Model",
+            path: str,
+            signals: list,
+            decimation: int = 1,
+            chunk_rows: int = 4096,
+    ):
+        """
+        Args:
+            model: model to record from. Must be reset.
+            path: file to write the recording to. Overwritten if it exists.
+            signals: list of signals to record. Accepts the same entries as :func:`pysimlink.Model.get_signals`.
+            decimation: Record every :code:`decimation`-th step
+            chunk_rows: Number of rows in each of the two buffers
+
+        Raises:
+            ValueError: If decimation or chunk_rows is <= 0
+            RuntimeError: If a signal is a bus (struct) signal
+        """
+        if decimation <= 0:
+            raise ValueError("decimation must be > 0")
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be > 0")
+
+        self._model = model
+        self._handles = model._signal_handles(signals)  # pylint: disable=W0212
+        self._decimation = decimation
+        self._header = _header(model, self._handles, decimation)
+        self.path = path
+        self.rows = 0
+
+        # reading the same signals once checks them before anything is written
+        self._width = self._header["width"] - 1
+        model.get_signals(self._handles, out=np.empty(self._width))
+        self._step_size = model.step_size
+        try:
+            self._start = model.time
+            self._has_time = True
+        except RuntimeError:
+            self._start = 0.0
+            self._has_time = False
+        # times are counted in steps from the start, so they don't accumulate rounding errors
+        self._steps = 0
+        self._phase = 0  # steps run since the last recorded row
+
+        self._file = open(path, "wb")  # pylint: disable=R1732
+        write_header(self._file, self._header)
+        self._file.flush()
+        self._free = queue.Queue()
+        self._free.put((np.empty((chunk_rows, self._width)), np.empty(chunk_rows)))
+        self._values, self._times = np.empty((chunk_rows, self._width)), np.empty(chunk_rows)
+        self._filled = 0
+        self._full = queue.Queue()
+        self._error = None
+        self._writer = threading.Thread(target=self._write, name="pysimlink_recorder", daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def header(self) -> dict:
+        """
+        Header written to the start of the file. :code:`signals` lists the block path, name, data type, dims, and
+        column offset of every signal.
+        """
+        return self._header
+
+    def _write(self):
+        staging = None
+        while True:
+            item = self._full.get()
+            if item is None:
+                self._full.task_done()
+                return
+            values, times, rows = item
+            try:
+                if self._error is None and rows > 0:
+                    if staging is None:
+                        staging = np.empty((len(values), self._width + 1))
+                    staging[:rows, 0] = times[:rows]
+                    staging[:rows, 1:] = values[:rows]
+                    self._file.write(staging[:rows].data)
+            except OSError as e:
+                self._error = e
+            self._free.put((values, times))
+            self._full.task_done()
+
+    def _check(self):
+        if self._file is None:
+            raise RuntimeError("Recorder is closed")
+        if self._error is not None:
+            raise RuntimeError(f"Writing to '{self.path}' failed") from self._error
+
+    def _swap(self):
+        # hand the filled buffer to the writer and continue in the other one
+        self._full.put((self._values, self._times, self._filled))
+        self._values, self._times = self._free.get()
+        self._filled = 0
+        self._check()
+
+    def _clock(self, steps: int = 0) -> float:
+        # time after `steps` more steps
+        return self._start + (self._steps + steps) * self._step_size
+
+    def _sync(self):
+        # start counting again if the model was stepped or reset by someone else
+        if self._has_time:
+            now = self._model.time
+            if abs(now - self._clock()) > self._step_size / 2:
+                self._start = now
+                self._steps = 0
+
+    def _record(self, rows: int):
+        if self._filled == len(self._values):
+            self._swap()
+        rows = min(rows, len(self._values) - self._filled)
+        done = 0
+        try:
+            self._model.run(
+                rows * self._decimation,
+                self._handles,
+                self._decimation,
+                out=self._values[self._filled : self._filled + rows],
+            )
+            done = rows * self._decimation
+        except RuntimeError as e:
+            # keep the rows recorded before the model stopped (e.g. at the end of the simulation)
+            done = getattr(e, "steps", 0)
+            self._phase = done % self._decimation
+            raise
+        finally:
+            rows = min(rows, done // self._decimation)
+            self._times[self._filled : self._filled + rows] = self._clock(
+                self._decimation * np.arange(1, rows + 1)
+            )
+            self._filled += rows
+            self.rows += rows
+            self._steps += done
+        return done
+
+    def run(self, steps: int) -> int:
+        """
+        Step the model and record the signals.
+
+        Steps past the last full multiple of :code:`decimation` are run, and continue the decimation period in the
+        next call.
+
+        Args:
+            steps: Number of timesteps to run
+
+        Returns:
+            int: Number of rows recorded during this call
+
+        Raises:
+            ValueError: If steps is <= 0
+            RuntimeError: If the model encounters an error (see :func:`pysimlink.Model.step`) or writing the file
+                failed. Rows recorded before the model stopped are kept.
+        """
+        if steps <= 0:
+            raise ValueError("steps must be > 0")
+        self._check()
+        self._sync()
+        start = self.rows
+
+        # finish the decimation period started by the last call
+        if self._phase > 0:
+            todo = min(steps, self._decimation - self._phase)
+            self._model.step(todo)
+            self._steps += todo
+            steps -= todo
+            self._phase = (self._phase + todo) % self._decimation
+            if self._phase == 0:
+                if self._filled == len(self._values):
+                    self._swap()
+                self._model.get_signals(self._handles, out=self._values[self._filled])
+                self._times[self._filled] = self._clock()
+                self._filled += 1
+                self.rows += 1
+
+        while steps >= self._decimation:
+            steps -= self._record(steps // self._decimation)
+
+        if steps > 0:
+            self._model.step(steps)
+            self._steps += steps
+            self._phase = steps
+        return self.rows - start
+
+    def flush(self):
+        """
+        Write every row recorded so far to the file
+
+        Raises:
+            RuntimeError: If writing the file failed
+        """
+        self._check()
+        self._swap()
+        self._full.join()
+        self._file.flush()
+        self._check()
+
+    def close(self):
+        """
+        Write the remaining rows and close the file. Calling it again does nothing.
+
+        Raises:
+            RuntimeError: If writing the file failed
+        """
+        if self._file is None:
+            return
+        self._full.put((self._values, self._times, self._filled))
+        self._filled = 0
+        self._full.put(None)
+        self._writer.join()
+        self._file.close()
+        self._file = None
+        if self._error is not None:
+            raise RuntimeError(f"Writing to '{self.path}' failed") from self._error
@@ -1,3 +1,4 @@
+import re
 from dataclasses import dataclass
 
 
@@ -24,3 +25,41 @@ def parse_struct(lines):
             return struct
         else:
             fields.append(Field(line[0], line[1][:-1]))
+
+
+## An extern declaration of one object: type words and pointers, its name, and optional array dimensions
+DATA_DECL_RE = re.compile(
+    r"extern\s+(?P<type>[A-Za-z_][\w\s*]*?[\s*]+)(?P<name>[A-Za-z_]\w*)\s*(\[[^\]]*\]\s*)*"
+)
+FUNCTION_DECL_RE = re.compile(r"extern\s+[^()]*\w\s*\([^()]*\)")
+
+
+def parse_data_objects(text: str) -> "tuple[list[str], list[str]]":
+    """
+    Find the global data objects declared in a generated header
+
+    Args:
+        text: contents of the header
+
+    Returns:
+        tuple[list[str], list[str]]: names of the objects declared :code:`extern` that are not :code:`const`, and
+        the (whitespace collapsed) :code:`extern` declarations that are neither functions nor :code:`const` but
+        could not be understood
+    """
+    text = re.sub(r"/\*.*?\*/|//[^\n]*", " ", text, flags=re.S)
+    text = re.sub(r"^\s*#.*$", " ", text, flags=re.M)
+    text = re.sub(r'extern\s+"C"\s*{', " ", text)
+
+    names = []
+    unknown = []
+    for statement in text.split(";"):
+        # declarations may span lines, and follow the closing brace of a type or extern "C" block
+        statement = " ".join(statement.split()).lstrip("{} ")
+        if not statement.startswith("extern ") or re.search(r"\bconst\b", statement):
+            continue
+        match = DATA_DECL_RE.fullmatch(statement)
+        if match is not None:
+            names.append(match.group("name"))
+        elif FUNCTION_DECL_RE.fullmatch(statement) is None:
+            unknown.append(statement)
+    return names, unknown
@@ -0,0 +1,332 @@
+"""
+Read recordings written by :func:`pysimlink.Model.recorder` without loading them into memory.
+
+.. code-block:: python
+
+    trace = pysimlink.traces.open("run.trace")
+    rpm = trace["my_model/Plant/Engine/rpm"][10.0:20.0:5]  # every 5th row between t=10s and t=20s
+    t = trace.time[10.0:20.0:5]
+
+Files are memory mapped, so opening a recording only reads its header. Slices are numpy views of the file and only
+the rows they touch are read from disk.
+"""
+import bisect
+import os
+
+import numpy as np
+
+from pysimlink.lib.recorder import read_header
+
+## Header fields that must match to concatenate recordings
+_LAYOUT = ("model_name", "block_path", "name", "dims", "offset", "size")
+
+
+class _Segment:
+    # one memory mapped recording
+    def __init__(self, path: str):
+        self.path = path
+        self.header, offset = read_header(path)
+        width = self.header["width"]
+        dtype = np.dtype(self.header["dtype"])
+        rows = (os.path.getsize(path) - offset) // (width * dtype.itemsize)
+        if rows == 0:
+            self.data = np.empty((0, width), dtype=dtype)
+        else:
+            self.data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(rows, width))
+
+
+class TraceSignal:
+    """
+    One signal (or the time) of a :class:`Trace`. Returned from indexing a trace; nothing is read until it is sliced.
+
+    Index it like an array of shape :code:`(rows, *dims)` (:code:`(rows,)` for a scalar):
+
+    - with ints (:code:`sig[100:200:2]`) to select rows
+    - with floats (:code:`sig[1.5:3.0:2]`) to select the rows whose time :code:`t` is in :code:`[start, stop)`. The
+      step is still in rows. Finding the rows is a binary search over the time column, so it only reads a few
+      rows no matter how long the recording is.
+
+    Values are float64 views of the file (see :attr:`dtype` for the signal's own type).
+
+    Attributes:
+        model_name (str): Name of the model the signal belongs to
+        block_path (str): Path to the block the signal originates from
+        name (str): Name of the signal (empty if not named)
+        dims (list[int]): Shape of one value of the signal
+        dtype (numpy.dtype): Data type of the signal in the model. Use :code:`values.astype(sig.dtype)` to convert.
+    """
+
+    def __init__(self, trace: "Trace", column: int, entry: dict):
+        self._trace = trace
+        self._column = column
+        self._size = entry["size"]
+        self.model_name = entry["model_name"]
+        self.block_path = entry["block_path"]
+        self.name = entry["name"]
+        self.dims = list(entry["dims"])
+        try:
+            self.dtype = np.dtype(entry["python_type"])
+        except TypeError:
+            self.dtype = np.dtype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    def __repr__(self):
+        return f"TraceSignal({self.block_path}, {self.name}, dims: {self.dims}, {len(self)} rows)"
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of all values of the signal, :code:`(rows, *dims)`, or :code:`(rows,)` for a scalar
+        """
+        return (len(self),) + (tuple(self.dims) if self._size > 1 else ())
+
+    def __getitem__(self, idx) -> "np.ndarray":
+        if isinstance(idx, slice):
+            idx = self._trace.rows(idx)
+        else:
+            if not isinstance(idx, (int, np.integer)):
+                raise TypeError("Traces are indexed with an int or a slice")
+            if idx < 0:
+                idx += len(self)
+            if not 0 <= idx < len(self):
+                raise IndexError("trace index out of range")
+            idx = slice(idx, idx + 1)
+            return self._values(idx)[0]
+        return self._values(idx)
+
+    def _values(self, rows: slice) -> "np.ndarray":
+        shape = tuple(self.dims) if self._size > 1 else ()
+        parts = [
+            data[local, self._column : self._column + self._size].reshape((-1,) + shape)
+            for data, local in self._trace._split(rows)  # pylint: disable=W0212
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        if len(parts) == 0:
+            return np.empty((0,) + shape)
+        # only a selection that spans several recordings is copied
+        return np.concatenate(parts)
+
+
+class Trace:
+    """
+    One recording, or several recordings of the same signals one after the other. Returned from :func:`open` and
+    :func:`concat`.
+
+    Index it with a block path, or a tuple of :code:`(block_path, model_name, sig_name)` like
+    :func:`pysimlink.Model.get_signals`, to get a :class:`TraceSignal`.
+    """
+
+    def __init__(self, segments: "list[_Segment]"):
+        self._segments = segments
+        self._starts = [0]
+        for segment in segments:
+            self._starts.append(self._starts[-1] + len(segment.data))
+        self._time_sorted = None
+
+        self.header = segments[0].header
+        self._signals = [
+            TraceSignal(self, entry["offset"], entry) for entry in self.header["signals"]
+        ]
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __repr__(self):
+        return f"Trace({self.header['model']}, {len(self._signals)} signals, {len(self)} rows)"
+
+    @property
+    def signals(self) -> "list[TraceSignal]":
+        """
+        Every recorded signal, in the order they were recorded
+        """
+        return list(self._signals)
+
+    @property
+    def segments(self) -> "list[Trace]":
+        """
+        The recordings this trace is made of, as one trace each
+        """
+        return [Trace([segment]) for segment in self._segments]
+
+    @property
+    def paths(self) -> "list[str]":
+        """
+        Files this trace is read from
+        """
+        return [segment.path for segment in self._segments]
+
+    @property
+    def time(self) -> "TraceSignal":
+        """
+        Simulation time of every row
+        """
+        return TraceSignal(
+            self,
+            0,
+            {
+                "model_name": self.header["model"],
+                "block_path": "",
+                "name": "time",
+                "dims": [],
+                "size": 1,
+                "python_type": "float64",
+            },
+        )
+
+    def __getitem__(self, key) -> "TraceSignal":
+        if isinstance(key, (tuple, list)):
+            block_path = key[0]
+            model_name = key[1] if len(key) > 1 else None
+            sig_name = key[2] if len(key) > 2 else None
+        else:
+            block_path, model_name, sig_name = key, None, None
+
+        found = [
+            sig
+            for sig in self._signals
+            if sig.block_path == block_path
+            and (model_name is None or sig.model_name == model_name)
+            and (sig_name is None or sig.name == sig_name)
+        ]
+        if len(found) == 0:
+            raise KeyError(f"{key} was not recorded")
+        if len(found) > 1:
+            names = ", ".join(repr(sig.name) for sig in found)
+            raise KeyError(
+                f"{block_path} has more than one recorded signal ({names}). "
+                "Pass (block_path, model_name, sig_name)."
+            )
+        return found[0]
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.signals)
+
+    def rows(self, times: slice) -> slice:
+        """
+        Rows selected by a slice of a :class:`TraceSignal`
+
+        Args:
+            times: slice of rows (int bounds) or of times (float bounds, :code:`[start, stop)`). The step is in rows.
+
+        Returns:
+            slice: the selected rows, with non-negative start and stop
+
+        Raises:
+            ValueError: If the step is <= 0, or a time slice is used on recordings whose time is not increasing
+                (for example, several runs that each start at zero). Select those by row or per segment instead.
+            TypeError: If one bound is a time (float) and the other a row (int)
+        """
+        if times.step is not None and times.step <= 0:
+            raise ValueError("step must be > 0")
+        start, stop = times.start, times.stop
+        is_time = {
+            isinstance(bound, (float, np.floating)) for bound in (start, stop) if bound is not None
+        }
+        if len(is_time) > 1:
+            raise TypeError("Slice bounds must both be rows (int) or both be times (float)")
+        if True in is_time:
+            if not self._is_time_sorted():
+                raise ValueError(
+                    "Time is not increasing across the concatenated recordings. "
+                    "Select rows by index."
+                )
+            start = None if start is None else self._search(start)
+            stop = None if stop is None else self._search(stop)
+        return slice(*slice(start, stop, times.step).indices(len(self)))
+
+    def _is_time_sorted(self) -> bool:
+        # each recording is increasing in time, so only the joints need to be checked
+        if self._time_sorted is None:
+            self._time_sorted = True
+            previous = None
+            for segment in self._segments:
+                if len(segment.data) == 0:
+                    continue
+                if previous is not None and segment.data[0, 0] < previous:
+                    self._time_sorted = False
+                    break
+                previous = segment.data[-1, 0]
+        return self._time_sorted
+
+    def _search(self, t: float) -> int:
+        # first row with a time >= t
+        for segment, start in zip(self._segments, self._starts):
+            data = segment.data
+            if len(data) and data[-1, 0] >= t:
+                # column views are strided, which np.searchsorted would copy
+                return start + bisect.bisect_left(data[:, 0], t)
+        return len(self)
+
+    def _split(self, rows: slice):
+        # the part of a slice (from :func:`rows`) that falls in each recording, in local rows
+        for segment, start, end in zip(self._segments, self._starts, self._starts[1:]):
+            first = rows.start
+            if first < start:
+                first += -(-(start - first) // rows.step) * rows.step
+            last = min(rows.stop, end)
+            if first < last:
+                yield segment.data, slice(first - start, last - start, rows.step)
+
+
+def open(path: str) -> "Trace":  # pylint: disable=W0622
+    """
+    Memory map a recording
+
+    Args:
+        path: file written by :func:`pysimlink.Model.recorder`
+
+    Returns:
+        :class:`Trace` of the recording. Rows written after the file is opened are not included.
+
+    Raises:
+        ValueError: If the file is not a recording
+    """
+    return Trace([_Segment(path)])
+
+
+def concat(traces: list) -> "Trace":
+    """
+    Join recordings of the same signals into one trace, without copying them. Rows are numbered across all
+    recordings in order.
+
+    Args:
+        traces: :class:`Trace` objects or paths to recordings
+
+    Returns:
+        :class:`Trace` of all recordings
+
+    Raises:
+        ValueError: If no recordings are given or they did not record the same signals
+    """
+    segments = []
+    for trace in traces:
+        if isinstance(trace, Trace):
+            segments.extend(trace._segments)  # pylint: disable=W0212
+        else:
+            segments.append(_Segment(trace))
+    if len(segments) == 0:
+        raise ValueError("Nothing to concatenate")
+
+    def layout(header):
+        return (
+            [[sig[key] for key in _LAYOUT] for sig in header["signals"]],
+            header["width"],
+            header["dtype"],
+        )
+
+    for segment in segments[1:]:
+        if layout(segment.header) != layout(segments[0].header):
+            raise ValueError(
+                f"'{segment.path}' did not record the same signals as '{segments[0].path}'"
+            )
+    return Trace(segments)
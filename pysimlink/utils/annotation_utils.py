@@ -1,21 +1,28 @@
 import typing
 
 if typing.TYPE_CHECKING:
-    from pysimlink.lib.model_types import ModelInfo, DataType
+    from pysimlink.lib.model_types import ModelInfo, DataType, Handle
     from pysimlink.lib.dependency_graph import DepGraph
     from pysimlink.lib.model_paths import ModelPaths
     from pysimlink.lib.compilers.compiler import Compiler
+    from pysimlink.lib.cmake_gen import CmakeTemplate
     from pysimlink.lib.model import Model
+    from pysimlink.lib.model_pool import ModelPool
+    from pysimlink.lib.recorder import Recorder
     from typing import Union
     from numpy import ndarray
-    from typing import Optional
+    from typing import Any, Optional, Sequence
     from pysimlink.lib.struct_parser import Struct
     from enum import EnumType
+    from types import ModuleType
 
     c_model_info = typing.Any
     c_model_param = typing.Any
     c_model_datatype = typing.Any
     c_model_signal = typing.Any
     c_model_block_param = typing.Any
+    c_model_handle = typing.Any
+    c_model = typing.Any
+    c_handle_kind = typing.Any
 
     Value = Union[float, int, ndarray]
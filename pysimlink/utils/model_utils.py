@@ -1,5 +1,6 @@
 import os
 import pickle
+import shutil
 import time
 from pysimlink.utils import annotation_utils as anno
 from pysimlink.lib.model_types import DataType
@@ -21,6 +22,39 @@ def infer_defines(model_paths: "anno.ModelPaths"):
     return ret
 
 
+def find_ninja() -> "anno.Optional[str]":
+    """
+    Locate the ninja build tool, preferring the one installed by the :code:`ninja` python package
+
+    Returns:
+        str: path to the ninja executable, or None if ninja is not available
+    """
+    try:
+        import ninja  # pylint: disable=C0415
+
+        path = os.path.join(ninja.BIN_DIR, "ninja.exe" if os.name == "nt" else "ninja")
+        if os.path.exists(path):
+            return path
+    except ImportError:
+        pass
+    return shutil.which("ninja")
+
+
+def default_generator() -> str:
+    """
+    Cmake generator used when none is given. Ninja is used whenever it is available, otherwise
+    :code:`NMake Makefiles` on windows and :code:`Unix Makefiles` on mac/linux.
+
+    Returns:
+        str: name of the cmake generator
+    """
+    if find_ninja() is not None:
+        return "Ninja"
+    if os.name == "nt":
+        return "NMake Makefiles"
+    return "Unix Makefiles"
+
+
 def print_all_params(model: "anno.Model"):
     """
     Prints all parameters for the given model.
@@ -176,3 +210,32 @@ def cast_type(value: "anno.Value", dtype: "anno.DataType", orientations):
             value = value.astype(dtype.pythonType)
 
     return value
+
+
+def cast_rows(
+    values: "anno.ndarray", dtype: "anno.DataType", orientations, steps: int
+) -> "anno.ndarray":
+    """
+    Format a time series of values so that each row can be copied directly into the model's memory.
+
+    Args:
+        values: array of shape :code:`(steps, ...)`. Each row is a scalar, the flattened (c order) value,
+            or the value with the same shape as the parameter.
+        dtype: data type of the destination parameter or inport
+        orientations: orientation enumeration of the model (:attr:`pysimlink.Model.orientations`)
+        steps: number of rows that will be used
+
+    Returns:
+        c contiguous array of shape :code:`(steps, n_elements)` in the memory layout of the destination
+    """
+    values = np.asarray(values)
+    if values.ndim == 0 or values.shape[0] < steps:
+        raise ValueError(f"Expected at least {steps} rows of values, got shape {values.shape}")
+
+    dims = tuple(dtype.dims)
+    values = np.reshape(values[:steps], (steps,) + dims)
+    if dtype.orientation in [orientations.col_major_nd, orientations.col_major]:
+        # reverse the value axes so the c contiguous copy below is column major within each row
+        values = np.transpose(values, (0,) + tuple(range(len(dims), 0, -1)))
+
+    return np.ascontiguousarray(values, dtype=dtype.pythonType).reshape(steps, -1)
@@ -17,6 +17,8 @@ setup(
     packages=find_packages(),
     install_requires=reqs,
     extras_require={
+        "ninja": ["ninja"],
+        "matlogging": ["scipy>=1.5"],
         "dev": [
             "pylint",
             "black",